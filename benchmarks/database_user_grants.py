@@ -0,0 +1,98 @@
+"""Benchmark listing MariaDB database user grants from grant tables vs 'SHOW GRANTS'.
+
+Creates database users with a grant each, lists grants with both methods,
+and drops the database users.
+
+Run with e.g.:
+
+    python3 benchmarks/database_user_grants.py --host 127.0.0.1:2313 --username root --password ...
+"""
+
+import time
+from typing import List, Optional
+
+import typer
+from sqlalchemy.sql import text
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.servers import Server
+from cyberfusion.DatabaseSupport.utilities import generate_random_string
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    host: str = typer.Option(..., help="MariaDB host"),
+    username: str = typer.Option(..., help="MariaDB username"),
+    password: Optional[str] = typer.Option(None, help="MariaDB password"),
+    users: int = typer.Option(5000, help="Amount of database users"),
+) -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        mariadb_server_host=host,
+        mariadb_server_username=username,
+        server_password=password,
+        pooled=True,
+    )
+    server = Server(support=support)
+
+    database = Database(
+        support=support,
+        name="benchmark_" + generate_random_string(),
+        server_software_name=support.MARIADB_SERVER_SOFTWARE_NAME,
+    )
+    database.create()
+
+    database_users: List[DatabaseUser] = []
+
+    typer.echo(f"Creating {users} database users...")
+
+    with support.session():
+        for _ in range(users):
+            database_user = DatabaseUser(
+                server=server,
+                name="benchmark_" + generate_random_string(),
+                server_software_name=support.MARIADB_SERVER_SOFTWARE_NAME,
+                password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+                host="%",
+            )
+
+            database_user._create_mariadb()
+
+            # Grant directly, without existence check
+
+            Query(
+                engine=support.engines.engines[support.engines.MYSQL_ENGINE_NAME],
+                query=text(
+                    f"GRANT SELECT, INSERT ON `{database.name}`.* TO :name@:host;"
+                ).bindparams(name=database_user.name, host=database_user.host),
+            )
+
+            database_users.append(database_user)
+
+    try:
+        for name, function in [
+            ("Grant tables", lambda: server._mariadb_database_user_grants_catalog),
+            ("SHOW GRANTS", lambda: server._mariadb_database_user_grants_show_grants),
+        ]:
+            start = time.perf_counter()
+
+            amount = len(function())
+
+            typer.echo(
+                f"{name}: {amount} grants in {time.perf_counter() - start:.2f} seconds"
+            )
+    finally:
+        with support.session():
+            for database_user in database_users:
+                database_user._drop_mariadb()
+
+        database.drop()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,54 @@
+"""Benchmark queries per second with and without engine connection pooling.
+
+Run with e.g.:
+
+    python3 benchmarks/engines_pooling.py --host 127.0.0.1:2313 --username root --password ...
+"""
+
+import time
+from typing import Optional
+
+import typer
+from sqlalchemy.sql import text
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.queries import Query
+
+app = typer.Typer()
+
+
+def run(support: DatabaseSupport, queries: int) -> float:
+    """Run queries, and return queries per second."""
+    engine = support.engines.engines[support.engines.MYSQL_ENGINE_NAME]
+
+    start = time.perf_counter()
+
+    for _ in range(queries):
+        Query(engine=engine, query=text("SELECT 1;"))
+
+    return queries / (time.perf_counter() - start)
+
+
+@app.command()
+def main(
+    host: str = typer.Option(..., help="MariaDB host"),
+    username: str = typer.Option(..., help="MariaDB username"),
+    password: Optional[str] = typer.Option(None, help="MariaDB password"),
+    queries: int = typer.Option(1000, help="Amount of queries per mode"),
+) -> None:
+    for pooled in [False, True]:
+        support = DatabaseSupport(
+            server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+            mariadb_server_host=host,
+            mariadb_server_username=username,
+            server_password=password,
+            pooled=pooled,
+        )
+
+        typer.echo(
+            f"{'Pooled' if pooled else 'Not pooled'}: {run(support, queries):.0f} queries/sec"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,97 @@
+"""Benchmark exporting MariaDB databases with mariadb-dump vs the native engine.
+
+Creates a database with a table containing rows, exports it with both engines,
+and drops the database.
+
+Run with e.g.:
+
+    python3 benchmarks/exports.py --host 127.0.0.1:2313 --username root --password ...
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+import typer
+from sqlalchemy.sql import text
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exports import NativeExporter
+from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.utilities import generate_random_string
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    host: str = typer.Option(..., help="MariaDB host"),
+    username: str = typer.Option(..., help="MariaDB username"),
+    password: Optional[str] = typer.Option(None, help="MariaDB password"),
+    rows: int = typer.Option(1000000, help="Amount of rows"),
+    packet_size: int = typer.Option(
+        NativeExporter.SIZE_PACKET_DEFAULT, help="Packet size of native engine"
+    ),
+) -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        mariadb_server_host=host,
+        mariadb_server_username=username,
+        server_password=password,
+    )
+
+    database = Database(
+        support=support,
+        name="benchmark_" + generate_random_string(),
+        server_software_name=support.MARIADB_SERVER_SOFTWARE_NAME,
+    )
+    database.create()
+
+    directory = tempfile.mkdtemp()
+
+    typer.echo(f"Inserting {rows} rows...")
+
+    # Rows are generated with the Sequence storage engine
+
+    Query(
+        engine=database.database_engine,
+        query=text(
+            "CREATE TABLE benchmark (id INT PRIMARY KEY, name VARCHAR(32), amount DECIMAL(10, 2), created_at DATETIME, data BLOB);"
+        ),
+    )
+    Query(
+        engine=database.database_engine,
+        query=text(
+            f"INSERT INTO benchmark SELECT seq, MD5(seq), seq / 100, NOW() - INTERVAL seq SECOND, UNHEX(MD5(seq)) FROM seq_1_to_{rows};"
+        ),
+    )
+
+    try:
+        for engine in [
+            Database.EXPORT_ENGINE_MARIADB_DUMP,
+            Database.EXPORT_ENGINE_NATIVE,
+        ]:
+            start = time.perf_counter()
+
+            path, _ = database.export(
+                root_directory=directory, engine=engine, packet_size=packet_size
+            )
+
+            duration = time.perf_counter() - start
+
+            size = os.path.getsize(path) / 1024 / 1024
+
+            typer.echo(
+                f"{engine}: {size:.1f} MiB in {duration:.2f} seconds ({size / duration:.1f} MiB/s, {rows / duration:.0f} rows/s)"
+            )
+    finally:
+        shutil.rmtree(directory)
+
+        database.drop()
+
+
+if __name__ == "__main__":
+    app()
@@ -1,8 +1,16 @@
 """Helper classes for scripts for clusters of database type."""
 
-from typing import List, Optional
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Iterator, List, Optional
 
+from cyberfusion.DatabaseSupport.async_engines import AsyncEngines
+from cyberfusion.DatabaseSupport.caches import TTLCache
+from cyberfusion.DatabaseSupport.datadirs import DatadirSizes
 from cyberfusion.DatabaseSupport.engines import Engines
+from cyberfusion.DatabaseSupport.registries import EngineRegistry, engine_registry
+from cyberfusion.DatabaseSupport.sessions import Session, get_current_session
+from cyberfusion.DatabaseSupport.utilities import get_host_is_socket
 
 
 class DatabaseSupport:
@@ -12,6 +20,22 @@ class DatabaseSupport:
     POSTGRESQL_SERVER_SOFTWARE_NAME = "PostgreSQL"
 
     EXTENSION_FILE_SQL = "sql"
+    EXTENSION_FILE_GZIP = "gz"
+    EXTENSION_FILE_ZSTD = "zst"
+
+    COMPRESSION_GZIP = "gzip"
+    COMPRESSION_ZSTD = "zstd"
+
+    COMPRESSION_LEVELS = {
+        COMPRESSION_GZIP: range(1, 10),
+        COMPRESSION_ZSTD: range(1, 20),
+    }
+
+    SIZE_ESTIMATE_MAXIMUM_AGE_DEFAULT = 300
+
+    CATALOG_KEY_DATABASES = "databases"
+    CATALOG_KEY_DATABASE_USERS = "database_users"
+    CATALOG_KEY_DATABASE_USER_GRANTS = "database_user_grants"
 
     def __init__(
         self,
@@ -22,13 +46,106 @@ class DatabaseSupport:
         postgresql_server_host: str = Engines.POSTGRESQL_HOST_DEFAULT,
         mariadb_server_username: str = Engines.MYSQL_NAME_USER_DEFAULT,
         postgresql_server_username: str = Engines.POSTGRESQL_NAME_USER_DEFAULT,
+        pooled: bool = False,
+        pool_size: int = Engines.POOL_SIZE_DEFAULT,
+        pool_max_overflow: int = Engines.POOL_MAX_OVERFLOW_DEFAULT,
+        pool_recycle: int = Engines.POOL_RECYCLE_DEFAULT,
+        pool_pre_ping: bool = False,
+        pool_use_lifo: bool = False,
+        engine_registry: EngineRegistry = engine_registry,
+        size_estimate_maximum_age: float = SIZE_ESTIMATE_MAXIMUM_AGE_DEFAULT,
+        mariadb_datadir: Optional[str] = None,
+        catalog_cache_maximum_age: Optional[float] = None,
     ) -> None:
-        """Set information."""
+        """Set information.
+
+        By default, engines do not pool connections, so every query opens a new
+        connection. This suits short-lived processes (such as CLIs). Long-running
+        processes that run many queries should set pooled to True, in which case
+        the pool_* arguments are passed to the SQLAlchemy QueuePool.
+
+        Engines are retrieved from engine_registry, which defaults to the
+        process-wide registry. Therefore, objects with the same DSN share engines
+        (and pools).
+
+        Estimated database sizes (see Database.get_size) are cached for at most
+        size_estimate_maximum_age seconds.
+
+        If mariadb_datadir is set and the MariaDB server host is a socket (i.e.
+        the server is local), MariaDB database sizes are based on files in the
+        datadir (see DatadirSizes), instead of information_schema.
+
+        If catalog_cache_maximum_age is set, snapshots of databases, database
+        users and database user grants (see Server) are cached for at most that
+        many seconds. Snapshots are invalidated when this library changes them
+        (e.g. Database.create, DatabaseUserGrant.grant), but not when they are
+        changed otherwise.
+        """
         self.server_software_names = server_software_names
         self.server_password = server_password
         self.mariadb_server_host = mariadb_server_host
         self.postgresql_server_host = postgresql_server_host
         self.mariadb_server_username = mariadb_server_username
         self.postgresql_server_username = postgresql_server_username
+        self.pooled = pooled
+        self.pool_size = pool_size
+        self.pool_max_overflow = pool_max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self.pool_use_lifo = pool_use_lifo
+        self.engine_registry = engine_registry
+
+        self.size_estimates_cache = TTLCache(maximum_age=size_estimate_maximum_age)
+
+        self.mariadb_datadir = mariadb_datadir
+
+        self.catalog_cache: Optional[TTLCache] = None
+
+        if catalog_cache_maximum_age is not None:
+            self.catalog_cache = TTLCache(maximum_age=catalog_cache_maximum_age)
 
         self.engines = Engines(support=self)
+
+    @cached_property
+    def mariadb_datadir_sizes(self) -> Optional[DatadirSizes]:
+        """Get sizes based on MariaDB datadir, if usable."""
+        if not self.mariadb_datadir or not get_host_is_socket(self.mariadb_server_host):
+            return None
+
+        return DatadirSizes(path=self.mariadb_datadir)
+
+    def invalidate_catalog(self, *keys: str) -> None:
+        """Invalidate cached catalog snapshots by key (CATALOG_KEY_*), if enabled."""
+        if self.catalog_cache is None:
+            return
+
+        for key in keys:
+            self.catalog_cache.invalidate(key)
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """Run queries in the 'with' block on one connection per engine.
+
+        If a session is already active, it is reused. See Session.
+        """
+        session = get_current_session()
+
+        if session:
+            yield session
+
+            return
+
+        with Session() as session:
+            yield session
+
+
+class AsyncDatabaseSupport(DatabaseSupport):
+    """Helper class for local support modules, using asyncio.
+
+    Requires the 'async' extra (asyncio drivers).
+    """
+
+    @cached_property
+    def async_engines(self) -> AsyncEngines:
+        """Get asyncio engines."""
+        return AsyncEngines(support=self)
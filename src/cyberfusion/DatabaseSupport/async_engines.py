@@ -0,0 +1,67 @@
+"""Classes for interaction with database engines using asyncio."""
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cyberfusion.DatabaseSupport import AsyncDatabaseSupport
+
+
+class AsyncEngines:
+    """Abstract representation of database engines using asyncio.
+
+    Uses the same URLs as the synchronous engines, with asyncio drivers.
+    """
+
+    MYSQL_DRIVER_NAME = "mysql+asyncmy"
+    POSTGRESQL_DRIVER_NAME = "postgresql+asyncpg"
+
+    def __init__(
+        self,
+        *,
+        support: "AsyncDatabaseSupport",
+    ) -> None:
+        """Set attributes."""
+        self.support = support
+
+    @property
+    def urls(self) -> Dict[str, sa.engine.URL]:
+        """Get engine URLs."""
+        urls: Dict[str, sa.engine.URL] = {}
+
+        for engine_name, url in self.support.engines.urls.items():
+            if engine_name == self.support.engines.MYSQL_ENGINE_NAME:
+                drivername = self.MYSQL_DRIVER_NAME
+            else:
+                drivername = self.POSTGRESQL_DRIVER_NAME
+
+            urls[engine_name] = sa.engine.make_url(url).set(drivername=drivername)
+
+        return urls
+
+    @property
+    def engine_kwargs(self) -> Dict[str, Any]:
+        """Get keyword arguments for creating engines.
+
+        Mirrors the pooling settings of the synchronous engines.
+        """
+        engine_kwargs = self.support.engines.engine_kwargs
+
+        if engine_kwargs["poolclass"] is NullPool:
+            return engine_kwargs
+
+        return {**engine_kwargs, "poolclass": AsyncAdaptedQueuePool}
+
+    @cached_property
+    def engines(self) -> Dict[str, AsyncEngine]:
+        """Create engines."""
+        engines: Dict[str, AsyncEngine] = {}
+
+        for engine_name, url in self.urls.items():
+            engines[engine_name] = create_async_engine(url, **self.engine_kwargs)
+
+        return engines
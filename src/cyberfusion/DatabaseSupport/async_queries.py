@@ -0,0 +1,64 @@
+"""Classes for interaction with database queries using asyncio."""
+
+from typing import Any, Generator
+
+from sqlalchemy import TextClause
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+class AsyncQuery:
+    """Abstract representation of database query using asyncio.
+
+    Await the object to execute the query, e.g.:
+
+        result = (await AsyncQuery(engine=engine, query=query)).result
+    """
+
+    def __init__(
+        self, *, engine: AsyncEngine, query: TextClause, autocommit: bool = False
+    ) -> None:
+        """Set attributes.
+
+        If autocommit is True, the query is executed outside a transaction (e.g.
+        for PostgreSQL 'CREATE DATABASE').
+        """
+        self.engine = engine
+        self.query = query
+        self.autocommit = autocommit
+
+        self._result: list = []
+
+    def __await__(self) -> Generator[Any, None, "AsyncQuery"]:
+        """Execute query."""
+        yield from self._execute().__await__()
+
+        return self
+
+    async def _execute(self) -> None:
+        """Execute query."""
+        if self.autocommit:
+            async with self.engine.connect() as connection:
+                connection = await connection.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+
+                await self._execute_on_connection(connection)
+
+            return
+
+        async with self.engine.begin() as connection:
+            await self._execute_on_connection(connection)
+
+    async def _execute_on_connection(self, connection: AsyncConnection) -> None:
+        """Execute query on connection."""
+        result_proxy = await connection.execute(self.query)
+
+        if result_proxy.returns_rows:
+            self._result = list(result_proxy.all())
+        else:
+            self._result = []
+
+    @property
+    def result(self) -> list:
+        """Get result."""
+        return self._result
@@ -0,0 +1,480 @@
+"""Classes for interaction with database servers using asyncio."""
+
+from typing import TYPE_CHECKING, Any, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import literal, text
+
+from cyberfusion.DatabaseSupport.async_queries import AsyncQuery
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exceptions import PasswordMissingError
+from cyberfusion.DatabaseSupport.servers import Server
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cyberfusion.DatabaseSupport import AsyncDatabaseSupport
+
+
+class AsyncServer:
+    """Abstract representation of database server using asyncio.
+
+    Counterpart of Server. Returns and accepts the same objects (Database,
+    DatabaseUser, DatabaseUserGrant), so they can be used with both.
+
+    Create, drop, grant and revoke methods return False if the object already
+    exists or does not exist (like the object_exists and object_not_exists
+    decorators do).
+    """
+
+    ENCODING_DATABASE = "utf8"
+
+    def __init__(self, *, support: "AsyncDatabaseSupport") -> None:
+        """Set attributes."""
+        self.support = support
+
+        self.server = Server(support=support)
+
+    def _get_engine(self, server_software_name: str) -> AsyncEngine:
+        """Get engine for server software."""
+        if server_software_name == self.support.MARIADB_SERVER_SOFTWARE_NAME:
+            return self.support.async_engines.engines[
+                self.support.engines.MYSQL_ENGINE_NAME
+            ]
+
+        return self.support.async_engines.engines[
+            self.support.engines.POSTGRESQL_ENGINE_NAME
+        ]
+
+    def _render_literal(self, engine: AsyncEngine, value: Any) -> str:
+        """Render value as SQL literal.
+
+        asyncpg does not support bound parameters in DDL statements, so values
+        are rendered by the dialect.
+        """
+        return str(
+            literal(value).compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+
+    def _quote(self, engine: AsyncEngine, name: str) -> str:
+        """Quote identifier."""
+        return engine.dialect.identifier_preparer.quote(name)
+
+    # Databases
+
+    async def _get_mariadb_databases(self) -> List[Database]:
+        """Get MariaDB databases."""
+        databases: List[Database] = []
+
+        query = await AsyncQuery(
+            engine=self._get_engine(self.support.MARIADB_SERVER_SOFTWARE_NAME),
+            query=text("SELECT schema_name FROM information_schema.schemata;"),
+        )
+
+        for database_name in query.result:
+            database_name = database_name[0]
+
+            if database_name in [
+                Server.MYSQL_NAME_DATABASE_MYSQL,
+                Server.MYSQL_NAME_DATABASE_PERFORMANCE_SCHEMA,
+                Server.MYSQL_NAME_DATABASE_INFORMATION_SCHEMA,
+                Server.MYSQL_NAME_DATABASE_SYS,
+            ]:
+                continue
+
+            databases.append(
+                Database(
+                    support=self.support,
+                    name=database_name,
+                    server_software_name=self.support.MARIADB_SERVER_SOFTWARE_NAME,
+                )
+            )
+
+        return databases
+
+    async def _get_postgresql_databases(self) -> List[Database]:
+        """Get PostgreSQL databases."""
+        databases: List[Database] = []
+
+        query = await AsyncQuery(
+            engine=self._get_engine(self.support.POSTGRESQL_SERVER_SOFTWARE_NAME),
+            query=text("SELECT datname FROM pg_database;"),
+        )
+
+        for database_name in query.result:
+            database_name = database_name[0]
+
+            if database_name in [
+                Server.POSTGRESQL_NAME_DATABASE_TEMPLATE0,
+                Server.POSTGRESQL_NAME_DATABASE_TEMPLATE1,
+                Server.POSTGRESQL_NAME_DATABASE_POSTGRES,
+            ]:
+                continue
+
+            databases.append(
+                Database(
+                    support=self.support,
+                    name=database_name,
+                    server_software_name=self.support.POSTGRESQL_SERVER_SOFTWARE_NAME,
+                )
+            )
+
+        return databases
+
+    async def get_databases(self) -> List[Database]:
+        """Get databases."""
+        databases: List[Database] = []
+
+        if (
+            self.support.MARIADB_SERVER_SOFTWARE_NAME
+            in self.support.server_software_names
+        ):
+            databases.extend(await self._get_mariadb_databases())
+
+        if (
+            self.support.POSTGRESQL_SERVER_SOFTWARE_NAME
+            in self.support.server_software_names
+        ):
+            databases.extend(await self._get_postgresql_databases())
+
+        return databases
+
+    async def get_database_exists(self, database: Database) -> bool:
+        """Get database exists."""
+        if database.server_software_name == self.support.MARIADB_SERVER_SOFTWARE_NAME:
+            query = text(
+                "SELECT 1 FROM information_schema.schemata WHERE schema_name=:name;"
+            ).bindparams(name=database.name)
+        else:
+            query = text("SELECT 1 FROM pg_database WHERE datname=:name;").bindparams(
+                name=database.name
+            )
+
+        return bool(
+            (
+                await AsyncQuery(
+                    engine=self._get_engine(database.server_software_name),
+                    query=query,
+                )
+            ).result
+        )
+
+    async def get_database_size(self, database: Database) -> int:
+        """Get database size."""
+        if database.server_software_name == self.support.MARIADB_SERVER_SOFTWARE_NAME:
+            query = text(
+                "SELECT SUM(COALESCE(data_length, 0) + COALESCE(index_length, 0)) FROM information_schema.tables WHERE TABLE_SCHEMA=:name;"
+            ).bindparams(name=database.name)
+        else:
+            query = text("SELECT pg_database_size(:name);").bindparams(
+                name=database.name
+            )
+
+        result = (
+            await AsyncQuery(
+                engine=self._get_engine(database.server_software_name),
+                query=query,
+            )
+        ).result
+
+        return int(result[0][0] or 0)
+
+    async def create_database(self, database: Database) -> bool:
+        """Create database.
+
+        Note that for PostgreSQL, this does not create a schema.
+        """
+        if await self.get_database_exists(database):
+            return False
+
+        engine = self._get_engine(database.server_software_name)
+
+        if database.server_software_name == self.support.MARIADB_SERVER_SOFTWARE_NAME:
+            query = text(
+                f"CREATE DATABASE {self._quote(engine, database.name)} CHARACTER SET = '{self.ENCODING_DATABASE}';"
+            )
+        else:
+            query = text(
+                f"CREATE DATABASE {self._quote(engine, database.name)} ENCODING '{self.ENCODING_DATABASE}' TEMPLATE {Server.POSTGRESQL_NAME_DATABASE_TEMPLATE1};"
+            )
+
+        await AsyncQuery(engine=engine, query=query, autocommit=True)
+
+        self.support.invalidate_catalog(self.support.CATALOG_KEY_DATABASES)
+
+        return True
+
+    async def drop_database(self, database: Database) -> bool:
+        """Drop database."""
+        if not await self.get_database_exists(database):
+            return False
+
+        engine = self._get_engine(database.server_software_name)
+
+        if (
+            database.server_software_name
+            == self.support.POSTGRESQL_SERVER_SOFTWARE_NAME
+        ):
+            # Database can't be dropped while there are connections to it
+
+            await AsyncQuery(
+                engine=engine,
+                query=text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname=:name AND pid <> pg_backend_pid();"
+                ).bindparams(name=database.name),
+            )
+
+        await AsyncQuery(
+            engine=engine,
+            query=text(f"DROP DATABASE {self._quote(engine, database.name)};"),
+            autocommit=True,
+        )
+
+        self.support.invalidate_catalog(
+            self.support.CATALOG_KEY_DATABASES,
+            self.support.CATALOG_KEY_DATABASE_USER_GRANTS,
+        )
+
+        return True
+
+    # Database users
+
+    async def _get_mariadb_database_users(self) -> List[DatabaseUser]:
+        """Get MariaDB database users."""
+        database_users: List[DatabaseUser] = []
+
+        query = await AsyncQuery(
+            engine=self._get_engine(self.support.MARIADB_SERVER_SOFTWARE_NAME),
+            query=text("SELECT User,Host,Password from mysql.user;"),
+        )
+
+        for database_user in query.result:
+            database_user_name = database_user[0]
+            database_user_host = database_user[1]
+            database_user_password = database_user[2]
+
+            if database_user_name in [
+                Server.MYSQL_NAME_USER_MONITORING,
+                Server.MYSQL_NAME_USER_DEBIAN_SYS_MAINT,
+                Server.MYSQL_NAME_USER_MARIADB_SYS,
+                Server.MYSQL_NAME_USER_MYSQL,
+            ]:
+                continue
+
+            database_users.append(
+                DatabaseUser(
+                    server=self.server,
+                    name=database_user_name,
+                    server_software_name=self.support.MARIADB_SERVER_SOFTWARE_NAME,
+                    password=database_user_password,
+                    host=database_user_host,
+                )
+            )
+
+        return database_users
+
+    async def _get_postgresql_database_users(self) -> List[DatabaseUser]:
+        """Get PostgreSQL database users."""
+        database_users: List[DatabaseUser] = []
+
+        query = await AsyncQuery(
+            engine=self._get_engine(self.support.POSTGRESQL_SERVER_SOFTWARE_NAME),
+            query=text("SELECT rolname, rolpassword FROM pg_authid;"),
+        )
+
+        for database_user in query.result:
+            database_user_name = database_user[0]
+            database_user_password = database_user[1]
+
+            if database_user_name in [
+                Server.POSTGRESQL_NAME_USER_ADMIN,
+                Server.POSTGRESQL_NAME_USER_POSTGRES,
+            ]:
+                continue
+
+            if database_user_name.startswith(Server.POSTGRESQL_PREFIX_SYSTEM_USER):
+                continue
+
+            database_users.append(
+                DatabaseUser(
+                    server=self.server,
+                    name=database_user_name,
+                    server_software_name=self.support.POSTGRESQL_SERVER_SOFTWARE_NAME,
+                    password=database_user_password,
+                    host=None,
+                )
+            )
+
+        return database_users
+
+    async def get_database_users(self) -> List[DatabaseUser]:
+        """Get database users."""
+        database_users: List[DatabaseUser] = []
+
+        if (
+            self.support.MARIADB_SERVER_SOFTWARE_NAME
+            in self.support.server_software_names
+        ):
+            database_users.extend(await self._get_mariadb_database_users())
+
+        if (
+            self.support.POSTGRESQL_SERVER_SOFTWARE_NAME
+            in self.support.server_software_names
+        ):
+            database_users.extend(await self._get_postgresql_database_users())
+
+        return database_users
+
+    async def get_database_user_exists(self, database_user: DatabaseUser) -> bool:
+        """Get database user exists."""
+        if (
+            database_user.server_software_name
+            == self.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            query = text(
+                "SELECT 1 FROM mysql.user WHERE User=:name AND Host=:host;"
+            ).bindparams(name=database_user.name, host=database_user.host)
+        else:
+            query = text("SELECT 1 FROM pg_roles WHERE rolname=:name;").bindparams(
+                name=database_user.name
+            )
+
+        return bool(
+            (
+                await AsyncQuery(
+                    engine=self._get_engine(database_user.server_software_name),
+                    query=query,
+                )
+            ).result
+        )
+
+    async def create_database_user(self, database_user: DatabaseUser) -> bool:
+        """Create database user."""
+        if await self.get_database_user_exists(database_user):
+            return False
+
+        if not database_user.password:
+            raise PasswordMissingError
+
+        engine = self._get_engine(database_user.server_software_name)
+
+        if (
+            database_user.server_software_name
+            == self.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            query = text(
+                "CREATE USER :name@:host IDENTIFIED BY PASSWORD :password;"
+            ).bindparams(
+                name=database_user.name,
+                host=database_user.host,
+                password=database_user.password,
+            )
+        else:
+            query = text(
+                f"CREATE USER {database_user.name} WITH PASSWORD {self._render_literal(engine, database_user.password)};"
+            )
+
+        await AsyncQuery(engine=engine, query=query)
+
+        self.support.invalidate_catalog(self.support.CATALOG_KEY_DATABASE_USERS)
+
+        return True
+
+    async def drop_database_user(self, database_user: DatabaseUser) -> bool:
+        """Drop database user."""
+        if not await self.get_database_user_exists(database_user):
+            return False
+
+        if (
+            database_user.server_software_name
+            == self.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            query = text("DROP USER :name@:host;").bindparams(
+                name=database_user.name, host=database_user.host
+            )
+        else:
+            query = text(f"DROP USER {database_user.name};")
+
+        await AsyncQuery(
+            engine=self._get_engine(database_user.server_software_name), query=query
+        )
+
+        self.support.invalidate_catalog(
+            self.support.CATALOG_KEY_DATABASE_USERS,
+            self.support.CATALOG_KEY_DATABASE_USER_GRANTS,
+        )
+
+        return True
+
+    # Database user grants
+
+    async def get_database_user_grant_exists(
+        self, database_user_grant: DatabaseUserGrant
+    ) -> bool:
+        """Get database user grant exists."""
+        database_user = database_user_grant.database_user
+
+        if not await self.get_database_user_exists(database_user):
+            return False
+
+        query = await AsyncQuery(
+            engine=self._get_engine(database_user.server_software_name),
+            query=text("SHOW GRANTS FOR :username@:host;").bindparams(
+                username=database_user.name, host=database_user.host
+            ),
+        )
+
+        for grant in query.result:
+            existing_database_user_grant = self.server._parse_mariadb_grant(
+                grant=grant[0], database_user=database_user
+            )
+
+            if not existing_database_user_grant:
+                continue
+
+            if not database_user_grant._matches(existing_database_user_grant):
+                continue
+
+            return True
+
+        return False
+
+    async def grant(self, database_user_grant: DatabaseUserGrant) -> bool:
+        """Create database user grant."""
+        if await self.get_database_user_grant_exists(database_user_grant):
+            return False
+
+        await AsyncQuery(
+            engine=self._get_engine(self.support.MARIADB_SERVER_SOFTWARE_NAME),
+            query=text(
+                f"GRANT {database_user_grant.text_privilege_names} ON `{database_user_grant.database_name}`.{database_user_grant.text_table_name} TO :database_user_name@:database_user_host;"
+            ).bindparams(
+                database_user_name=database_user_grant.database_user.name,
+                database_user_host=database_user_grant.database_user.host,
+            ),
+        )
+
+        self.support.invalidate_catalog(self.support.CATALOG_KEY_DATABASE_USER_GRANTS)
+
+        return True
+
+    async def revoke(self, database_user_grant: DatabaseUserGrant) -> bool:
+        """Delete database user grant."""
+        if not await self.get_database_user_grant_exists(database_user_grant):
+            return False
+
+        await AsyncQuery(
+            engine=self._get_engine(self.support.MARIADB_SERVER_SOFTWARE_NAME),
+            query=text(
+                f"REVOKE {database_user_grant.text_privilege_names} ON `{database_user_grant.database_name}`.{database_user_grant.text_table_name} FROM :database_user_name@:database_user_host;"
+            ).bindparams(
+                database_user_name=database_user_grant.database_user.name,
+                database_user_host=database_user_grant.database_user.host,
+            ),
+        )
+
+        self.support.invalidate_catalog(self.support.CATALOG_KEY_DATABASE_USER_GRANTS)
+
+        return True
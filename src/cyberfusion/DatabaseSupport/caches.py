@@ -0,0 +1,74 @@
+"""Classes for caching values."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """Cache of values that expire after a maximum age (in seconds).
+
+    Therefore, cached values are at most maximum_age seconds stale.
+    """
+
+    def __init__(self, *, maximum_age: float) -> None:
+        """Set attributes."""
+        self.maximum_age = maximum_age
+
+        self.hits = 0
+        self.misses = 0
+
+        self._values: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+        # Incremented on invalidation, so that values gotten before are not
+        # stored (see get)
+
+        self._generation = 0
+
+    def __len__(self) -> int:
+        """Get amount of values, including expired values."""
+        return len(self._values)
+
+    def get(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Get value for key, calling function to get it if missing or expired.
+
+        If the cache is invalidated while function is called, the value may be
+        stale, so it is returned but not stored.
+        """
+        with self._lock:
+            if key in self._values:
+                created_at, value = self._values[key]
+
+                if time.monotonic() - created_at <= self.maximum_age:
+                    self.hits += 1
+
+                    return value
+
+                del self._values[key]
+
+            self.misses += 1
+
+            generation = self._generation
+
+        value = function()  # Not under lock, as function may be slow
+
+        with self._lock:
+            if self._generation == generation:
+                self._values[key] = (time.monotonic(), value)
+
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Remove value for key, or all values if no key is given."""
+        with self._lock:
+            self._generation += 1
+
+            if key is None:
+                self._values.clear()
+
+                return
+
+            self._values.pop(key, None)
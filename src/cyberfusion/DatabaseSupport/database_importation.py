@@ -127,8 +127,9 @@ class DatabaseImportation:
 
     def _create_objects(self) -> None:
         """Create temporary objects."""
-        self.database_user.create()
-        self.database_user_grant.grant()
+        with self.privileged_support.session():
+            self.database_user.create()
+            self.database_user_grant.grant()
 
     def _delete_objects(self) -> None:
         """Delete temporary objects."""
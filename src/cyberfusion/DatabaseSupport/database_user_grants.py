@@ -3,6 +3,7 @@
 import re
 from typing import List, Optional
 
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.sql import text
 
 from cyberfusion.DatabaseSupport.database_users import DatabaseUser
@@ -22,6 +23,8 @@ class DatabaseUserGrant:
     LONG_ALL_PRIVILEGES = "ALL PRIVILEGES"
     SHORT_ALL_PRIVILEGES = "ALL"
 
+    NAME_PRIVILEGE_USAGE = "USAGE"
+
     CHAR_NAME_TABLE_WILDCARD = "*"
     CHAR_NAME_DATABASE_WILDCARD = "*"
 
@@ -109,29 +112,107 @@ class DatabaseUserGrant:
 
         self._table_name = value
 
-    @property
-    def exists(self) -> bool:
-        """Get database user grant exists locally."""
-        for database_user_grant in self.database_user.server.database_user_grants:
-            if database_user_grant.table_name != self.table_name:
-                continue
+    def _matches(self, database_user_grant: "DatabaseUserGrant") -> bool:
+        """Get if other database user grant is for the same object and privileges."""
+        if database_user_grant.table_name != self.table_name:
+            return False
 
-            if database_user_grant.privilege_names != self.privilege_names:
-                continue
+        if database_user_grant.privilege_names != self.privilege_names:
+            return False
 
-            if database_user_grant.database_user.name != self.database_user.name:
-                continue
+        if database_user_grant.database_user.name != self.database_user.name:
+            return False
 
-            if database_user_grant.database_user.host != self.database_user.host:
-                continue
+        if database_user_grant.database_user.host != self.database_user.host:
+            return False
+
+        if database_user_grant.database.name != self.database_name:
+            return False
+
+        return True
 
-            if database_user_grant.database.name != self.database_name:
+    @property
+    def _exists_show_grants(self) -> bool:
+        """Get database user grant exists locally, using 'SHOW GRANTS'."""
+        if not self.database_user.exists:
+            return False
+
+        for (
+            database_user_grant
+        ) in self.database_user.server._get_mariadb_database_user_grants_show_grants(
+            self.database_user
+        ):
+            if not self._matches(database_user_grant):
                 continue
 
             return True
 
         return False
 
+    @property
+    def _privilege_names_catalog(self) -> Optional[List[str]]:
+        """Get privilege names on database or table from grant tables.
+
+        Returns None if there is no grant on the database or table.
+        """
+        server = self.database_user.server
+
+        if self.table_name == self.CHAR_NAME_TABLE_WILDCARD:
+            result = Query(
+                engine=server.support.engines.engines[
+                    server.support.engines.MYSQL_ENGINE_NAME
+                ],
+                query=text(
+                    "SELECT * FROM mysql.db WHERE Host=:host AND Db=:database_name AND User=:user;"
+                ).bindparams(
+                    host=self.database_user.host,
+                    database_name=self.database_name,
+                    user=self.database_user.name,
+                ),
+            ).result
+
+            if not result:
+                return None
+
+            return server._get_mariadb_database_privilege_names(result[0]._asdict())
+
+        result = Query(
+            engine=server.support.engines.engines[
+                server.support.engines.MYSQL_ENGINE_NAME
+            ],
+            query=text(
+                "SELECT Table_priv FROM mysql.tables_priv WHERE Host=:host AND Db=:database_name AND User=:user AND Table_name=:table_name;"
+            ).bindparams(
+                host=self.database_user.host,
+                database_name=self.database_name,
+                user=self.database_user.name,
+                table_name=self.table_name,
+            ),
+        ).result
+
+        if not result or not result[0][0]:
+            return None
+
+        return server._get_mariadb_table_privilege_names(result[0][0])
+
+    @property
+    def exists(self) -> bool:
+        """Get database user grant exists locally.
+
+        Looks up the grant on the specific database or table in the grant tables.
+        Global grants (on '*.*'), or grants that can't be looked up in the grant
+        tables, are looked up with 'SHOW GRANTS' for the database user.
+        """
+        if self.database_name == self.CHAR_NAME_DATABASE_WILDCARD:
+            return self._exists_show_grants
+
+        try:
+            privilege_names = self._privilege_names_catalog
+        except (OperationalError, ProgrammingError, ServerNotSupportedError):
+            return self._exists_show_grants
+
+        return privilege_names == self.privilege_names
+
     @property
     def text_table_name(self) -> str:
         """Get table name for use in query.
@@ -148,9 +229,8 @@ class DatabaseUserGrant:
         """Get privilege names for use in query."""
         return ", ".join(self.privilege_names)
 
-    @object_not_exists
-    def grant(self) -> bool:
-        """Create database user grant."""
+    def _grant(self) -> None:
+        """Create database user grant, without checking if it exists."""
         Query(
             engine=self.database_user.server.support.engines.engines[
                 self.database.support.engines.MYSQL_ENGINE_NAME
@@ -163,11 +243,19 @@ class DatabaseUserGrant:
             ),
         )
 
+        self.database_user.server.support.invalidate_catalog(
+            self.database_user.server.support.CATALOG_KEY_DATABASE_USER_GRANTS
+        )
+
+    @object_not_exists
+    def grant(self) -> bool:
+        """Create database user grant."""
+        self._grant()
+
         return True
 
-    @object_exists
-    def revoke(self) -> bool:
-        """Delete database user grant."""
+    def _revoke(self) -> None:
+        """Delete database user grant, without checking if it exists."""
         Query(
             engine=self.database_user.server.support.engines.engines[
                 self.database.support.engines.MYSQL_ENGINE_NAME
@@ -180,4 +268,13 @@ class DatabaseUserGrant:
             ),
         )
 
+        self.database_user.server.support.invalidate_catalog(
+            self.database_user.server.support.CATALOG_KEY_DATABASE_USER_GRANTS
+        )
+
+    @object_exists
+    def revoke(self) -> bool:
+        """Delete database user grant."""
+        self._revoke()
+
         return True
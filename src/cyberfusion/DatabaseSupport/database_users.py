@@ -91,18 +91,61 @@ class DatabaseUser:
         return None
 
     @property
-    def exists(self) -> bool:
-        """Get database user exists locally."""
-        for database_user in self.server.database_users:
-            if database_user.name != self.name:
-                continue
+    def _exists_postgresql(self) -> bool:
+        """Get database user exists locally for PostgreSQL.
 
-            if database_user.host != self.host:
-                continue
+        Like Server.database_users, system users are considered to not exist.
+        """
+        return bool(
+            Query(
+                engine=self.server.support.engines.engines[
+                    self.server.support.engines.POSTGRESQL_ENGINE_NAME
+                ],
+                query=text(
+                    "SELECT 1 FROM pg_catalog.pg_roles WHERE rolname=:rolname AND rolname NOT IN (:admin, :postgres) AND left(rolname, length(:system_prefix)) <> :system_prefix;"
+                ).bindparams(
+                    rolname=self.name,
+                    admin=self.server.POSTGRESQL_NAME_USER_ADMIN,
+                    postgres=self.server.POSTGRESQL_NAME_USER_POSTGRES,
+                    system_prefix=self.server.POSTGRESQL_PREFIX_SYSTEM_USER,
+                ),
+            ).result
+        )
 
-            return True
+    @property
+    def _exists_mariadb(self) -> bool:
+        """Get database user exists locally for MariaDB.
 
-        return False
+        Like Server.database_users, system users are considered to not exist.
+        """
+        return bool(
+            Query(
+                engine=self.server.support.engines.engines[
+                    self.server.support.engines.MYSQL_ENGINE_NAME
+                ],
+                query=text(
+                    "SELECT 1 FROM mysql.user WHERE User=:name AND Host=:host AND User NOT IN (:monitoring, :debian_sys_maint, :mariadb_sys, :mysql);"
+                ).bindparams(
+                    name=self.name,
+                    host=self.host,
+                    monitoring=self.server.MYSQL_NAME_USER_MONITORING,
+                    debian_sys_maint=self.server.MYSQL_NAME_USER_DEBIAN_SYS_MAINT,
+                    mariadb_sys=self.server.MYSQL_NAME_USER_MARIADB_SYS,
+                    mysql=self.server.MYSQL_NAME_USER_MYSQL,
+                ),
+            ).result
+        )
+
+    @property
+    def exists(self) -> bool:
+        """Get database user exists locally."""
+        if (
+            self.server_software_name
+            == self.server.support.POSTGRESQL_SERVER_SOFTWARE_NAME
+        ):
+            return self._exists_postgresql
+
+        return self._exists_mariadb
 
     def _create_mariadb(self) -> None:
         """Create database user for MariaDB."""
@@ -126,9 +169,8 @@ class DatabaseUser:
             ),
         )
 
-    @object_not_exists
-    def create(self) -> bool:
-        """Create database user."""
+    def _create(self) -> None:
+        """Create database user, without checking if it exists."""
         if not self.password:
             raise PasswordMissingError
 
@@ -137,10 +179,17 @@ class DatabaseUser:
             == self.server.support.MARIADB_SERVER_SOFTWARE_NAME
         ):
             self._create_mariadb()
+        else:
+            self._create_postgresql()
 
-            return True
+        self.server.support.invalidate_catalog(
+            self.server.support.CATALOG_KEY_DATABASE_USERS
+        )
 
-        self._create_postgresql()
+    @object_not_exists
+    def create(self) -> bool:
+        """Create database user."""
+        self._create()
 
         return True
 
@@ -164,21 +213,25 @@ class DatabaseUser:
             query=text(f"DROP USER {self.name};").bindparams(),
         )
 
-    @object_exists
-    def drop(self) -> bool:
-        """Delete database user."""
-
-        # Delete database user
-
+    def _drop(self) -> None:
+        """Delete database user, without checking if it exists."""
         if (
             self.server_software_name
             == self.server.support.MARIADB_SERVER_SOFTWARE_NAME
         ):
             self._drop_mariadb()
+        else:
+            self._drop_postgresql()
 
-            return True
+        self.server.support.invalidate_catalog(
+            self.server.support.CATALOG_KEY_DATABASE_USERS,
+            self.server.support.CATALOG_KEY_DATABASE_USER_GRANTS,
+        )
 
-        self._drop_postgresql()
+    @object_exists
+    def drop(self) -> bool:
+        """Delete database user."""
+        self._drop()
 
         return True
 
@@ -208,22 +261,31 @@ class DatabaseUser:
             ),
         )
 
-    def edit(self) -> bool:
-        """Edit database user."""
+    def _edit(self) -> None:
+        """Edit database user, without checking if password differs."""
         if not self.password:
             raise PasswordMissingError
 
-        if self._get_password() == self.password:
-            return False
-
         if (
             self.server_software_name
             == self.server.support.MARIADB_SERVER_SOFTWARE_NAME
         ):
             self._edit_mariadb()
+        else:
+            self._edit_postgresql()
+
+        self.server.support.invalidate_catalog(
+            self.server.support.CATALOG_KEY_DATABASE_USERS
+        )
+
+    def edit(self) -> bool:
+        """Edit database user."""
+        if not self.password:
+            raise PasswordMissingError
 
-            return True
+        if self._get_password() == self.password:
+            return False
 
-        self._edit_postgresql()
+        self._edit()
 
         return True
@@ -1,27 +1,44 @@
 """Classes for interaction with databases."""
 
 import urllib.parse
+import base64
+import contextlib
 import configparser
+import hashlib
 import os
 import pwd
-from functools import cached_property
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 from _io import TextIOWrapper
-from sqlalchemy import MetaData, Engine, create_engine
+import sqlalchemy as sa
+from sqlalchemy import MetaData, Engine
+from sqlalchemy.schema import Table as SQLAlchemyTable
 
 if TYPE_CHECKING:  # pragma: no cover
     from cyberfusion.DatabaseSupport import DatabaseSupport
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 from sqlalchemy.sql import text
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
-from cyberfusion.Common import get_md5_hash, get_tmp_file, try_find_executable
-from cyberfusion.DatabaseSupport.exceptions import ServerNotSupportedError
+from cyberfusion.Common import get_tmp_file, try_find_executable
+from cyberfusion.DatabaseSupport.exceptions import (
+    InvalidInputError,
+    ServerNotSupportedError,
+)
+from cyberfusion.DatabaseSupport.exports import (
+    ExportManifest,
+    HashedFile,
+    NativeExporter,
+    ParallelExporter,
+    ParallelLoader,
+)
 from cyberfusion.DatabaseSupport.queries import Query
-from cyberfusion.DatabaseSupport.tables import Table
+from cyberfusion.DatabaseSupport.tables import Table, TableChunkChecksum
 from cyberfusion.DatabaseSupport.utilities import (
     _generate_mariadb_dsn,
     get_host_is_socket,
@@ -35,6 +52,26 @@ class Database:
 
     MYSQLDUMP_BIN = try_find_executable("mariadb-dump")
     MYSQL_BIN = try_find_executable("mariadb")
+    PG_DUMP_BIN = try_find_executable("pg_dump")
+    PG_RESTORE_BIN = try_find_executable("pg_restore")
+    GZIP_BIN = try_find_executable("gzip")
+    PIGZ_BIN = try_find_executable("pigz")
+    ZSTD_BIN = try_find_executable("zstd")
+
+    COMPRESSION_LEVEL_DEFAULT = 3
+    COMPRESSION_THREADS_DEFAULT = 1
+
+    HASH_ALGORITHMS = ["md5", "sha256", "blake2b"]
+    HASH_ALGORITHM_DEFAULT = "md5"
+
+    SIZE_CHUNK_EXPORT = 1024 * 1024
+
+    EXPORT_ENGINE_MARIADB_DUMP = "mariadb-dump"
+    EXPORT_ENGINE_NATIVE = "native"
+
+    NAME_POSTGRESQL_SERVICE = "database-support"
+
+    WORKERS_DEFAULT = 1
 
     PATH_DUMP = os.path.join(os.path.sep, "tmp", "database-support-dumps")
 
@@ -50,6 +87,8 @@ class Database:
         self.name = name
         self.server_software_name = server_software_name
 
+        self._reflections_metadata = MetaData(schema=self.name)
+
     @property
     def _mariadb_url(self) -> str:
         """Get database engine URL for MariaDB."""
@@ -115,12 +154,361 @@ class Database:
 
         return path
 
+    @property
+    def _postgresql_credentials_service_file(self) -> str:
+        """Create and set path to file with PostgreSQL credentials service.
+
+        Use the service with the environment variables from _postgresql_environment.
+        """
+        config = configparser.ConfigParser()
+
+        config[self.NAME_POSTGRESQL_SERVICE] = {}
+
+        service = config[self.NAME_POSTGRESQL_SERVICE]
+
+        # If the host is empty, the default socket is used
+
+        if get_host_is_socket(self.support.postgresql_server_host):
+            service["host"] = self.support.postgresql_server_host
+        elif self.support.postgresql_server_host:
+            url = urllib.parse.urlsplit("//" + self.support.postgresql_server_host)
+
+            service["host"] = url.hostname
+
+            if url.port:
+                service["port"] = str(url.port)
+
+        service["user"] = self.support.postgresql_server_username
+
+        if self.support.server_password:
+            service["password"] = self.support.server_password
+
+        service["dbname"] = self.name
+
+        path = get_tmp_file()
+
+        # libpq doesn't allow spaces around '='
+
+        with open(path, "w") as f:
+            config.write(f, space_around_delimiters=False)
+
+        return path
+
+    @property
+    def _postgresql_environment(self) -> Dict[str, str]:
+        """Get environment variables for PostgreSQL client programs."""
+        return {
+            **os.environ,
+            "PGSERVICEFILE": self._postgresql_credentials_service_file,
+            "PGSERVICE": self.NAME_POSTGRESQL_SERVICE,
+        }
+
+    @staticmethod
+    def _get_directory_hash(path: str, *, hash_algorithm: str) -> str:
+        """Get Base64 encoded hash of names and contents of files in directory."""
+        hash_ = hashlib.new(hash_algorithm)
+
+        for root, directory_names, file_names in os.walk(path):
+            directory_names.sort()
+
+            for file_name in sorted(file_names):
+                file_path = os.path.join(root, file_name)
+
+                hash_.update(os.path.relpath(file_path, path).encode() + b"\0")
+
+                with open(file_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(Database.SIZE_CHUNK_EXPORT), b""):
+                        hash_.update(chunk)
+
+        return base64.b64encode(hash_.digest()).decode()
+
+    def _export_postgresql(
+        self,
+        *,
+        chown_username: Optional[str],
+        exclude_tables: Optional[List[Table]],
+        root_directory: str,
+        compression: Optional[str],
+        compression_level: int,
+        hash_algorithm: str,
+        workers: int,
+    ) -> Tuple[str, str]:
+        """Export PostgreSQL database with pg_dump (see export)."""
+        if hash_algorithm not in self.HASH_ALGORITHMS:
+            raise InvalidInputError(hash_algorithm)
+
+        if workers < 1:
+            raise InvalidInputError(workers)
+
+        # Construct command
+
+        _command = [self.PG_DUMP_BIN]
+        _command.extend(["--format=directory", f"--jobs={workers}"])
+
+        if not compression:
+            _command.append("--compress=0")
+        else:
+            if compression not in self.support.COMPRESSION_LEVELS:
+                raise InvalidInputError(compression)
+
+            if compression_level not in self.support.COMPRESSION_LEVELS[compression]:
+                raise InvalidInputError(compression_level)
+
+            if compression == self.support.COMPRESSION_ZSTD:
+                _command.append(f"--compress=zstd:{compression_level}")
+            else:
+                _command.append(f"--compress={compression_level}")
+
+        # Ignore excluded tables
+
+        if exclude_tables:
+            for exclude_table in exclude_tables:
+                _command.append(
+                    f"--exclude-table={exclude_table._table_name_with_schema_name}"
+                )
+
+        # Export database. pg_dump may write to an existing directory, if empty
+
+        _stdout_directory = tempfile.mkdtemp()
+
+        _command.append(f"--file={_stdout_directory}")
+
+        # Add database name to name
+
+        stdout_directory = os.path.join(
+            root_directory,
+            self.name + "-" + os.path.basename(_stdout_directory),
+        )
+
+        try:
+            subprocess.run(_command, check=True, env=self._postgresql_environment)
+
+            os.rename(_stdout_directory, stdout_directory)
+        except BaseException:
+            # Remove partial dump, which may be large
+
+            shutil.rmtree(_stdout_directory, ignore_errors=True)
+
+            raise
+
+        # Set permissions of directory and files
+
+        if chown_username:
+            passwd = pwd.getpwnam(chown_username)
+
+            for path in [stdout_directory] + [
+                os.path.join(stdout_directory, file_name)
+                for file_name in os.listdir(stdout_directory)
+            ]:
+                os.chown(path, passwd.pw_uid, passwd.pw_gid)
+
+        return stdout_directory, self._get_directory_hash(
+            stdout_directory, hash_algorithm=hash_algorithm
+        )
+
+    def _get_compression_command(
+        self, *, compression: str, level: int, threads: int
+    ) -> List[str]:
+        """Get command that compresses stdin to stdout."""
+        if compression not in self.support.COMPRESSION_LEVELS:
+            raise InvalidInputError(compression)
+
+        if level not in self.support.COMPRESSION_LEVELS[compression]:
+            raise InvalidInputError(level)
+
+        if threads < 1:
+            raise InvalidInputError(threads)
+
+        if compression == self.support.COMPRESSION_ZSTD:
+            return [self.ZSTD_BIN, f"-{level}", f"-T{threads}", "-q", "-c"]
+
+        # Unlike gzip, pigz compresses with multiple threads, so prefer it when
+        # it is installed
+
+        if self.PIGZ_BIN:
+            return [self.PIGZ_BIN, f"-{level}", "-p", str(threads), "-c"]
+
+        return [self.GZIP_BIN, f"-{level}", "-c"]
+
+    @classmethod
+    def _run_to_file(
+        cls,
+        command: List[str],
+        path: str,
+        *,
+        compression_command: Optional[List[str]] = None,
+        hash_algorithm: str = HASH_ALGORITHM_DEFAULT,
+    ) -> str:
+        """Run command, write its stdout to path, and return hash of written bytes.
+
+        If compression_command is set, the stdout of the command is piped into
+        it, and its stdout is written instead. So the uncompressed output is
+        never written to disk.
+
+        The output is hashed while it is being written, so the file doesn't
+        have to be read again. The hash is Base64 encoded, like get_md5_hash.
+        """
+        if hash_algorithm not in cls.HASH_ALGORITHMS:
+            raise InvalidInputError(hash_algorithm)
+
+        hash_ = hashlib.new(hash_algorithm)
+
+        process = subprocess.Popen(command, stdout=subprocess.PIPE)
+        processes = [process]
+
+        try:
+            stdout = process.stdout
+
+            if compression_command:
+                try:
+                    compression_process = subprocess.Popen(
+                        compression_command,
+                        stdin=process.stdout,
+                        stdout=subprocess.PIPE,
+                    )
+                finally:
+                    # Close our copy, so the command gets SIGPIPE if the
+                    # compression command exits early
+
+                    process.stdout.close()  # type: ignore[union-attr]
+
+                processes.append(compression_process)
+
+                stdout = compression_process.stdout
+
+            with open(path, "wb") as f:
+                for chunk in iter(
+                    lambda: stdout.read(cls.SIZE_CHUNK_EXPORT),  # type: ignore[union-attr]
+                    b"",
+                ):
+                    hash_.update(chunk)
+
+                    f.write(chunk)
+        except BaseException:
+            for _process in processes:
+                _process.kill()
+                _process.wait()
+
+            raise
+        finally:
+            stdout.close()  # type: ignore[union-attr]
+
+        for _process in processes:
+            _process.wait()
+
+        # If the compression command fails, the command gets SIGPIPE, so check
+        # the compression command first, as its failure is the cause
+
+        for _process in reversed(processes):
+            if _process.returncode != 0:
+                raise subprocess.CalledProcessError(_process.returncode, _process.args)
+
+        return base64.b64encode(hash_.digest()).decode()
+
+    def _export_native(
+        self,
+        path: str,
+        *,
+        compression_command: Optional[List[str]],
+        hash_algorithm: str,
+        packet_size: int,
+        exclude_table_names: List[str],
+    ) -> str:
+        """Export database with NativeExporter to path, and return hash of written bytes.
+
+        If compression_command is set, the dump is written to its stdin, and its
+        stdout is written to path (see _run_to_file).
+        """
+        if hash_algorithm not in self.HASH_ALGORITHMS:
+            raise InvalidInputError(hash_algorithm)
+
+        exporter = NativeExporter(
+            database=self,
+            packet_size=packet_size,
+            exclude_table_names=exclude_table_names,
+        )
+
+        with open(path, "wb") as f:
+            hashed_file = HashedFile(f, hash_algorithm=hash_algorithm)
+
+            if not compression_command:
+                exporter.export(hashed_file)
+
+                return hashed_file.hash
+
+            process = subprocess.Popen(
+                compression_command, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+
+            def _write_compressed() -> None:
+                try:
+                    for chunk in iter(
+                        lambda: process.stdout.read(self.SIZE_CHUNK_EXPORT),  # type: ignore[union-attr]
+                        b"",
+                    ):
+                        hashed_file.write(chunk)
+                except BaseException:
+                    # Let writing to stdin fail, instead of blocking on a full pipe
+
+                    process.kill()
+
+                    raise
+
+            # Read stdout of the compression command while writing to its stdin,
+            # as either pipe blocks when full
+
+            try:
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    future = executor.submit(_write_compressed)
+
+                    try:
+                        exporter.export(process.stdin)
+                    except BaseException as e:
+                        process.kill()
+
+                        with contextlib.suppress(BrokenPipeError):
+                            process.stdin.close()  # type: ignore[union-attr]
+
+                        # If reading stdout failed, the process was killed, so
+                        # writing to stdin failed as a result. In that case,
+                        # raise the exception of reading stdout, as it is the
+                        # cause.
+
+                        exception = future.exception()
+
+                        if isinstance(e, BrokenPipeError) and exception is not None:
+                            raise exception
+
+                        raise
+
+                    # If the process exited early, closing fails. Its return
+                    # code is checked below.
+
+                    with contextlib.suppress(BrokenPipeError):
+                        process.stdin.close()  # type: ignore[union-attr]
+
+                    future.result()
+            finally:
+                returncode = process.wait()  # Also when an exception is raised
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, compression_command)
+
+        return hashed_file.hash
+
     def export(
         self,
         *,
         chown_username: Optional[str] = None,
         exclude_tables: Optional[List[Table]] = None,
         root_directory: str = PATH_DUMP,
+        compression: Optional[str] = None,
+        compression_level: int = COMPRESSION_LEVEL_DEFAULT,
+        compression_threads: int = COMPRESSION_THREADS_DEFAULT,
+        hash_algorithm: str = HASH_ALGORITHM_DEFAULT,
+        engine: str = EXPORT_ENGINE_MARIADB_DUMP,
+        packet_size: int = NativeExporter.SIZE_PACKET_DEFAULT,
+        workers: int = WORKERS_DEFAULT,
     ) -> Tuple[str, str]:
         """Export database.
 
@@ -134,40 +522,102 @@ class Database:
         The dump is written to a file inside root_directory. The default path
         is are automatically cleaned up using systemd-tmpfiles, if this library
         is installed as a Debian package.
+
+        If compression is set (see DatabaseSupport.COMPRESSION_*), the dump is
+        compressed while it is being written, and the file extension is changed
+        accordingly (e.g. '.sql.gz'). The returned hash is of the compressed file.
+        compression_threads is used by zstd and pigz (not gzip).
+
+        The returned hash is Base64 encoded, and calculated while the dump is
+        written, using hash_algorithm (see HASH_ALGORITHMS).
+
+        By default, the dump is created by mariadb-dump. If engine is
+        EXPORT_ENGINE_NATIVE, it is created by this library instead (see
+        NativeExporter), with INSERT statements of at most packet_size bytes.
+
+        For PostgreSQL, the dump is created by pg_dump in directory format, with
+        workers jobs. The returned path is of the directory, and the returned
+        hash is of the names and contents of its files. As pg_dump writes the
+        files itself, they are read again to hash them. pg_dump compresses the
+        files itself, so compression_threads and engine are not used. zstd
+        requires pg_dump 16 or higher.
         """
+        if self.server_software_name == self.support.POSTGRESQL_SERVER_SOFTWARE_NAME:
+            return self._export_postgresql(
+                chown_username=chown_username,
+                exclude_tables=exclude_tables,
+                root_directory=root_directory,
+                compression=compression,
+                compression_level=compression_level,
+                hash_algorithm=hash_algorithm,
+                workers=workers,
+            )
+
         if self.server_software_name != self.support.MARIADB_SERVER_SOFTWARE_NAME:
             raise ServerNotSupportedError
 
-        # Construct command
+        if engine not in [self.EXPORT_ENGINE_MARIADB_DUMP, self.EXPORT_ENGINE_NATIVE]:
+            raise InvalidInputError(engine)
 
-        _command = [self.MYSQLDUMP_BIN]
-        _command.append(f"--defaults-extra-file={self._mysql_credentials_config_file}")
-        _command.extend(["--opt", "--single-transaction", "-a", self.name])
+        compression_command = None
 
-        # Ignore excluded tables
-
-        if exclude_tables:
-            for exclude_table in exclude_tables:
-                _command.append(
-                    f"--ignore-table={exclude_table._table_name_with_schema_name}"
-                )
+        if compression:
+            compression_command = self._get_compression_command(
+                compression=compression,
+                level=compression_level,
+                threads=compression_threads,
+            )
 
         # Export database
 
         _stdout_file = get_tmp_file()
 
-        with open(_stdout_file, "w") as f:
-            subprocess.run(_command, check=True, stdout=f)
+        if engine == self.EXPORT_ENGINE_NATIVE:
+            hash_ = self._export_native(
+                _stdout_file,
+                compression_command=compression_command,
+                hash_algorithm=hash_algorithm,
+                packet_size=packet_size,
+                exclude_table_names=[
+                    exclude_table.name for exclude_table in exclude_tables or []
+                ],
+            )
+        else:
+            # Construct command
+
+            _command = [self.MYSQLDUMP_BIN]
+            _command.append(
+                f"--defaults-extra-file={self._mysql_credentials_config_file}"
+            )
+            _command.extend(["--opt", "--single-transaction", "-a", self.name])
+
+            # Ignore excluded tables
+
+            if exclude_tables:
+                for exclude_table in exclude_tables:
+                    _command.append(
+                        f"--ignore-table={exclude_table._table_name_with_schema_name}"
+                    )
+
+            hash_ = self._run_to_file(
+                _command,
+                _stdout_file,
+                compression_command=compression_command,
+                hash_algorithm=hash_algorithm,
+            )
 
         # Add database name and file extension to name
 
+        extension = self.support.EXTENSION_FILE_SQL
+
+        if compression == self.support.COMPRESSION_GZIP:
+            extension += "." + self.support.EXTENSION_FILE_GZIP
+        elif compression == self.support.COMPRESSION_ZSTD:
+            extension += "." + self.support.EXTENSION_FILE_ZSTD
+
         stdout_file = os.path.join(
             root_directory,
-            self.name
-            + "-"
-            + os.path.basename(_stdout_file)
-            + "."
-            + self.support.EXTENSION_FILE_SQL,
+            self.name + "-" + os.path.basename(_stdout_file) + "." + extension,
         )
 
         os.rename(_stdout_file, stdout_file)
@@ -179,13 +629,96 @@ class Database:
 
             os.chown(stdout_file, passwd.pw_uid, passwd.pw_gid)
 
-        return stdout_file, get_md5_hash(stdout_file)
+        return stdout_file, hash_
+
+    def export_parallel(
+        self,
+        *,
+        chown_username: Optional[str] = None,
+        root_directory: str = PATH_DUMP,
+        workers: int = ParallelExporter.WORKERS_DEFAULT,
+        chunk_size: int = ParallelExporter.CHUNK_SIZE_DEFAULT,
+        hash_algorithm: str = HASH_ALGORITHM_DEFAULT,
+    ) -> Tuple[str, ExportManifest]:
+        """Export database with multiple connections (see ParallelExporter).
+
+        Unlike export, the dump is written to a directory inside root_directory,
+        containing a file per unit, and a manifest with the hash of every file.
+        Load it with load_parallel.
+        """
+        directory = tempfile.mkdtemp(prefix=self.name + "-", dir=root_directory)
+
+        manifest = ParallelExporter(
+            database=self,
+            workers=workers,
+            chunk_size=chunk_size,
+            hash_algorithm=hash_algorithm,
+        ).export(directory)
+
+        # Set permissions of directory and files
+
+        if chown_username:
+            passwd = pwd.getpwnam(chown_username)
+
+            for path in [directory] + [
+                os.path.join(directory, file_name)
+                for file_name in os.listdir(directory)
+            ]:
+                os.chown(path, passwd.pw_uid, passwd.pw_gid)
+
+        return directory, manifest
+
+    def load_parallel(
+        self, directory: str, *, workers: int = ParallelExporter.WORKERS_DEFAULT
+    ) -> ExportManifest:
+        """Load (import) database exported with export_parallel (see ParallelLoader)."""
+        return ParallelLoader(database=self, workers=workers).load(directory)
+
+    def load(
+        self,
+        dump_file: Union[TextIOWrapper, str],
+        *,
+        workers: int = WORKERS_DEFAULT,
+    ) -> None:
+        """Load (import) database.
+
+        For MariaDB, dump_file is an opened dump file.
+
+        For PostgreSQL, dump_file is the path to a dump directory (see export),
+        which is loaded by pg_restore with workers jobs. Existing objects in the
+        dump are dropped first. Ownership and privileges are not restored.
+        """
+        if self.server_software_name == self.support.POSTGRESQL_SERVER_SOFTWARE_NAME:
+            if not isinstance(dump_file, str):
+                raise InvalidInputError(dump_file)
+
+            if workers < 1:
+                raise InvalidInputError(workers)
+
+            _command = [self.PG_RESTORE_BIN]
+            _command.extend(
+                [
+                    f"--dbname=service={self.NAME_POSTGRESQL_SERVICE}",
+                    f"--jobs={workers}",
+                    "--clean",
+                    "--if-exists",
+                    "--no-owner",
+                    "--no-privileges",
+                    "--exit-on-error",
+                    dump_file,
+                ]
+            )
+
+            subprocess.run(_command, check=True, env=self._postgresql_environment)
+
+            return
 
-    def load(self, dump_file: TextIOWrapper) -> None:
-        """Load (import) database."""
         if self.server_software_name != self.support.MARIADB_SERVER_SOFTWARE_NAME:
             raise ServerNotSupportedError
 
+        if isinstance(dump_file, str):
+            raise InvalidInputError(dump_file)
+
         _command = [self.MYSQL_BIN]
         _command.append(f"--defaults-extra-file={self._mysql_credentials_config_file}")
         _command.append(self.name)
@@ -196,92 +729,101 @@ class Database:
             stdin=dump_file,
         )
 
+    def _create(self) -> None:
+        """Create database, without checking if it exists."""
+        create_database(self.url)
+
+        self.support.invalidate_catalog(self.support.CATALOG_KEY_DATABASES)
+
     @object_not_exists
     def create(self) -> bool:
         """Create database.
 
         Note that for PostgreSQL, this does not create a schema.
         """
-        create_database(self.url)
+        self._create()
 
         return True
 
+    def _drop(self) -> None:
+        """Drop database, without checking if it exists."""
+        drop_database(self.url)
+
+        self.support.invalidate_catalog(
+            self.support.CATALOG_KEY_DATABASES,
+            self.support.CATALOG_KEY_DATABASE_USER_GRANTS,
+        )
+
     @object_exists
     def drop(self) -> bool:
         """Drop database."""
-        drop_database(self.url)
+        self._drop()
 
         return True
 
-    @cached_property
+    @property
     def server_engine(self) -> Engine:
         if self.server_software_name == self.support.MARIADB_SERVER_SOFTWARE_NAME:
             return self.support.engines.engines[self.support.engines.MYSQL_ENGINE_NAME]
 
         return self.support.engines.engines[self.support.engines.POSTGRESQL_ENGINE_NAME]
 
-    @cached_property
+    @property
     def database_engine(self) -> Engine:
-        return create_engine(self.url)
+        return self.support.engine_registry.get(
+            self.url, **self.support.engines.engine_kwargs
+        )
 
     @property
     def _mariadb_size(self) -> int:
-        """Get size for MariaDB."""
-
-        # Set data length
-
-        data_length = 0
-        data_length_query = text(
-            "SELECT data_length FROM information_schema.tables WHERE TABLE_SCHEMA=:name;"
-        ).bindparams(name=self.name)
-
-        for result in Query(
-            engine=self.server_engine,
-            query=data_length_query,
-        ).result:
-            if result[0] is None:  # None when e.g. view
-                continue
-
-            data_length += result[0]
-
-        # Set index length
-
-        index_length = 0
-        index_length_query = text(
-            "SELECT index_length FROM information_schema.tables WHERE TABLE_SCHEMA=:name;"
-        ).bindparams(name=self.name)
-
-        for result in Query(
-            engine=self.server_engine,
-            query=index_length_query,
-        ).result:
-            if result[0] is None:  # None when e.g. view
-                continue
+        """Get size for MariaDB.
 
-            index_length += result[0]
-
-        # Set size (data length + index length)
-
-        return data_length + index_length
+        If datadir sizes are enabled but don't support the database (see
+        DatadirSizes), the size is gotten from information_schema instead.
+        """
+        if self.support.mariadb_datadir_sizes:
+            size = self.support.mariadb_datadir_sizes.get_database_size(self.name)
+
+            if size is not None:
+                return size
+
+        return int(
+            Query(
+                engine=self.server_engine,
+                query=text(
+                    "SELECT COALESCE(SUM(COALESCE(data_length, 0) + COALESCE(index_length, 0)), 0) FROM information_schema.tables WHERE TABLE_SCHEMA=:name;"  # Lengths are NULL when e.g. view
+                ).bindparams(name=self.name),
+            ).result[0][0]
+            or 0
+        )
 
     @property
     def _postgresql_size(self) -> int:
         """Get size for PostgreSQL."""
-
-        # Get database size
-
-        database_size = 0
-        database_size_query = text("SELECT pg_database_size(:name);").bindparams(
-            name=self.name
+        return int(
+            Query(
+                engine=self.server_engine,
+                query=text("SELECT pg_database_size(:name);").bindparams(
+                    name=self.name
+                ),
+            ).result[0][0]
         )
 
-        for result in Query(
-            engine=self.server_engine,
-            query=database_size_query,
-        ).result:
-            database_size += result[0]
+    @property
+    def _postgresql_size_estimate(self) -> int:
+        """Get estimated size for PostgreSQL.
 
-        return database_size
+        Adds up pages of relations in the database, according to pg_class. These
+        statistics are updated by e.g. VACUUM and ANALYZE, so they may be outdated.
+        """
+        return int(
+            Query(
+                engine=self.database_engine,  # pg_class is per database
+                query=text(
+                    "SELECT COALESCE(SUM(relpages), 0)::bigint * current_setting('block_size')::bigint FROM pg_catalog.pg_class WHERE NOT relisshared;"
+                ),
+            ).result[0][0]
+        )
 
     @property
     def size(self) -> int:
@@ -291,27 +833,102 @@ class Database:
 
         return self._postgresql_size
 
+    def get_size(self, *, estimate: bool = False) -> int:
+        """Get size, or estimated size.
+
+        For PostgreSQL, the estimate is much cheaper than the exact size, as it
+        uses statistics instead of the files on disk. Estimates are cached on
+        support (see DatabaseSupport).
+
+        For MariaDB, the size is always based on statistics, so estimate has no
+        effect.
+        """
+        if (
+            not estimate
+            or self.server_software_name == self.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            return self.size
+
+        return self.support.size_estimates_cache.get(
+            (self.server_software_name, self.name),
+            lambda: self._postgresql_size_estimate,
+        )
+
     @property
     def metadata(self) -> MetaData:
-        """Get metadata with SQLAlchemy."""
+        """Get metadata with SQLAlchemy.
+
+        This reflects all tables, including columns, indexes, constraints, etc.
+        If only table names are needed, use the 'tables' property instead.
+        """
         metadata_obj = MetaData(schema=self.name)
 
         metadata_obj.reflect(bind=self.database_engine)
 
         return metadata_obj
 
+    def get_table_reflection(self, name: str) -> SQLAlchemyTable:
+        """Get reflected table.
+
+        Only the given table is reflected (and tables it references). The
+        reflection is cached on this object, until cleared.
+        """
+        key = self.name + "." + name
+
+        if key not in self._reflections_metadata.tables:
+            self._reflections_metadata.reflect(bind=self.database_engine, only=[name])
+
+        return self._reflections_metadata.tables[key]
+
+    def clear_table_reflection(self, name: str) -> None:
+        """Clear cached reflection of table, if any."""
+        key = self.name + "." + name
+
+        if key not in self._reflections_metadata.tables:
+            return
+
+        self._reflections_metadata.remove(self._reflections_metadata.tables[key])
+
     @property
     def tables(self) -> List[Table]:
-        """Get tables."""
+        """Get tables.
+
+        Only table names are retrieved, without reflecting the tables.
+        """
         tables: List[Table] = []
 
-        for _, sat in self.metadata.tables.items():
-            tables.append(Table(database=self, name=sat.name))
+        for name in sa.inspect(self.database_engine).get_table_names(schema=self.name):
+            tables.append(Table(database=self, name=name))
 
         return tables
 
+    def get_table_checksums(self, table_names: List[str]) -> Dict[str, Optional[int]]:
+        """Get checksums of tables, using one query.
+
+        Checksums are None for tables that do not exist.
+        """
+        if self.server_software_name != self.support.MARIADB_SERVER_SOFTWARE_NAME:
+            raise ServerNotSupportedError
+
+        if not table_names:
+            return {}
+
+        tables = ", ".join(
+            f"`{self.name}`.`{table_name}`" for table_name in table_names
+        )
+
+        checksums = {}
+
+        for result in Query(
+            engine=self.server_engine,
+            query=text(f"CHECKSUM TABLE {tables};").bindparams(),
+        ).result:
+            checksums[result[0].split(".", 1)[1]] = result[1]  # Name includes schema
+
+        return checksums
+
     def compare(
-        self, *, right_database: "Database"
+        self, *, right_database: "Database", workers: int = 1
     ) -> Tuple[Dict[str, bool], List[str], List[str]]:
         """Compare database to another database.
 
@@ -324,63 +941,123 @@ class Database:
           be considered added to left.
         * Tables that are only present in right (not in left). These tables can
           be considered removed from left.
+
+        Tables present in left and right are checksummed in batches. The amount
+        of batches per database is set by workers. All batches of both databases
+        run concurrently.
         """
         if self.server_software_name != self.support.MARIADB_SERVER_SOFTWARE_NAME:
             raise ServerNotSupportedError
 
-        present_in_left_and_right = {}
-        present_in_only_left = []
-        present_in_only_right = []
-
-        # Get tables that are only present in right
-
-        for right_table in right_database.tables:
-            if any(right_table.name == left_table.name for left_table in self.tables):
-                continue
-
-            present_in_only_right.append(right_table.name)
-
-        # Get tables that are only present in left
-
-        for left_table in self.tables:
-            if any(
-                left_table.name == right_table.name
-                for right_table in right_database.tables
-            ):
-                continue
-
-            present_in_only_left.append(left_table.name)
-
-        # Get tables that are present in left and right
-
-        for right_table in right_database.tables:
-            for left_table in self.tables:
-                if left_table.name != right_table.name:
-                    continue
-
-                # Table is in left and right
-
-                identical = right_table.checksum == left_table.checksum
-
-                present_in_left_and_right[right_table.name] = identical
-
-                break
-
-        for left_table in self.tables:
-            for right_table in right_database.tables:
-                if right_table.name != left_table.name:
-                    continue
-
-                # Table is in left and right
-
-                identical = left_table.checksum == right_table.checksum
-
-                present_in_left_and_right[left_table.name] = identical
-
-                break
+        if workers < 1:
+            raise InvalidInputError(workers)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            left_table_names_future = executor.submit(
+                lambda: [table.name for table in self.tables]
+            )
+            right_table_names_future = executor.submit(
+                lambda: [table.name for table in right_database.tables]
+            )
+
+            left_table_names = left_table_names_future.result()
+            right_table_names = right_table_names_future.result()
+
+        left_table_names_set = set(left_table_names)
+        right_table_names_set = set(right_table_names)
+
+        present_in_only_left = [
+            name for name in left_table_names if name not in right_table_names_set
+        ]
+        present_in_only_right = [
+            name for name in right_table_names if name not in left_table_names_set
+        ]
+        present_in_left_and_right_names = [
+            name for name in left_table_names if name in right_table_names_set
+        ]
+
+        # Checksum tables in batches, for left and right concurrently
+
+        batches = [
+            present_in_left_and_right_names[i::workers]
+            for i in range(workers)
+            if present_in_left_and_right_names[i::workers]
+        ]
+
+        left_checksums: Dict[str, Optional[int]] = {}
+        right_checksums: Dict[str, Optional[int]] = {}
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=len(batches) * 2) as executor:
+                left_futures = [
+                    executor.submit(self.get_table_checksums, batch)
+                    for batch in batches
+                ]
+                right_futures = [
+                    executor.submit(right_database.get_table_checksums, batch)
+                    for batch in batches
+                ]
+
+                for future in left_futures:
+                    left_checksums.update(future.result())
+
+                for future in right_futures:
+                    right_checksums.update(future.result())
+
+        # Checksums are None for tables that were dropped after listing them,
+        # so the tables can't be considered identical
+
+        present_in_left_and_right = {
+            name: left_checksums[name] is not None
+            and left_checksums[name] == right_checksums[name]
+            for name in present_in_left_and_right_names
+        }
 
         return (
             present_in_left_and_right,
             present_in_only_left,
             present_in_only_right,
         )
+
+    def compare_table_chunks(
+        self,
+        *,
+        right_database: "Database",
+        table_name: str,
+        chunk_size: int,
+        workers: int = 1,
+    ) -> List[Tuple[TableChunkChecksum, TableChunkChecksum]]:
+        """Compare table to table with same name in another database, by chunks.
+
+        Chunk boundaries are determined on the left table, and used for both
+        tables. Reports the chunks (left and right) that differ, so that the
+        primary key ranges with differing rows are known.
+
+        Both tables must have a primary key consisting of one column.
+        """
+        left_table = Table(database=self, name=table_name)
+        right_table = Table(database=right_database, name=table_name)
+
+        boundaries = left_table.get_chunk_boundaries(chunk_size=chunk_size)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            left_chunks_future = executor.submit(
+                left_table.get_chunk_checksums,
+                boundaries=boundaries,
+                workers=workers,
+            )
+            right_chunks_future = executor.submit(
+                right_table.get_chunk_checksums,
+                boundaries=boundaries,
+                workers=workers,
+            )
+
+            left_chunks = left_chunks_future.result()
+            right_chunks = right_chunks_future.result()
+
+        return [
+            (left_chunk, right_chunk)
+            for left_chunk, right_chunk in zip(left_chunks, right_chunks)
+            if left_chunk.rows != right_chunk.rows
+            or left_chunk.checksum != right_chunk.checksum
+        ]
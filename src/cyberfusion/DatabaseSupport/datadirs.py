@@ -0,0 +1,160 @@
+"""Classes for interaction with MariaDB datadirs."""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+
+class DatadirSizes:
+    """Sizes of MariaDB databases, based on files in datadir.
+
+    Adds up sizes of table files (InnoDB file-per-table, MyISAM and Aria) per
+    database directory. This does not open tables, unlike queries on
+    information_schema.tables. Data in shared tablespaces (such as ibdata1) is
+    not included.
+
+    Sizes are cached per directory until the mtime of the directory changes
+    (i.e. tables are added or removed), or until maximum_age seconds have
+    passed (as table files may grow without changing the directory mtime).
+
+    Only databases with ASCII names are supported (see encode_name). For other
+    databases, sizes are None (or absent), so callers must get them otherwise.
+    """
+
+    EXTENSIONS_FILES_TABLES = (".ibd", ".MYD", ".MYI", ".MAD", ".MAI")
+
+    MAXIMUM_AGE_DEFAULT = 60
+    WORKERS_DEFAULT = 4
+
+    def __init__(
+        self,
+        *,
+        path: str,
+        maximum_age: float = MAXIMUM_AGE_DEFAULT,
+        workers: int = WORKERS_DEFAULT,
+    ) -> None:
+        """Set attributes."""
+        self.path = path
+        self.maximum_age = maximum_age
+        self.workers = workers
+
+        self.hits = 0
+        self.misses = 0
+
+        self._sizes: Dict[str, Tuple[int, float, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def encode_name(name: str) -> Optional[str]:
+        """Encode database name to directory name.
+
+        MariaDB encodes ASCII characters other than letters, digits and
+        underscores as '@' followed by the hexadecimal code point (four digits).
+        Many non-ASCII characters are encoded differently (e.g. '@0G'), so None
+        is returned for non-ASCII names.
+        """
+        if not name.isascii():
+            return None
+
+        return re.sub(r"[^0-9A-Za-z_]", lambda match: f"@{ord(match[0]):04x}", name)
+
+    @staticmethod
+    def decode_name(name: str) -> Optional[str]:
+        """Decode directory name to database name.
+
+        Returns None for names with codes of non-ASCII characters (see encode_name).
+        """
+        pattern = r"@00([0-7][0-9a-f])"
+
+        if "@" in re.sub(pattern, "", name):
+            return None
+
+        return re.sub(pattern, lambda match: chr(int(match[1], 16)), name)
+
+    def _get_directory_size(self, path: str) -> Optional[int]:
+        """Get size of table files in directory, cached.
+
+        Returns None if the directory doesn't exist.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            if path in self._sizes:
+                cached_mtime, cached_at, size = self._sizes[path]
+
+                if (
+                    cached_mtime == mtime
+                    and time.monotonic() - cached_at <= self.maximum_age
+                ):
+                    self.hits += 1
+
+                    return size
+
+            self.misses += 1
+
+        size = 0
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(self.EXTENSIONS_FILES_TABLES):
+                        continue
+
+                    try:
+                        size += entry.stat(follow_symlinks=False).st_size
+                    except FileNotFoundError:  # Removed while scanning
+                        continue
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            self._sizes[path] = (mtime, time.monotonic(), size)
+
+        return size
+
+    def get_database_size(self, name: str) -> Optional[int]:
+        """Get size of database.
+
+        Returns None if the name is not supported, or the directory doesn't exist.
+        """
+        directory_name = self.encode_name(name)
+
+        if directory_name is None:
+            return None
+
+        return self._get_directory_size(os.path.join(self.path, directory_name))
+
+    def get_database_sizes(self) -> Dict[str, int]:
+        """Get sizes of all databases (i.e. directories in datadir).
+
+        Directories are scanned by the given amount of workers concurrently.
+        Databases with unsupported names (see decode_name) are absent.
+        """
+        with os.scandir(self.path) as entries:
+            names = [
+                entry.name for entry in entries if entry.is_dir(follow_symlinks=False)
+            ]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            sizes = executor.map(
+                lambda name: self._get_directory_size(os.path.join(self.path, name)),
+                names,
+            )
+
+            database_sizes = {}
+
+            for name, size in zip(names, sizes):
+                database_name = self.decode_name(name)
+
+                if database_name is None or size is None:
+                    continue
+
+                database_sizes[database_name] = size
+
+            return database_sizes
@@ -1,12 +1,12 @@
 """Classes for interaction with database engines."""
 
 import os
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Any, Dict
 
 import sqlalchemy as sa
 from functools import cached_property
 
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from cyberfusion.DatabaseSupport.servers import Server
 from cyberfusion.DatabaseSupport.utilities import _generate_mariadb_dsn
@@ -27,6 +27,10 @@ class Engines:
     MYSQL_ENGINE_NAME = "mysql"
     POSTGRESQL_ENGINE_NAME = "postgresql"
 
+    POOL_SIZE_DEFAULT = 5
+    POOL_MAX_OVERFLOW_DEFAULT = 10
+    POOL_RECYCLE_DEFAULT = -1
+
     def __init__(
         self,
         *,
@@ -72,25 +76,44 @@ class Engines:
 
         return urls
 
-    @cached_property
+    @property
+    def engine_kwargs(self) -> Dict[str, Any]:
+        """Get keyword arguments for creating engines.
+
+        Without pooling, connections are closed after every query. With pooling,
+        connections are kept open and reused.
+        """
+        if not self.support.pooled:
+            return {"poolclass": NullPool}
+
+        return {
+            "poolclass": QueuePool,
+            "pool_size": self.support.pool_size,
+            "max_overflow": self.support.pool_max_overflow,
+            "pool_recycle": self.support.pool_recycle,
+            "pool_pre_ping": self.support.pool_pre_ping,
+            "pool_use_lifo": self.support.pool_use_lifo,
+        }
+
+    @property
     def engines(self) -> Dict[str, sa.engine.base.Engine]:
-        """Create engines."""
+        """Get engines from engine registry."""
         engines: Dict[str, sa.engine.base.Engine] = {}
 
         if (
             self.support.MARIADB_SERVER_SOFTWARE_NAME
             in self.support.server_software_names
         ):
-            engines[self.MYSQL_ENGINE_NAME] = sa.create_engine(
-                self.urls[self.MYSQL_ENGINE_NAME], poolclass=NullPool
+            engines[self.MYSQL_ENGINE_NAME] = self.support.engine_registry.get(
+                self.urls[self.MYSQL_ENGINE_NAME], **self.engine_kwargs
             )
 
         if (
             self.support.POSTGRESQL_SERVER_SOFTWARE_NAME
             in self.support.server_software_names
         ):
-            engines[self.POSTGRESQL_ENGINE_NAME] = sa.create_engine(
-                self.urls[self.POSTGRESQL_ENGINE_NAME], poolclass=NullPool
+            engines[self.POSTGRESQL_ENGINE_NAME] = self.support.engine_registry.get(
+                self.urls[self.POSTGRESQL_ENGINE_NAME], **self.engine_kwargs
             )
 
         return engines
@@ -27,3 +27,15 @@ class PasswordMissingError(Exception):
     """Password missing."""
 
     pass
+
+
+class PrimaryKeyNotSupportedError(Exception):
+    """Primary key not supported (e.g. absent or composite)."""
+
+    pass
+
+
+class ReadLockTimeoutError(Exception):
+    """Global read lock could not be acquired in time."""
+
+    pass
@@ -0,0 +1,693 @@
+"""Classes for parallel export and load of databases."""
+
+import base64
+import hashlib
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+from pymysql.converters import escape_item
+from sqlalchemy.sql import text
+
+from cyberfusion.DatabaseSupport.exceptions import (
+    InvalidInputError,
+    PrimaryKeyNotSupportedError,
+    ReadLockTimeoutError,
+    ServerNotSupportedError,
+)
+from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.tables import Table
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cyberfusion.DatabaseSupport.databases import Database
+
+
+class ExportManifestFile(BaseModel):
+    """File in parallel export."""
+
+    table_name: str
+    file_name: str
+    hash: str
+    rows: int
+
+
+class ExportManifest(BaseModel):
+    """Manifest of parallel export.
+
+    Schema files contain a DROP TABLE statement on the first line, and a CREATE
+    TABLE statement on the remaining lines. Data files contain one INSERT
+    statement per line.
+    """
+
+    database_name: str
+    hash_algorithm: str
+    created_at: datetime
+    schema_files: List[ExportManifestFile]
+    data_files: List[ExportManifestFile]
+
+
+def escape_value(value: Any) -> str:
+    """Escape value for use in MariaDB statement."""
+    if isinstance(value, (bytes, bytearray)):
+        return "X'" + value.hex() + "'"
+
+    return escape_item(value, "utf8mb4")
+
+
+class HashedFile:
+    """Abstract representation of file that is hashed while it is written."""
+
+    def __init__(self, f: IO[bytes], *, hash_algorithm: str) -> None:
+        """Set attributes."""
+        self.f = f
+
+        self._hash = hashlib.new(hash_algorithm)
+
+    def write(self, data: bytes) -> None:
+        """Write data to file, and add it to hash."""
+        self._hash.update(data)
+
+        self.f.write(data)
+
+    @property
+    def hash(self) -> str:
+        """Get Base64 encoded hash of written bytes."""
+        return base64.b64encode(self._hash.digest()).decode()
+
+
+class Exporter:
+    """Base class for exporting database natively, i.e. without mariadb-dump.
+
+    Tables are read with a transaction with consistent snapshot. Rows are
+    streamed using a server-side cursor, and written as extended INSERT
+    statements, one statement per line. Statements are at most packet_size
+    bytes (unless a single row is larger), which must not exceed the
+    max_allowed_packet of the server that loads them.
+    """
+
+    SIZE_PACKET_DEFAULT = 1024 * 1024
+    BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        *,
+        database: "Database",
+        packet_size: int = SIZE_PACKET_DEFAULT,
+    ) -> None:
+        """Set attributes."""
+        if (
+            database.server_software_name
+            != database.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            raise ServerNotSupportedError
+
+        if packet_size < 1:
+            raise InvalidInputError(packet_size)
+
+        self.database = database
+        self.packet_size = packet_size
+
+    @property
+    def _tables_rows(self) -> Dict[str, int]:
+        """Get estimated amount of rows per table."""
+        return {
+            result[0]: result[1] or 0
+            for result in Query(
+                engine=self.database.server_engine,
+                query=text(
+                    "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = :database_name AND TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_NAME;"
+                ).bindparams(database_name=self.database.name),
+            ).result
+        }
+
+    @property
+    def _tables_column_names(self) -> Dict[str, List[str]]:
+        """Get names of columns per table, except generated columns.
+
+        Generated columns can't be inserted into, so they are left out.
+        """
+        tables_column_names: Dict[str, List[str]] = {}
+
+        for result in Query(
+            engine=self.database.server_engine,
+            query=text(
+                "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = :database_name AND IS_GENERATED = 'NEVER' ORDER BY TABLE_NAME, ORDINAL_POSITION;"
+            ).bindparams(database_name=self.database.name),
+        ).result:
+            tables_column_names.setdefault(result[0], []).append(result[1])
+
+        return tables_column_names
+
+    @staticmethod
+    def _start_snapshot(connection: sa.engine.base.Connection) -> None:
+        """Start transaction with consistent snapshot on connection."""
+        connection.exec_driver_sql("SET SESSION TIME_ZONE = '+00:00';")
+        connection.exec_driver_sql(
+            "SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ;"
+        )
+        connection.exec_driver_sql("START TRANSACTION WITH CONSISTENT SNAPSHOT;")
+
+    def _get_quoted_table_name_with_schema_name(self, table_name: str) -> str:
+        """Get quoted table name with schema name.
+
+        Unlike Table, any table name is supported, as names are quoted.
+        """
+        return Table._quote(self.database.name) + "." + Table._quote(table_name)
+
+    def _write_create_table(
+        self,
+        connection: sa.engine.base.Connection,
+        table_name: str,
+        f: Union[IO[bytes], HashedFile],
+    ) -> None:
+        """Write DROP TABLE statement, and CREATE TABLE statement."""
+        create_statement = connection.exec_driver_sql(
+            f"SHOW CREATE TABLE {self._get_quoted_table_name_with_schema_name(table_name)};"
+        ).one()[1]
+
+        f.write(f"DROP TABLE IF EXISTS {Table._quote(table_name)};\n".encode())
+        f.write((create_statement + ";\n").encode())
+
+    def _write_inserts(
+        self,
+        connection: sa.engine.base.Connection,
+        table_name: str,
+        column_names: List[str],
+        f: Union[IO[bytes], HashedFile],
+        *,
+        lower_boundary: Any = None,
+        upper_boundary: Any = None,
+    ) -> int:
+        """Write rows of table between boundaries as extended INSERT statements.
+
+        Returns amount of rows.
+        """
+        where, parameters = "", {}
+
+        # Boundaries are only set for tables supported by Table (see
+        # ParallelExporter._get_table_ranges)
+
+        if lower_boundary is not None or upper_boundary is not None:
+            where, parameters = Table(
+                database=self.database, name=table_name
+            )._get_range_condition(
+                lower_boundary=lower_boundary, upper_boundary=upper_boundary
+            )
+
+        quoted_column_names = ", ".join(
+            Table._quote(column_name) for column_name in column_names
+        )
+
+        result_proxy = connection.execution_options(
+            stream_results=True, max_row_buffer=self.BATCH_SIZE
+        ).execute(
+            text(
+                f"SELECT {quoted_column_names} FROM {self._get_quoted_table_name_with_schema_name(table_name)}{where};"
+            ).bindparams(**parameters)
+        )
+
+        prefix = f"INSERT INTO {Table._quote(table_name)} ({quoted_column_names}) VALUES ".encode()
+
+        rows = 0
+
+        values: List[bytes] = []
+        size = len(prefix)
+
+        for partition in result_proxy.partitions(self.BATCH_SIZE):
+            for row in partition:
+                value = (
+                    "(" + ",".join(escape_value(item) for item in row) + ")"
+                ).encode()
+
+                # size includes a comma per value, so only the new value and
+                # the trailing semicolon are added
+
+                if values and size + len(value) + 1 > self.packet_size:
+                    f.write(prefix + b",".join(values) + b";\n")
+
+                    values, size = [], len(prefix)
+
+                values.append(value)
+                size += len(value) + 1
+
+                rows += 1
+
+        if values:
+            f.write(prefix + b",".join(values) + b";\n")
+
+        return rows
+
+
+class ParallelExporter(Exporter):
+    """Export database with multiple connections, sharing one consistent snapshot.
+
+    The database is split into units: the schema of every table, and the rows
+    of every table. Rows of tables with more than chunk_size rows (estimated)
+    are split further by primary key range, if the table has a primary key
+    consisting of one column.
+
+    Units are dumped by workers, each using its own connection. To let all
+    connections see the same data, the transactions are started while a global
+    read lock is held (i.e. 'FLUSH TABLES WITH READ LOCK', which requires the
+    RELOAD privilege). The lock is released as soon as all transactions are
+    started. Like mariadb-dump --single-transaction, the data is only consistent
+    for transactional tables (e.g. InnoDB).
+
+    Acquiring the lock waits for running queries, while blocking new ones. So
+    that a long-running query doesn't block other queries for long, waiting is
+    limited to LOCK_WAIT_TIMEOUT seconds, after which ReadLockTimeoutError is
+    raised.
+
+    Files are named by index, as table names may contain any character. The
+    names of tables and columns must not contain newlines, as data files
+    contain one statement per line.
+
+    Only tables are exported; views, routines, triggers and events are not.
+    """
+
+    NAME_FILE_MANIFEST = "manifest.json"
+
+    WORKERS_DEFAULT = 4
+    CHUNK_SIZE_DEFAULT = 1000000
+
+    LOCK_WAIT_TIMEOUT = 10
+    ERROR_CODE_LOCK_WAIT_TIMEOUT = 1205
+
+    def __init__(
+        self,
+        *,
+        database: "Database",
+        workers: int = WORKERS_DEFAULT,
+        chunk_size: int = CHUNK_SIZE_DEFAULT,
+        hash_algorithm: str,
+        packet_size: int = Exporter.SIZE_PACKET_DEFAULT,
+    ) -> None:
+        """Set attributes."""
+        super().__init__(database=database, packet_size=packet_size)
+
+        if workers < 1:
+            raise InvalidInputError(workers)
+
+        if chunk_size < 1:
+            raise InvalidInputError(chunk_size)
+
+        if hash_algorithm not in database.HASH_ALGORITHMS:
+            raise InvalidInputError(hash_algorithm)
+
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.hash_algorithm = hash_algorithm
+
+    def _get_table_ranges(
+        self, table_name: str, rows: int
+    ) -> List[Tuple[Optional[Any], Optional[Any]]]:
+        """Get primary key ranges to split rows of table into.
+
+        Tables with names that are not supported by Table are not split.
+        """
+        if rows <= self.chunk_size:
+            return [(None, None)]
+
+        try:
+            boundaries = Table(
+                database=self.database, name=table_name
+            ).get_chunk_boundaries(chunk_size=self.chunk_size)
+        except (InvalidInputError, PrimaryKeyNotSupportedError):
+            return [(None, None)]
+
+        # The first range is unbounded below, and the last range unbounded above,
+        # so rows added after the boundaries were determined are exported too
+
+        boundaries = [None] + boundaries[1:] + [None]
+
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _get_connections(self) -> List[sa.engine.base.Connection]:
+        """Get connections with transactions sharing one consistent snapshot."""
+        connections: List[sa.engine.base.Connection] = []
+
+        try:
+            with self.database.server_engine.connect() as lock_connection:
+                lock_connection.exec_driver_sql(
+                    f"SET SESSION lock_wait_timeout = {self.LOCK_WAIT_TIMEOUT};"
+                )
+
+                try:
+                    lock_connection.exec_driver_sql("FLUSH TABLES WITH READ LOCK;")
+                except sa.exc.OperationalError as e:
+                    if e.orig.args[0] == self.ERROR_CODE_LOCK_WAIT_TIMEOUT:  # type: ignore[union-attr]
+                        raise ReadLockTimeoutError from e
+
+                    raise
+
+                try:
+                    for _ in range(self.workers):
+                        connection = self.database.server_engine.connect()
+
+                        connections.append(connection)
+
+                        self._start_snapshot(connection)
+                finally:
+                    lock_connection.exec_driver_sql("UNLOCK TABLES;")
+        except BaseException:
+            for connection in connections:
+                connection.close()
+
+            raise
+
+        return connections
+
+    def _dump_schema(
+        self,
+        connection: sa.engine.base.Connection,
+        table_name: str,
+        file_name: str,
+        directory: str,
+    ) -> ExportManifestFile:
+        """Dump schema of table to file."""
+        with open(os.path.join(directory, file_name), "wb") as f:
+            hashed_file = HashedFile(f, hash_algorithm=self.hash_algorithm)
+
+            self._write_create_table(connection, table_name, hashed_file)
+
+        return ExportManifestFile(
+            table_name=table_name, file_name=file_name, hash=hashed_file.hash, rows=0
+        )
+
+    def _dump_rows(
+        self,
+        connection: sa.engine.base.Connection,
+        table_name: str,
+        column_names: List[str],
+        lower_boundary: Any,
+        upper_boundary: Any,
+        file_name: str,
+        directory: str,
+    ) -> ExportManifestFile:
+        """Dump rows of table between boundaries to file."""
+        with open(os.path.join(directory, file_name), "wb") as f:
+            hashed_file = HashedFile(f, hash_algorithm=self.hash_algorithm)
+
+            rows = self._write_inserts(
+                connection,
+                table_name,
+                column_names,
+                hashed_file,
+                lower_boundary=lower_boundary,
+                upper_boundary=upper_boundary,
+            )
+
+        return ExportManifestFile(
+            table_name=table_name, file_name=file_name, hash=hashed_file.hash, rows=rows
+        )
+
+    def export(self, directory: str) -> ExportManifest:
+        """Export database to directory, and write manifest.
+
+        The manifest is written last, so a directory with a manifest contains a
+        complete export.
+        """
+        tables_column_names = self._tables_column_names
+
+        # Determine units before the snapshot, so the global read lock is held
+        # as short as possible
+
+        schema_units: List[Tuple[str, str]] = []
+        data_units: List[Tuple[str, Any, Any, str]] = []
+
+        for number, (table_name, rows) in enumerate(self._tables_rows.items()):
+            for name in [table_name] + tables_column_names[table_name]:
+                if "\n" in name:
+                    raise InvalidInputError(name)
+
+            schema_units.append((table_name, f"{number}.schema.sql"))
+
+            for index, (lower_boundary, upper_boundary) in enumerate(
+                self._get_table_ranges(table_name, rows)
+            ):
+                data_units.append(
+                    (
+                        table_name,
+                        lower_boundary,
+                        upper_boundary,
+                        f"{number}.{index}.sql",
+                    )
+                )
+
+        connections = self._get_connections()
+
+        connections_queue: queue.Queue = queue.Queue()
+
+        for connection in connections:
+            connections_queue.put(connection)
+
+        def _with_connection(
+            function: Callable[..., ExportManifestFile], *args: Any
+        ) -> ExportManifestFile:
+            connection = connections_queue.get()
+
+            try:
+                return function(connection, *args)
+            finally:
+                connections_queue.put(connection)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                schema_futures = [
+                    executor.submit(
+                        _with_connection,
+                        self._dump_schema,
+                        table_name,
+                        file_name,
+                        directory,
+                    )
+                    for table_name, file_name in schema_units
+                ]
+                data_futures = [
+                    executor.submit(
+                        _with_connection,
+                        self._dump_rows,
+                        table_name,
+                        tables_column_names[table_name],
+                        lower_boundary,
+                        upper_boundary,
+                        file_name,
+                        directory,
+                    )
+                    for table_name, lower_boundary, upper_boundary, file_name in data_units
+                ]
+
+                manifest = ExportManifest(
+                    database_name=self.database.name,
+                    hash_algorithm=self.hash_algorithm,
+                    created_at=datetime.now(timezone.utc),
+                    schema_files=[future.result() for future in schema_futures],
+                    data_files=[future.result() for future in data_futures],
+                )
+        finally:
+            for connection in connections:
+                connection.close()
+
+        with open(os.path.join(directory, self.NAME_FILE_MANIFEST), "w") as f:
+            f.write(manifest.model_dump_json(indent=2))
+
+        return manifest
+
+
+class NativeExporter(Exporter):
+    """Export database to one file, without mariadb-dump.
+
+    Like mariadb-dump --single-transaction, tables are read in one transaction
+    with consistent snapshot, so no locks are needed. The output can be loaded
+    with the mariadb client (see Database.load).
+
+    Only tables are exported; views, routines, triggers and events are not.
+    """
+
+    def __init__(
+        self,
+        *,
+        database: "Database",
+        packet_size: int = Exporter.SIZE_PACKET_DEFAULT,
+        exclude_table_names: Optional[List[str]] = None,
+    ) -> None:
+        """Set attributes."""
+        super().__init__(database=database, packet_size=packet_size)
+
+        self.exclude_table_names = exclude_table_names or []
+
+    def export(self, f: Union[IO[bytes], HashedFile]) -> int:
+        """Export database to file. Returns amount of rows."""
+        tables_column_names = self._tables_column_names
+
+        rows = 0
+
+        f.write(
+            (
+                f"-- Dump of database {Table._quote(self.database.name)}\n"
+                "SET @OLD_FOREIGN_KEY_CHECKS = @@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS = 0;\n"
+                "SET @OLD_UNIQUE_CHECKS = @@UNIQUE_CHECKS, UNIQUE_CHECKS = 0;\n"
+                "SET @OLD_SQL_MODE = @@SQL_MODE, SQL_MODE = 'NO_AUTO_VALUE_ON_ZERO';\n"
+                "SET @OLD_TIME_ZONE = @@TIME_ZONE, TIME_ZONE = '+00:00';\n"
+                "SET NAMES utf8mb4;\n"
+            ).encode()
+        )
+
+        with self.database.server_engine.connect() as connection:
+            self._start_snapshot(connection)
+
+            for table_name in self._tables_rows:
+                if table_name in self.exclude_table_names:
+                    continue
+
+                self._write_create_table(connection, table_name, f)
+
+                rows += self._write_inserts(
+                    connection, table_name, tables_column_names[table_name], f
+                )
+
+        f.write(
+            (
+                "SET TIME_ZONE = @OLD_TIME_ZONE;\n"
+                "SET SQL_MODE = @OLD_SQL_MODE;\n"
+                "SET UNIQUE_CHECKS = @OLD_UNIQUE_CHECKS;\n"
+                "SET FOREIGN_KEY_CHECKS = @OLD_FOREIGN_KEY_CHECKS;\n"
+                f"-- Dump completed on {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}\n"
+            ).encode()
+        )
+
+        return rows
+
+
+class ParallelLoader:
+    """Load parallel export (see ParallelExporter) with multiple connections.
+
+    Schema files are loaded first, then data files. Foreign key checks are
+    disabled while loading, so the order of tables doesn't matter.
+    """
+
+    SIZE_CHUNK_READ = 1024 * 1024
+
+    def __init__(
+        self,
+        *,
+        database: "Database",
+        workers: int = ParallelExporter.WORKERS_DEFAULT,
+    ) -> None:
+        """Set attributes."""
+        if (
+            database.server_software_name
+            != database.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            raise ServerNotSupportedError
+
+        if workers < 1:
+            raise InvalidInputError(workers)
+
+        self.database = database
+        self.workers = workers
+
+    @staticmethod
+    def get_manifest(directory: str) -> ExportManifest:
+        """Get manifest of parallel export."""
+        with open(os.path.join(directory, ParallelExporter.NAME_FILE_MANIFEST)) as f:
+            return ExportManifest.model_validate_json(f.read())
+
+    @classmethod
+    def _get_file_hash(cls, path: str, *, hash_algorithm: str) -> str:
+        """Get Base64 encoded hash of file."""
+        hash_ = hashlib.new(hash_algorithm)
+
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(cls.SIZE_CHUNK_READ), b""):
+                hash_.update(chunk)
+
+        return base64.b64encode(hash_.digest()).decode()
+
+    def _load_file(self, path: str, *, is_schema: bool) -> None:
+        """Load file."""
+        with self.database.database_engine.connect() as connection:
+            connection = connection.execution_options(no_parameters=True)
+
+            connection.exec_driver_sql(
+                "SET SESSION FOREIGN_KEY_CHECKS = 0, UNIQUE_CHECKS = 0, TIME_ZONE = '+00:00', SQL_MODE = 'NO_AUTO_VALUE_ON_ZERO';"
+            )
+
+            with open(path, "rb") as f:
+                if is_schema:
+                    drop_statement, create_statement = f.read().decode().split("\n", 1)
+
+                    connection.exec_driver_sql(drop_statement)
+                    connection.exec_driver_sql(create_statement)
+                else:
+                    for line in f:
+                        connection.exec_driver_sql(line.decode())
+
+            connection.commit()
+
+    def load(self, directory: str) -> ExportManifest:
+        """Load parallel export from directory.
+
+        Raises InvalidInputError if a file's hash doesn't match the manifest.
+        All files are hashed before any file is loaded, so nothing is loaded
+        in that case.
+        """
+        manifest = self.get_manifest(directory)
+
+        # File names must be plain names, so only files inside directory are read
+
+        for file in manifest.schema_files + manifest.data_files:
+            if os.path.basename(file.file_name) != file.file_name or file.file_name in [
+                "",
+                os.path.curdir,
+                os.path.pardir,
+            ]:
+                raise InvalidInputError(file.file_name)
+
+        files = manifest.schema_files + manifest.data_files
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            hashes = list(
+                executor.map(
+                    lambda file: self._get_file_hash(
+                        os.path.join(directory, file.file_name),
+                        hash_algorithm=manifest.hash_algorithm,
+                    ),
+                    files,
+                )
+            )
+
+        for file, hash_ in zip(files, hashes):
+            if hash_ != file.hash:
+                raise InvalidInputError(file.file_name)
+
+        for files, is_schema in [
+            (manifest.schema_files, True),
+            (manifest.data_files, False),
+        ]:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(
+                    executor.map(
+                        lambda file: self._load_file(
+                            os.path.join(directory, file.file_name),
+                            is_schema=is_schema,
+                        ),
+                        files,
+                    )
+                )
+
+        return manifest
@@ -1,7 +1,11 @@
 """Classes for interaction with database queries."""
 
+from typing import Iterator
+
 import sqlalchemy as sa
-from sqlalchemy import TextClause
+from sqlalchemy import CursorResult, Row, TextClause
+
+from cyberfusion.DatabaseSupport.sessions import get_current_session
 
 
 class Query:
@@ -15,16 +19,69 @@ class Query:
         self._execute()
 
     def _execute(self) -> None:
-        """Execute query."""
+        """Execute query.
+
+        If a session is active, its connection is used. Otherwise, the query
+        runs on its own connection and transaction.
+        """
+        session = get_current_session()
+
+        if session:
+            self._set_result(session.get_connection(self.engine).execute(self.query))
+
+            return
+
         with self.engine.begin() as connection:
-            result_proxy = connection.execute(self.query)
+            self._set_result(connection.execute(self.query))
 
-            if result_proxy.returns_rows:
-                self._result = result_proxy.all()
-            else:
-                self._result = []
+    def _set_result(self, result_proxy: CursorResult) -> None:
+        """Set result from result proxy."""
+        if result_proxy.returns_rows:
+            self._result = result_proxy.all()
+        else:
+            self._result = []
 
     @property
     def result(self) -> list:
         """Get result."""
         return self._result
+
+
+class StreamingQuery:
+    """Abstract representation of database query with streamed result.
+
+    Unlike Query, the result is not loaded into memory at once. Iterate over the
+    object to execute the query, and get rows.
+
+    Rows are fetched in batches of batch_size using server-side cursors (SSCursor
+    for PyMySQL, named cursors for psycopg2). The connection stays open until all
+    rows are iterated over. As the connection is occupied while streaming, a
+    separate connection is used even if a session is active.
+    """
+
+    BATCH_SIZE_DEFAULT = 1000
+
+    def __init__(
+        self,
+        *,
+        engine: sa.engine.base.Engine,
+        query: TextClause,
+        batch_size: int = BATCH_SIZE_DEFAULT,
+    ) -> None:
+        """Set attributes."""
+        self.engine = engine
+        self.query = query
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[Row]:
+        """Execute query and get rows."""
+        with self.engine.connect() as connection:
+            result_proxy = connection.execution_options(
+                stream_results=True, max_row_buffer=self.batch_size
+            ).execute(self.query)
+
+            if not result_proxy.returns_rows:
+                return
+
+            for partition in result_proxy.partitions(self.batch_size):
+                yield from partition
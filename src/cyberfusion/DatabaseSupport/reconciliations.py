@@ -0,0 +1,453 @@
+"""Classes for reconciling database servers with desired state."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from pydantic import BaseModel
+
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exceptions import InvalidInputError
+from cyberfusion.DatabaseSupport.servers import Server
+from cyberfusion.DatabaseSupport.tables import Table
+
+
+class DesiredDatabase(BaseModel):
+    name: str
+    server_software_name: str
+
+
+class DesiredDatabaseUser(BaseModel):
+    name: str
+    server_software_name: str
+    password: str
+    host: Optional[str] = None
+
+
+class DesiredDatabaseUserGrant(BaseModel):
+    database_name: str
+    database_user_name: str
+    database_user_host: str
+    privilege_names: List[str]
+    table_name: Optional[str] = None
+
+
+class DesiredState(BaseModel):
+    databases: List[DesiredDatabase] = []
+    database_users: List[DesiredDatabaseUser] = []
+    database_user_grants: List[DesiredDatabaseUserGrant] = []
+
+
+class ReconciliationAction:
+    """Abstract representation of action to reconcile server with desired state."""
+
+    TYPE_CREATE_DATABASE = "create database"
+    TYPE_CREATE_DATABASE_USER = "create database user"
+    TYPE_EDIT_DATABASE_USER = "edit database user"
+    TYPE_REVOKE = "revoke"
+    TYPE_GRANT = "grant"
+    TYPE_DROP_DATABASE_USER = "drop database user"
+    TYPE_DROP_DATABASE = "drop database"
+
+    # Actions of the same type are applied together, in this order
+
+    TYPES = [
+        TYPE_CREATE_DATABASE,
+        TYPE_CREATE_DATABASE_USER,
+        TYPE_EDIT_DATABASE_USER,
+        TYPE_REVOKE,
+        TYPE_GRANT,
+        TYPE_DROP_DATABASE_USER,
+        TYPE_DROP_DATABASE,
+    ]
+
+    def __init__(
+        self,
+        *,
+        type_: str,
+        object_: Union[Database, DatabaseUser, DatabaseUserGrant],
+    ) -> None:
+        """Set attributes."""
+        self.type_ = type_
+        self.object_ = object_
+
+    def __str__(self) -> str:
+        """Get description."""
+        if isinstance(self.object_, Database):
+            return f"{self.type_} {self.object_.name}"
+
+        if isinstance(self.object_, DatabaseUser):
+            if self.object_.host is None:
+                return f"{self.type_} {self.object_.name}"
+
+            return f"{self.type_} {self.object_.name}@{self.object_.host}"
+
+        preposition = "FROM" if self.type_ == self.TYPE_REVOKE else "TO"
+
+        return f"{self.type_} {self.object_.text_privilege_names} ON {self.object_.database_name}.{self.object_.table_name} {preposition} {self.object_.database_user.name}@{self.object_.database_user.host}"
+
+    def apply(self) -> None:
+        """Apply action.
+
+        Existence is not checked, as the plan is based on a snapshot.
+        """
+        if isinstance(self.object_, Database):
+            if self.type_ == self.TYPE_CREATE_DATABASE:
+                self.object_._create()
+            else:
+                self.object_._drop()
+        elif isinstance(self.object_, DatabaseUser):
+            if self.type_ == self.TYPE_CREATE_DATABASE_USER:
+                self.object_._create()
+            elif self.type_ == self.TYPE_EDIT_DATABASE_USER:
+                self.object_._edit()
+            else:
+                self.object_._drop()
+        else:
+            if self.type_ == self.TYPE_GRANT:
+                self.object_._grant()
+            else:
+                self.object_._revoke()
+
+
+class Reconciler:
+    """Reconciler of server with desired state.
+
+    The plan is based on one snapshot of the server's databases, database users
+    and database user grants (see Server). Objects in the desired state that are
+    missing or different are created or edited. If prune is True, objects that
+    are not in the desired state are dropped (or revoked). Database users that
+    the support connects as, and their grants, as well as grants on all
+    databases, are never pruned.
+
+    Database user grants that differ only in privileges are revoked and granted
+    again.
+
+    Actions are applied by the given amount of workers. Each worker runs its
+    actions in a session (see DatabaseSupport.session).
+    """
+
+    WORKERS_DEFAULT = 4
+
+    def __init__(
+        self,
+        *,
+        server: Server,
+        desired_state: DesiredState,
+        prune: bool = False,
+        workers: int = WORKERS_DEFAULT,
+    ) -> None:
+        """Set attributes."""
+        if workers < 1:
+            raise InvalidInputError(workers)
+
+        self.server = server
+        self.desired_state = desired_state
+        self.prune = prune
+        self.workers = workers
+
+    @staticmethod
+    def _get_privilege_names_key(privilege_names: List[str]) -> Set[str]:
+        """Get privilege names for comparison."""
+        return {
+            DatabaseUserGrant.SHORT_ALL_PRIVILEGES
+            if privilege_name.upper() == DatabaseUserGrant.LONG_ALL_PRIVILEGES
+            else privilege_name.upper()
+            for privilege_name in privilege_names
+        }
+
+    @staticmethod
+    def _get_database_user_grant_key(
+        database_user_grant: DatabaseUserGrant,
+    ) -> Tuple[str, Optional[str], str, str]:
+        """Get key that identifies object of database user grant."""
+        return (
+            database_user_grant.database_user.name,
+            database_user_grant.database_user.host,
+            database_user_grant.database_name,
+            database_user_grant.table_name,
+        )
+
+    def _get_is_support_database_user(self, database_user: DatabaseUser) -> bool:
+        """Get if database user is the one that support connects as."""
+        if (
+            database_user.server_software_name
+            == self.server.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            return database_user.name == self.server.support.mariadb_server_username
+
+        return database_user.name == self.server.support.postgresql_server_username
+
+    @property
+    def _desired_databases(self) -> Dict[Tuple[str, str], Database]:
+        """Get desired databases by key."""
+        return {
+            (desired_database.server_software_name, desired_database.name): Database(
+                support=self.server.support,
+                name=desired_database.name,
+                server_software_name=desired_database.server_software_name,
+            )
+            for desired_database in self.desired_state.databases
+        }
+
+    @property
+    def _desired_database_users(
+        self,
+    ) -> Dict[Tuple[str, str, Optional[str]], DatabaseUser]:
+        """Get desired database users by key."""
+        database_users = {}
+
+        for desired_database_user in self.desired_state.database_users:
+            database_user = DatabaseUser(
+                server=self.server,
+                name=desired_database_user.name,
+                server_software_name=desired_database_user.server_software_name,
+                password=desired_database_user.password,
+                host=desired_database_user.host,
+            )
+
+            database_users[
+                (
+                    database_user.server_software_name,
+                    database_user.name,
+                    database_user.host,  # Always None for PostgreSQL
+                )
+            ] = database_user
+
+        return database_users
+
+    @property
+    def _desired_database_user_grants(
+        self,
+    ) -> Dict[Tuple[str, Optional[str], str, str], DatabaseUserGrant]:
+        """Get desired database user grants by key."""
+        database_user_grants = {}
+
+        for desired_database_user_grant in self.desired_state.database_user_grants:
+            database = Database(
+                support=self.server.support,
+                name=desired_database_user_grant.database_name,
+                server_software_name=self.server.support.MARIADB_SERVER_SOFTWARE_NAME,
+            )
+
+            database_user_grant = DatabaseUserGrant(
+                database=database,
+                database_user=DatabaseUser(
+                    server=self.server,
+                    name=desired_database_user_grant.database_user_name,
+                    server_software_name=self.server.support.MARIADB_SERVER_SOFTWARE_NAME,
+                    host=desired_database_user_grant.database_user_host,
+                ),
+                privilege_names=desired_database_user_grant.privilege_names,
+                table=(
+                    Table(
+                        database=database,
+                        name=desired_database_user_grant.table_name,
+                    )
+                    if desired_database_user_grant.table_name
+                    else None
+                ),
+            )
+
+            database_user_grants[
+                self._get_database_user_grant_key(database_user_grant)
+            ] = database_user_grant
+
+        return database_user_grants
+
+    def _get_databases_actions(self) -> List[ReconciliationAction]:
+        """Get actions for databases."""
+        actions = []
+
+        existing_databases = {
+            (database.server_software_name, database.name): database
+            for database in self.server.databases
+        }
+        desired_databases = self._desired_databases
+
+        for key, database in desired_databases.items():
+            if key in existing_databases:
+                continue
+
+            actions.append(
+                ReconciliationAction(
+                    type_=ReconciliationAction.TYPE_CREATE_DATABASE, object_=database
+                )
+            )
+
+        if self.prune:
+            for key, database in existing_databases.items():
+                if key in desired_databases:
+                    continue
+
+                actions.append(
+                    ReconciliationAction(
+                        type_=ReconciliationAction.TYPE_DROP_DATABASE,
+                        object_=database,
+                    )
+                )
+
+        return actions
+
+    def _get_database_users_actions(self) -> List[ReconciliationAction]:
+        """Get actions for database users."""
+        actions = []
+
+        existing_database_users = {
+            (
+                database_user.server_software_name,
+                database_user.name,
+                database_user.host,
+            ): database_user
+            for database_user in self.server.database_users
+        }
+        desired_database_users = self._desired_database_users
+
+        for key, database_user in desired_database_users.items():
+            if key not in existing_database_users:
+                actions.append(
+                    ReconciliationAction(
+                        type_=ReconciliationAction.TYPE_CREATE_DATABASE_USER,
+                        object_=database_user,
+                    )
+                )
+
+                continue
+
+            if existing_database_users[key].password == database_user.password:
+                continue
+
+            actions.append(
+                ReconciliationAction(
+                    type_=ReconciliationAction.TYPE_EDIT_DATABASE_USER,
+                    object_=database_user,
+                )
+            )
+
+        if self.prune:
+            for key, database_user in existing_database_users.items():
+                if key in desired_database_users:
+                    continue
+
+                if self._get_is_support_database_user(database_user):
+                    continue
+
+                actions.append(
+                    ReconciliationAction(
+                        type_=ReconciliationAction.TYPE_DROP_DATABASE_USER,
+                        object_=database_user,
+                    )
+                )
+
+        return actions
+
+    def _get_database_user_grants_actions(self) -> List[ReconciliationAction]:
+        """Get actions for database user grants."""
+        actions = []
+
+        existing_database_user_grants = {
+            self._get_database_user_grant_key(database_user_grant): database_user_grant
+            for database_user_grant in self.server.database_user_grants
+            if database_user_grant.privilege_names
+            != [DatabaseUserGrant.NAME_PRIVILEGE_USAGE]  # No privileges
+        }
+        desired_database_user_grants = self._desired_database_user_grants
+
+        for key, database_user_grant in desired_database_user_grants.items():
+            existing_database_user_grant = existing_database_user_grants.get(key)
+
+            if existing_database_user_grant:
+                if self._get_privilege_names_key(
+                    existing_database_user_grant.privilege_names
+                ) == self._get_privilege_names_key(database_user_grant.privilege_names):
+                    continue
+
+                actions.append(
+                    ReconciliationAction(
+                        type_=ReconciliationAction.TYPE_REVOKE,
+                        object_=existing_database_user_grant,
+                    )
+                )
+
+            actions.append(
+                ReconciliationAction(
+                    type_=ReconciliationAction.TYPE_GRANT,
+                    object_=database_user_grant,
+                )
+            )
+
+        if self.prune:
+            for key, database_user_grant in existing_database_user_grants.items():
+                if key in desired_database_user_grants:
+                    continue
+
+                if (
+                    database_user_grant.database_name
+                    == DatabaseUserGrant.CHAR_NAME_DATABASE_WILDCARD
+                ):
+                    continue
+
+                if self._get_is_support_database_user(
+                    database_user_grant.database_user
+                ):
+                    continue
+
+                actions.append(
+                    ReconciliationAction(
+                        type_=ReconciliationAction.TYPE_REVOKE,
+                        object_=database_user_grant,
+                    )
+                )
+
+        return actions
+
+    @property
+    def plan(self) -> List[ReconciliationAction]:
+        """Get actions to reconcile server with desired state, in order."""
+        actions = (
+            self._get_databases_actions()
+            + self._get_database_users_actions()
+            + self._get_database_user_grants_actions()
+        )
+
+        return sorted(
+            actions, key=lambda action: ReconciliationAction.TYPES.index(action.type_)
+        )
+
+    def _apply_actions(self, actions: List[ReconciliationAction]) -> None:
+        """Apply actions in a session."""
+        with self.server.support.session():
+            for action in actions:
+                action.apply()
+
+    def apply(self, *, dry_run: bool = False) -> List[ReconciliationAction]:
+        """Reconcile server with desired state, and get applied actions.
+
+        If dry_run is True, actions are not applied.
+
+        Actions of the same type are spread over workers. Actions of different
+        types are applied one type after another (e.g. databases and database
+        users are created before grants).
+        """
+        plan = self.plan
+
+        if dry_run:
+            return plan
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for type_ in ReconciliationAction.TYPES:
+                actions = [action for action in plan if action.type_ == type_]
+
+                batches = [
+                    actions[i :: self.workers]
+                    for i in range(self.workers)
+                    if actions[i :: self.workers]
+                ]
+
+                for future in [
+                    executor.submit(self._apply_actions, batch) for batch in batches
+                ]:
+                    future.result()
+
+        return plan
@@ -0,0 +1,76 @@
+"""Classes for sharing objects across the process."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+import sqlalchemy as sa
+
+
+class EngineRegistry:
+    """Registry of engines, shared by DSN.
+
+    Engines are shared between all objects that use the same DSN and engine
+    arguments, so that they share a pool as well.
+
+    The amount of engines is bounded. When exceeded, the least recently used
+    engine is evicted, and its pool is disposed.
+    """
+
+    MAXIMUM_SIZE_DEFAULT = 64
+
+    def __init__(self, *, maximum_size: int = MAXIMUM_SIZE_DEFAULT) -> None:
+        """Set attributes."""
+        self.maximum_size = maximum_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._engines: "OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], sa.engine.base.Engine]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get amount of engines."""
+        return len(self._engines)
+
+    def get(self, url: str, **kwargs: Any) -> sa.engine.base.Engine:
+        """Get engine for URL, creating it if needed.
+
+        Keyword arguments are passed to sqlalchemy.create_engine.
+        """
+        key = (url, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            if key in self._engines:
+                self.hits += 1
+
+                self._engines.move_to_end(key)
+
+                return self._engines[key]
+
+            self.misses += 1
+
+            engine = sa.create_engine(url, **kwargs)
+
+            self._engines[key] = engine
+
+            while len(self._engines) > self.maximum_size:
+                _, evicted_engine = self._engines.popitem(last=False)
+
+                evicted_engine.dispose()
+
+                self.evictions += 1
+
+            return engine
+
+    def dispose(self) -> None:
+        """Dispose and remove all engines."""
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+
+            self._engines.clear()
+
+
+engine_registry = EngineRegistry()
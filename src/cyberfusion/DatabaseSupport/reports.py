@@ -3,7 +3,7 @@ from abc import abstractmethod, ABCMeta
 from sqlalchemy import text
 
 from cyberfusion.DatabaseSupport.exceptions import ServerNotSupportedError
-from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.queries import Query, StreamingQuery
 from cyberfusion.DatabaseSupport.servers import Server
 from pydantic import BaseModel
 
@@ -43,8 +43,11 @@ class ReportGeneratorInterface(metaclass=ABCMeta):
 
 
 class InnodbReportGenerator(ReportGeneratorInterface):
-    def __init__(self, server: Server) -> None:
+    def __init__(
+        self, server: Server, batch_size: int = StreamingQuery.BATCH_SIZE_DEFAULT
+    ) -> None:
         self.server = server
+        self.batch_size = batch_size
 
     def get_innodb_buffer_pool_size_bytes(self) -> int:
         return int(
@@ -59,14 +62,15 @@ class InnodbReportGenerator(ReportGeneratorInterface):
     def get_databases_innodb_data_lengths(self) -> list[DatabaseInnodbDataLengths]:
         databases_innodb_data_lengths: dict[str, list[TableInnodbDataLengths]] = {}
 
-        for result in Query(
+        for result in StreamingQuery(
             engine=self.server.support.engines.engines[
                 self.server.support.engines.MYSQL_ENGINE_NAME
             ],
             query=text(
                 "SELECT table_schema, table_name, data_length, index_length FROM information_schema.tables WHERE engine='InnoDB';"
             ),
-        ).result:
+            batch_size=self.batch_size,
+        ):
             database_name = result[0]
             table_name = result[1]
             data_length_bytes = result[2]
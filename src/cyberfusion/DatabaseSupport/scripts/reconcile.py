@@ -0,0 +1,43 @@
+from typing import Optional
+import typer
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.reconciliations import DesiredState, Reconciler
+from cyberfusion.DatabaseSupport.servers import Server
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    host: str = typer.Option(..., help="MariaDB host"),
+    username: str = typer.Option(..., help="MariaDB username"),
+    password: Optional[str] = typer.Option(None, help="MariaDB password"),
+    desired_state_path: str = typer.Option(
+        ..., help="Path to JSON file with desired state"
+    ),
+    prune: bool = typer.Option(
+        False, help="Drop objects that are not in desired state"
+    ),
+    workers: int = typer.Option(Reconciler.WORKERS_DEFAULT, help="Amount of workers"),
+    dry_run: bool = typer.Option(False, help="Print plan without applying it"),
+) -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        mariadb_server_host=host,
+        mariadb_server_username=username,
+        server_password=password,
+        pooled=True,
+    )
+
+    with open(desired_state_path, "r") as f:
+        desired_state = DesiredState.model_validate_json(f.read())
+
+    reconciler = Reconciler(
+        server=Server(support=support),
+        desired_state=desired_state,
+        prune=prune,
+        workers=workers,
+    )
+
+    for action in reconciler.apply(dry_run=dry_run):
+        typer.echo(str(action))
@@ -1,19 +1,26 @@
 """Classes for interaction with database servers."""
 
 import re
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 if TYPE_CHECKING:  # pragma: no cover
     from cyberfusion.DatabaseSupport import DatabaseSupport
 
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.sql import text
 
 from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
 from cyberfusion.DatabaseSupport.database_users import DatabaseUser
 from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exceptions import (
+    PasswordMissingError,
+    ServerNotSupportedError,
+)
 from cyberfusion.DatabaseSupport.queries import Query
 from cyberfusion.DatabaseSupport.tables import Table
 
+T = TypeVar("T")
+
 
 class Server:
     """Abstract representation of database server."""
@@ -32,6 +39,67 @@ class Server:
     MYSQL_NAME_USER_MARIADB_SYS = "mariadb.sys"
     MYSQL_NAME_USER_MYSQL = "mysql"
 
+    MYSQL_SUFFIX_COLUMN_PRIVILEGE = "_priv"
+    MYSQL_NAME_PRIVILEGE_GRANT = "GRANT"
+    MYSQL_ACCESS_GRANT = 1 << 10
+
+    # Privileges in order of 'SHOW GRANTS', by column name in mysql.db (without
+    # '_priv' suffix)
+
+    MYSQL_NAMES_PRIVILEGES_COLUMNS = {
+        "Select": "SELECT",
+        "Insert": "INSERT",
+        "Update": "UPDATE",
+        "Delete": "DELETE",
+        "Create": "CREATE",
+        "Drop": "DROP",
+        "Reload": "RELOAD",
+        "Shutdown": "SHUTDOWN",
+        "Process": "PROCESS",
+        "File": "FILE",
+        "Grant": MYSQL_NAME_PRIVILEGE_GRANT,
+        "References": "REFERENCES",
+        "Index": "INDEX",
+        "Alter": "ALTER",
+        "Show_db": "SHOW DATABASES",
+        "Super": "SUPER",
+        "Create_tmp_table": "CREATE TEMPORARY TABLES",
+        "Lock_tables": "LOCK TABLES",
+        "Execute": "EXECUTE",
+        "Repl_slave": "REPLICATION SLAVE",
+        "Repl_client": "BINLOG MONITOR",
+        "Create_view": "CREATE VIEW",
+        "Show_view": "SHOW VIEW",
+        "Create_routine": "CREATE ROUTINE",
+        "Alter_routine": "ALTER ROUTINE",
+        "Create_user": "CREATE USER",
+        "Event": "EVENT",
+        "Trigger": "TRIGGER",
+        "Create_tablespace": "CREATE TABLESPACE",
+        "Delete_history": "DELETE HISTORY",
+        "Show_create_routine": "SHOW CREATE ROUTINE",
+    }
+    MYSQL_NAMES_PRIVILEGES = list(MYSQL_NAMES_PRIVILEGES_COLUMNS.values())
+
+    # Privileges by value of 'Table_priv' in mysql.tables_priv
+
+    MYSQL_NAMES_PRIVILEGES_TABLE = {
+        "Select": "SELECT",
+        "Insert": "INSERT",
+        "Update": "UPDATE",
+        "Delete": "DELETE",
+        "Create": "CREATE",
+        "Drop": "DROP",
+        "Grant": MYSQL_NAME_PRIVILEGE_GRANT,
+        "References": "REFERENCES",
+        "Index": "INDEX",
+        "Alter": "ALTER",
+        "Create View": "CREATE VIEW",
+        "Show view": "SHOW VIEW",
+        "Trigger": "TRIGGER",
+        "Delete versioning rows": "DELETE HISTORY",
+    }
+
     POSTGRESQL_NAME_USER_ADMIN = "admin"
     POSTGRESQL_NAME_USER_POSTGRES = "postgres"
     POSTGRESQL_PREFIX_SYSTEM_USER = "pg_"
@@ -40,6 +108,15 @@ class Server:
         """Set attributes and call functions to handle server."""
         self.support = support
 
+    def _get_catalog_snapshot(
+        self, key: str, function: Callable[[], List[T]]
+    ) -> List[T]:
+        """Get catalog snapshot from catalog cache, if enabled."""
+        if self.support.catalog_cache is None:
+            return function()
+
+        return list(self.support.catalog_cache.get(key, function))  # Copy
+
     @property
     def _databases_mariadb(self) -> List[Database]:
         """Get MariaDB databases."""
@@ -97,8 +174,8 @@ class Server:
         return databases
 
     @property
-    def databases(self) -> List[Database]:
-        """Get databases."""
+    def _databases(self) -> List[Database]:
+        """Get databases, uncached."""
         databases: List[Database] = []
 
         if (
@@ -116,85 +193,434 @@ class Server:
         return databases
 
     @property
-    def _mariadb_database_user_grants(self) -> List[DatabaseUserGrant]:
-        """Get MariaDB database user grants."""
-        database_user_grants: List[DatabaseUserGrant] = []
+    def databases(self) -> List[Database]:
+        """Get databases.
 
-        for database_user in self.database_users:
-            for grant in Query(
-                engine=self.support.engines.engines[
-                    self.support.engines.MYSQL_ENGINE_NAME
-                ],
-                query=text("SHOW GRANTS FOR :username@:host;").bindparams(
-                    username=database_user.name, host=database_user.host
-                ),
-            ).result:
-                # Parse grant
+        Cached if the catalog cache is enabled (see DatabaseSupport).
+        """
+        return self._get_catalog_snapshot(
+            self.support.CATALOG_KEY_DATABASES, lambda: self._databases
+        )
+
+    @property
+    def _database_sizes_mariadb(self) -> List[Tuple[Database, int]]:
+        """Get MariaDB databases with sizes."""
+        database_sizes: List[Tuple[Database, int]] = []
+
+        if self.support.mariadb_datadir_sizes:
+            sizes = self.support.mariadb_datadir_sizes.get_database_sizes()
+
+            for database in self._databases_mariadb:
+                size = sizes.get(database.name)
+
+                if size is None:  # Not supported by datadir sizes
+                    size = database.size
+
+                database_sizes.append((database, size))
+
+            return database_sizes
 
-                parsed_grant = re.match(
-                    """GRANT (.+) ON (.+) TO (['`"]).*\\3@(['`"]).*\\4( IDENTIFIED BY PASSWORD (['`"]).+\\6)? ?(.*)""",
-                    grant[0],
+        for database_name, size in Query(
+            engine=self.support.engines.engines[self.support.engines.MYSQL_ENGINE_NAME],
+            query=text(
+                "SELECT schemata.schema_name, COALESCE(SUM(COALESCE(tables.data_length, 0) + COALESCE(tables.index_length, 0)), 0) FROM information_schema.schemata AS schemata LEFT JOIN information_schema.tables AS tables ON tables.table_schema = schemata.schema_name WHERE schemata.schema_name NOT IN (:mysql, :performance_schema, :information_schema, :sys) GROUP BY schemata.schema_name ORDER BY schemata.schema_name;"
+            ).bindparams(
+                mysql=self.MYSQL_NAME_DATABASE_MYSQL,
+                performance_schema=self.MYSQL_NAME_DATABASE_PERFORMANCE_SCHEMA,
+                information_schema=self.MYSQL_NAME_DATABASE_INFORMATION_SCHEMA,
+                sys=self.MYSQL_NAME_DATABASE_SYS,
+            ),
+        ).result:
+            database_sizes.append(
+                (
+                    Database(
+                        support=self.support,
+                        name=database_name,
+                        server_software_name=self.support.MARIADB_SERVER_SOFTWARE_NAME,
+                    ),
+                    int(size),
                 )
+            )
 
-                if not parsed_grant:  # pragma: no cover
-                    raise RuntimeError
+        return database_sizes
 
-                if (
-                    parsed_grant.group(1) == "PROXY"
-                ):  # PROXY grants have a syntax that we don't support
-                    continue
+    @property
+    def _database_sizes_postgresql(self) -> List[Tuple[Database, int]]:
+        """Get PostgreSQL databases with sizes."""
+        database_sizes: List[Tuple[Database, int]] = []
 
-                parsed_part = re.fullmatch(
-                    r"[`]?(.+?)[`]?\.[`]?(.+?)[`]?", parsed_grant.group(2)
+        for database_name, size in Query(
+            engine=self.support.engines.engines[
+                self.support.engines.POSTGRESQL_ENGINE_NAME
+            ],
+            query=text(
+                "SELECT datname, pg_database_size(oid) FROM pg_database WHERE datname NOT IN (:template0, :template1, :postgres) ORDER BY datname;"
+            ).bindparams(
+                template0=self.POSTGRESQL_NAME_DATABASE_TEMPLATE0,
+                template1=self.POSTGRESQL_NAME_DATABASE_TEMPLATE1,
+                postgres=self.POSTGRESQL_NAME_DATABASE_POSTGRES,
+            ),
+        ).result:
+            database_sizes.append(
+                (
+                    Database(
+                        support=self.support,
+                        name=database_name,
+                        server_software_name=self.support.POSTGRESQL_SERVER_SOFTWARE_NAME,
+                    ),
+                    int(size),
                 )
+            )
 
-                if not parsed_part:
-                    raise RuntimeError  # pragma: no cover
+        return database_sizes
 
-                database_name = parsed_part.group(1)
-                table_name = parsed_part.group(2)
-                privilege_names = [x.strip() for x in parsed_grant.group(1).split(",")]
+    @property
+    def database_sizes(self) -> List[Tuple[Database, int]]:
+        """Get databases with sizes.
+
+        Uses one query per server software, instead of one (or more) per
+        database like Database.size.
+        """
+        database_sizes: List[Tuple[Database, int]] = []
 
-                # Use short version of 'ALL PRIVILEGES'
+        if (
+            self.support.MARIADB_SERVER_SOFTWARE_NAME
+            in self.support.server_software_names
+        ):
+            database_sizes.extend(self._database_sizes_mariadb)
 
-                for index, privilege_name in enumerate(privilege_names):
-                    if privilege_name != DatabaseUserGrant.LONG_ALL_PRIVILEGES:
-                        continue
+        if (
+            self.support.POSTGRESQL_SERVER_SOFTWARE_NAME
+            in self.support.server_software_names
+        ):
+            database_sizes.extend(self._database_sizes_postgresql)
 
-                    privilege_names[index] = DatabaseUserGrant.SHORT_ALL_PRIVILEGES
+        return database_sizes
 
-                # Get database object
+    def _parse_mariadb_grant(
+        self, *, grant: str, database_user: DatabaseUser
+    ) -> Optional[DatabaseUserGrant]:
+        """Parse line from MariaDB 'SHOW GRANTS' output.
 
-                database = Database(
-                    support=self.support,
-                    name=database_name,
-                    server_software_name=database_user.server_software_name,
-                )
+        Returns None for grants with a syntax that is not supported.
+        """
+        parsed_grant = re.match(
+            """GRANT (.+) ON (.+) TO (['`"]).*\\3@(['`"]).*\\4( IDENTIFIED BY PASSWORD (['`"]).+\\6)? ?(.*)""",
+            grant,
+        )
 
-                # Get table object
+        if not parsed_grant:  # pragma: no cover
+            raise RuntimeError
 
-                table = None
+        if (
+            parsed_grant.group(1) == "PROXY"
+        ):  # PROXY grants have a syntax that we don't support
+            return None
 
-                if table_name != DatabaseUserGrant.CHAR_NAME_TABLE_WILDCARD:
-                    table = Table(
-                        database=database,
-                        name=table_name,
-                    )
+        parsed_part = re.fullmatch(
+            r"[`]?(.+?)[`]?\.[`]?(.+?)[`]?", parsed_grant.group(2)
+        )
 
-                database_user_grants.append(
-                    DatabaseUserGrant(
-                        database=database,
+        if not parsed_part:
+            raise RuntimeError  # pragma: no cover
+
+        database_name = parsed_part.group(1)
+        table_name = parsed_part.group(2)
+        privilege_names = [x.strip() for x in parsed_grant.group(1).split(",")]
+
+        # Use short version of 'ALL PRIVILEGES'
+
+        for index, privilege_name in enumerate(privilege_names):
+            if privilege_name != DatabaseUserGrant.LONG_ALL_PRIVILEGES:
+                continue
+
+            privilege_names[index] = DatabaseUserGrant.SHORT_ALL_PRIVILEGES
+
+        # Get database object
+
+        database = Database(
+            support=self.support,
+            name=database_name,
+            server_software_name=database_user.server_software_name,
+        )
+
+        # Get table object
+
+        table = None
+
+        if table_name != DatabaseUserGrant.CHAR_NAME_TABLE_WILDCARD:
+            table = Table(
+                database=database,
+                name=table_name,
+            )
+
+        return DatabaseUserGrant(
+            database=database,
+            database_user=database_user,
+            privilege_names=privilege_names,
+            table=table,
+        )
+
+    @property
+    def _mariadb_database_user_grants_show_grants(self) -> List[DatabaseUserGrant]:
+        """Get MariaDB database user grants by running 'SHOW GRANTS' per user."""
+        database_user_grants: List[DatabaseUserGrant] = []
+
+        for database_user in self.database_users:
+            database_user_grants.extend(
+                self._get_mariadb_database_user_grants_show_grants(database_user)
+            )
+
+        return database_user_grants
+
+    def _get_mariadb_database_user_grants_show_grants(
+        self, database_user: DatabaseUser
+    ) -> List[DatabaseUserGrant]:
+        """Get MariaDB database user grants of database user with 'SHOW GRANTS'."""
+        database_user_grants: List[DatabaseUserGrant] = []
+
+        for grant in Query(
+            engine=self.support.engines.engines[self.support.engines.MYSQL_ENGINE_NAME],
+            query=text("SHOW GRANTS FOR :username@:host;").bindparams(
+                username=database_user.name, host=database_user.host
+            ),
+        ).result:
+            database_user_grant = self._parse_mariadb_grant(
+                grant=grant[0], database_user=database_user
+            )
+
+            if not database_user_grant:
+                continue
+
+            database_user_grants.append(database_user_grant)
+
+        return database_user_grants
+
+    def _get_mariadb_privilege_names(
+        self, *, privilege_names: List[str], all_privilege_names: List[str]
+    ) -> List[str]:
+        """Get privilege names like 'SHOW GRANTS' shows them.
+
+        privilege_names are the privileges that are held, all_privilege_names
+        are all privileges that can be held on the level (database, table). The
+        grant option is not a privilege in 'SHOW GRANTS' output.
+        """
+        privilege_names = [
+            privilege_name
+            for privilege_name in privilege_names
+            if privilege_name != self.MYSQL_NAME_PRIVILEGE_GRANT
+        ]
+        all_privilege_names = [
+            privilege_name
+            for privilege_name in all_privilege_names
+            if privilege_name != self.MYSQL_NAME_PRIVILEGE_GRANT
+        ]
+
+        if not privilege_names:
+            return [DatabaseUserGrant.NAME_PRIVILEGE_USAGE]
+
+        if set(privilege_names) == set(all_privilege_names):
+            return [DatabaseUserGrant.SHORT_ALL_PRIVILEGES]
+
+        # Use order of 'SHOW GRANTS'
+
+        return sorted(privilege_names, key=self.MYSQL_NAMES_PRIVILEGES.index)
+
+    def _get_mariadb_database_privilege_names(self, row: Dict[str, str]) -> List[str]:
+        """Get privilege names from row in mysql.db.
+
+        Raises ServerNotSupportedError if the row contains an unknown privilege.
+        """
+        privilege_names = []
+        all_privilege_names = []
+
+        for column_name, value in row.items():
+            if not column_name.endswith(self.MYSQL_SUFFIX_COLUMN_PRIVILEGE):
+                continue
+
+            try:
+                privilege_name = self.MYSQL_NAMES_PRIVILEGES_COLUMNS[
+                    column_name[: -len(self.MYSQL_SUFFIX_COLUMN_PRIVILEGE)]
+                ]
+            except KeyError:  # Privilege added in server version we don't know
+                raise ServerNotSupportedError
+
+            all_privilege_names.append(privilege_name)
+
+            if value == "Y":
+                privilege_names.append(privilege_name)
+
+        return self._get_mariadb_privilege_names(
+            privilege_names=privilege_names, all_privilege_names=all_privilege_names
+        )
+
+    def _get_mariadb_table_privilege_names(self, table_priv: Any) -> List[str]:
+        """Get privilege names from 'Table_priv' column in mysql.tables_priv.
+
+        The column is a SET, which may be returned as string or set.
+        """
+        if isinstance(table_priv, str):
+            table_priv = [x for x in table_priv.split(",") if x]
+
+        return self._get_mariadb_privilege_names(
+            privilege_names=[self.MYSQL_NAMES_PRIVILEGES_TABLE[x] for x in table_priv],
+            all_privilege_names=list(self.MYSQL_NAMES_PRIVILEGES_TABLE.values()),
+        )
+
+    def _get_mariadb_database_user_grant(
+        self,
+        *,
+        database_user: DatabaseUser,
+        database_name: str,
+        table_name: Optional[str],
+        privilege_names: List[str],
+    ) -> DatabaseUserGrant:
+        """Get MariaDB database user grant object."""
+        database = Database(
+            support=self.support,
+            name=database_name,
+            server_software_name=database_user.server_software_name,
+        )
+
+        table = None
+
+        if table_name is not None:
+            table = Table(database=database, name=table_name)
+
+        return DatabaseUserGrant(
+            database=database,
+            database_user=database_user,
+            privilege_names=privilege_names,
+            table=table,
+        )
+
+    @property
+    def _mariadb_database_user_grants_catalog(self) -> List[DatabaseUserGrant]:
+        """Get MariaDB database user grants by reading grant tables in bulk.
+
+        Returns the same grants as 'SHOW GRANTS', in a fixed amount of queries.
+
+        Global grants are read from mysql.global_priv. If a database user has
+        global privileges (which is rare, e.g. for administrative users), they
+        are read with 'SHOW GRANTS' for that database user only, as global
+        privileges differ between server versions.
+        """
+        engine = self.support.engines.engines[self.support.engines.MYSQL_ENGINE_NAME]
+
+        database_users = {
+            (database_user.name, database_user.host): database_user
+            for database_user in self.database_users
+        }
+
+        database_user_grants: Dict[Tuple[str, str], List[DatabaseUserGrant]] = {
+            key: [] for key in database_users
+        }
+
+        # Global grants
+
+        for user, host, access in Query(
+            engine=engine,
+            query=text(
+                "SELECT User, Host, JSON_VALUE(Priv, '$.access') FROM mysql.global_priv;"
+            ),
+        ).result:
+            if (user, host) not in database_users:
+                continue
+
+            database_user = database_users[(user, host)]
+
+            if not int(access or 0) & ~self.MYSQL_ACCESS_GRANT:
+                database_user_grants[(user, host)].append(
+                    self._get_mariadb_database_user_grant(
                         database_user=database_user,
-                        privilege_names=privilege_names,
-                        table=table,
+                        database_name=DatabaseUserGrant.CHAR_NAME_DATABASE_WILDCARD,
+                        table_name=None,
+                        privilege_names=[DatabaseUserGrant.NAME_PRIVILEGE_USAGE],
                     )
                 )
 
-        return database_user_grants
+                continue
+
+            for (
+                database_user_grant
+            ) in self._get_mariadb_database_user_grants_show_grants(database_user):
+                if (
+                    database_user_grant.database_name
+                    != DatabaseUserGrant.CHAR_NAME_DATABASE_WILDCARD
+                ):
+                    continue
+
+                database_user_grants[(user, host)].append(database_user_grant)
+
+        # Database grants
+
+        for row in Query(
+            engine=engine,
+            query=text("SELECT * FROM mysql.db;"),
+        ).result:
+            columns = row._asdict()
+
+            key = (columns["User"], columns["Host"])
+
+            if key not in database_users:
+                continue
+
+            database_user_grants[key].append(
+                self._get_mariadb_database_user_grant(
+                    database_user=database_users[key],
+                    database_name=columns["Db"],
+                    table_name=None,
+                    privilege_names=self._get_mariadb_database_privilege_names(columns),
+                )
+            )
+
+        # Table grants
+
+        for host, database_name, user, table_name, table_priv in Query(
+            engine=engine,
+            query=text(
+                "SELECT Host, Db, User, Table_name, Table_priv FROM mysql.tables_priv;"
+            ),
+        ).result:
+            key = (user, host)
+
+            if key not in database_users:
+                continue
+
+            if not table_priv:  # Only column privileges, which we don't support
+                continue
+
+            database_user_grants[key].append(
+                self._get_mariadb_database_user_grant(
+                    database_user=database_users[key],
+                    database_name=database_name,
+                    table_name=table_name,
+                    privilege_names=self._get_mariadb_table_privilege_names(table_priv),
+                )
+            )
+
+        return [
+            database_user_grant
+            for key in database_user_grants
+            for database_user_grant in database_user_grants[key]
+        ]
 
     @property
-    def database_user_grants(self) -> List[DatabaseUserGrant]:
-        """Get database user grants."""
+    def _mariadb_database_user_grants(self) -> List[DatabaseUserGrant]:
+        """Get MariaDB database user grants.
+
+        Grant tables are read in bulk. If they can't be read (e.g. because of
+        missing privileges, or an unsupported server version), 'SHOW GRANTS' is
+        run per database user instead.
+        """
+        try:
+            return self._mariadb_database_user_grants_catalog
+        except (OperationalError, ProgrammingError, ServerNotSupportedError):
+            return self._mariadb_database_user_grants_show_grants
+
+    @property
+    def _database_user_grants(self) -> List[DatabaseUserGrant]:
+        """Get database user grants, uncached."""
         database_user_grants: List[DatabaseUserGrant] = []
 
         if (
@@ -205,6 +631,17 @@ class Server:
 
         return database_user_grants
 
+    @property
+    def database_user_grants(self) -> List[DatabaseUserGrant]:
+        """Get database user grants.
+
+        Cached if the catalog cache is enabled (see DatabaseSupport).
+        """
+        return self._get_catalog_snapshot(
+            self.support.CATALOG_KEY_DATABASE_USER_GRANTS,
+            lambda: self._database_user_grants,
+        )
+
     @property
     def _mariadb_database_users(self) -> List[DatabaseUser]:
         """Get MariaDB database users."""
@@ -240,41 +677,33 @@ class Server:
 
     @property
     def _postgresql_database_users(self) -> List[DatabaseUser]:
-        """Get PostgreSQL database users."""
+        """Get PostgreSQL database users.
+
+        System users are filtered out by the query.
+        """
         database_users: List[DatabaseUser] = []
 
         for database_user in Query(
             engine=self.support.engines.engines[
                 self.support.engines.POSTGRESQL_ENGINE_NAME
             ],
-            query=text("SELECT rolname FROM pg_catalog.pg_roles;"),
+            query=text(
+                "SELECT rolname, rolpassword FROM pg_catalog.pg_authid WHERE rolname NOT IN (:admin, :postgres) AND left(rolname, length(:system_prefix)) <> :system_prefix;"
+            ).bindparams(
+                admin=self.POSTGRESQL_NAME_USER_ADMIN,
+                postgres=self.POSTGRESQL_NAME_USER_POSTGRES,
+                system_prefix=self.POSTGRESQL_PREFIX_SYSTEM_USER,
+            ),
         ).result:
             database_user_name = database_user[0]
-
-            if database_user_name in [
-                self.POSTGRESQL_NAME_USER_ADMIN,
-                self.POSTGRESQL_NAME_USER_POSTGRES,
-            ]:
-                continue
-
-            if database_user_name.startswith(self.POSTGRESQL_PREFIX_SYSTEM_USER):
-                continue
-
-            password = Query(
-                engine=self.support.engines.engines[
-                    self.support.engines.POSTGRESQL_ENGINE_NAME
-                ],
-                query=text(
-                    "SELECT rolpassword FROM pg_authid WHERE rolname=:rolname;"
-                ).bindparams(rolname=database_user_name),
-            ).result[0][0]
+            database_user_password = database_user[1]
 
             database_users.append(
                 DatabaseUser(
                     server=self,
                     name=database_user_name,
                     server_software_name=self.support.POSTGRESQL_SERVER_SOFTWARE_NAME,
-                    password=password,
+                    password=database_user_password,
                     host=None,
                 )
             )
@@ -282,8 +711,8 @@ class Server:
         return database_users
 
     @property
-    def database_users(self) -> List[DatabaseUser]:
-        """Get database users."""
+    def _database_users(self) -> List[DatabaseUser]:
+        """Get database users, uncached."""
         database_users: List[DatabaseUser] = []
 
         if (
@@ -300,6 +729,226 @@ class Server:
 
         return database_users
 
+    @property
+    def database_users(self) -> List[DatabaseUser]:
+        """Get database users.
+
+        Cached if the catalog cache is enabled (see DatabaseSupport).
+        """
+        return self._get_catalog_snapshot(
+            self.support.CATALOG_KEY_DATABASE_USERS, lambda: self._database_users
+        )
+
+    def _get_database_users_passwords(
+        self, database_users: List[DatabaseUser]
+    ) -> Dict[Tuple[str, str, Optional[str]], Optional[str]]:
+        """Get passwords of existing database users, by key.
+
+        Runs one query per server software of the given database users.
+        """
+        server_software_names = {
+            database_user.server_software_name for database_user in database_users
+        }
+
+        existing_database_users: List[DatabaseUser] = []
+
+        if self.support.MARIADB_SERVER_SOFTWARE_NAME in server_software_names:
+            existing_database_users.extend(self._mariadb_database_users)
+
+        if self.support.POSTGRESQL_SERVER_SOFTWARE_NAME in server_software_names:
+            existing_database_users.extend(self._postgresql_database_users)
+
+        return {
+            (
+                database_user.server_software_name,
+                database_user.name,
+                database_user.host,
+            ): database_user.password
+            for database_user in existing_database_users
+        }
+
+    def create_database_users(
+        self, database_users: List[DatabaseUser]
+    ) -> Tuple[List[DatabaseUser], List[DatabaseUser]]:
+        """Create database users that do not exist.
+
+        Unlike DatabaseUser.create, existing database users are read once, and
+        all database users are created on the same connection per engine.
+
+        Returns created database users, and database users that already existed.
+        Database users that are given multiple times are created once, and
+        reported as existing after that.
+        """
+        for database_user in database_users:
+            if not database_user.password:
+                raise PasswordMissingError
+
+        created_database_users = []
+        existing_database_users = []
+
+        with self.support.session():
+            existing_passwords = self._get_database_users_passwords(database_users)
+
+            for database_user in database_users:
+                key = (
+                    database_user.server_software_name,
+                    database_user.name,
+                    database_user.host,
+                )
+
+                if key in existing_passwords:
+                    existing_database_users.append(database_user)
+
+                    continue
+
+                database_user._create()
+
+                existing_passwords[key] = database_user.password
+
+                created_database_users.append(database_user)
+
+        return created_database_users, existing_database_users
+
+    def set_passwords(
+        self, database_users: List[DatabaseUser]
+    ) -> Tuple[List[DatabaseUser], List[DatabaseUser]]:
+        """Set passwords of database users to their password attribute.
+
+        Unlike DatabaseUser.edit, current passwords are read once, and all
+        passwords are set on the same connection per engine. Database users that do
+        not exist are skipped.
+
+        Returns database users whose password was changed, and database users
+        whose password was unchanged (or that do not exist).
+        """
+        for database_user in database_users:
+            if not database_user.password:
+                raise PasswordMissingError
+
+        changed_database_users = []
+        unchanged_database_users = []
+
+        with self.support.session():
+            existing_passwords = self._get_database_users_passwords(database_users)
+
+            for database_user in database_users:
+                key = (
+                    database_user.server_software_name,
+                    database_user.name,
+                    database_user.host,
+                )
+
+                if (
+                    key not in existing_passwords
+                    or existing_passwords[key] == database_user.password
+                ):
+                    unchanged_database_users.append(database_user)
+
+                    continue
+
+                database_user._edit()
+
+                existing_passwords[key] = database_user.password
+
+                changed_database_users.append(database_user)
+
+        return changed_database_users, unchanged_database_users
+
+    def _get_database_user_grants_exist(
+        self, database_user_grants: List[DatabaseUserGrant]
+    ) -> List[bool]:
+        """Get if database user grants exist, using one snapshot."""
+        existing_database_user_grants: Dict[
+            Tuple[str, Optional[str], str, str], List[DatabaseUserGrant]
+        ] = {}
+
+        for existing_database_user_grant in self._database_user_grants:
+            existing_database_user_grants.setdefault(
+                (
+                    existing_database_user_grant.database_user.name,
+                    existing_database_user_grant.database_user.host,
+                    existing_database_user_grant.database_name,
+                    existing_database_user_grant.table_name,
+                ),
+                [],
+            ).append(existing_database_user_grant)
+
+        return [
+            any(
+                database_user_grant._matches(existing_database_user_grant)
+                for existing_database_user_grant in existing_database_user_grants.get(
+                    (
+                        database_user_grant.database_user.name,
+                        database_user_grant.database_user.host,
+                        database_user_grant.database_name,
+                        database_user_grant.table_name,
+                    ),
+                    [],
+                )
+            )
+            for database_user_grant in database_user_grants
+        ]
+
+    def grant_many(
+        self, database_user_grants: List[DatabaseUserGrant]
+    ) -> Tuple[List[DatabaseUserGrant], List[DatabaseUserGrant]]:
+        """Create database user grants that do not exist.
+
+        Unlike DatabaseUserGrant.grant, existing grants are read once, and all
+        grants are created on the same connection.
+
+        Returns created database user grants, and database user grants that
+        already existed.
+        """
+        granted_database_user_grants = []
+        existing_database_user_grants = []
+
+        with self.support.session():
+            for database_user_grant, exists in zip(
+                database_user_grants,
+                self._get_database_user_grants_exist(database_user_grants),
+            ):
+                if exists:
+                    existing_database_user_grants.append(database_user_grant)
+
+                    continue
+
+                database_user_grant._grant()
+
+                granted_database_user_grants.append(database_user_grant)
+
+        return granted_database_user_grants, existing_database_user_grants
+
+    def revoke_many(
+        self, database_user_grants: List[DatabaseUserGrant]
+    ) -> Tuple[List[DatabaseUserGrant], List[DatabaseUserGrant]]:
+        """Delete database user grants that exist.
+
+        Unlike DatabaseUserGrant.revoke, existing grants are read once, and all
+        grants are deleted on the same connection.
+
+        Returns deleted database user grants, and database user grants that
+        did not exist.
+        """
+        revoked_database_user_grants = []
+        not_existing_database_user_grants = []
+
+        with self.support.session():
+            for database_user_grant, exists in zip(
+                database_user_grants,
+                self._get_database_user_grants_exist(database_user_grants),
+            ):
+                if not exists:
+                    not_existing_database_user_grants.append(database_user_grant)
+
+                    continue
+
+                database_user_grant._revoke()
+
+                revoked_database_user_grants.append(database_user_grant)
+
+        return revoked_database_user_grants, not_existing_database_user_grants
+
     def get_global_status_variable(self, name: str) -> Optional[str]:
         result = Query(
             engine=self.support.engines.engines[self.support.engines.MYSQL_ENGINE_NAME],
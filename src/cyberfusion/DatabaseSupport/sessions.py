@@ -0,0 +1,91 @@
+"""Classes for running multiple queries on one connection."""
+
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Dict, Optional, Type
+
+import sqlalchemy as sa
+
+_current_session: ContextVar[Optional["Session"]] = ContextVar(
+    "current_session", default=None
+)
+
+
+def get_current_session() -> Optional["Session"]:
+    """Get session that is active in the current context, if any."""
+    return _current_session.get()
+
+
+class Session:
+    """Abstract representation of unit of work.
+
+    While the session is active (i.e. inside the 'with' block), queries (see
+    Query) use one connection per engine, instead of a new connection per query.
+    Therefore, methods of other classes, such as DatabaseUser.create and
+    DatabaseUserGrant.grant, share the connection as well.
+
+    Queries on a connection run in one transaction, which is committed when
+    the session ends, or rolled back when an exception is raised. Note that
+    some statements cause an implicit commit (e.g. DDL statements on MariaDB).
+
+    The session is bound to the current context, so it is not used by other
+    threads.
+
+    Only queries run with Query use the session. The following use their own
+    connections, so they don't see uncommitted changes made in the session
+    (and vice versa):
+
+    - Database.exists, Database.create and Database.drop
+    - Listings based on inspectors, such as Database.tables and
+      Server.databases (for MariaDB)
+    - Reflections, such as Table.reflection
+    - StreamingQuery, and therefore exports
+    """
+
+    def __init__(self) -> None:
+        """Set attributes."""
+        self._connections: Dict[sa.engine.base.Engine, sa.engine.base.Connection] = {}
+        self._token: Optional[Token] = None
+
+    def get_connection(
+        self, engine: sa.engine.base.Engine
+    ) -> sa.engine.base.Connection:
+        """Get connection for engine, opening it (and a transaction) if needed."""
+        if engine not in self._connections:
+            connection = engine.connect()
+
+            connection.begin()
+
+            self._connections[engine] = connection
+
+        return self._connections[engine]
+
+    def __enter__(self) -> "Session":
+        """Activate session."""
+        self._token = _current_session.set(self)
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Commit or roll back transactions, close connections, and deactivate session."""
+        try:
+            for connection in self._connections.values():
+                if exc_type is None:
+                    connection.commit()
+                else:
+                    connection.rollback()
+        finally:
+            for connection in self._connections.values():
+                connection.close()
+
+            self._connections.clear()
+
+            if self._token:
+                _current_session.reset(self._token)
+
+                self._token = None
@@ -1,7 +1,10 @@
 """Classes for interaction with tables."""
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
+from pydantic import BaseModel
 from sqlalchemy.schema import Index, Table as SQLAlchemyTable
 from sqlalchemy.sql import text
 
@@ -12,16 +15,49 @@ if TYPE_CHECKING:  # pragma: no cover
 
 import re
 
-from cyberfusion.DatabaseSupport.exceptions import ServerNotSupportedError
-from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.exceptions import (
+    PrimaryKeyNotSupportedError,
+    ServerNotSupportedError,
+)
+from cyberfusion.DatabaseSupport.queries import Query, StreamingQuery
 from cyberfusion.DatabaseSupport.utilities import object_exists
 
 
+class TableChunkChecksum(BaseModel):
+    """Checksum of chunk of table.
+
+    The chunk contains rows with a primary key between the lower boundary
+    (inclusive) and upper boundary (exclusive). A boundary of None means
+    unbounded.
+    """
+
+    lower_boundary: Any
+    upper_boundary: Any
+    rows: int
+    checksum: int
+
+
+class TableRowDifference(BaseModel):
+    """Row that differs between tables (see Table.diff)."""
+
+    operation: str
+    primary_key: Any
+    row: Dict[str, Any]
+
+
 class Table:
     """Abstract representation of table."""
 
     CHAR_NAME_DATABASE_WILDCARD = "*"
 
+    DIFF_OPERATION_INSERT = "insert"
+    DIFF_OPERATION_UPDATE = "update"
+    DIFF_OPERATION_DELETE = "delete"
+
+    DIFF_CHUNK_SIZE_DEFAULT = 100000
+    DIFF_LEAF_SIZE_DEFAULT = 1000
+    DIFF_FANOUT = 8
+
     def __init__(
         self,
         *,
@@ -52,13 +88,22 @@ class Table:
     @property
     def exists(self) -> bool:
         """Get table exists locally."""
-        for table in self.database.tables:
-            if table.name != self.name:
-                continue
-
-            return True
-
-        return False
+        if (
+            self.database.server_software_name
+            == self.database.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            engine = self.database.server_engine
+        else:
+            engine = self.database.database_engine  # Catalog is per database
+
+        return bool(
+            Query(
+                engine=engine,
+                query=text(
+                    "SELECT 1 FROM information_schema.tables WHERE table_schema=:schema_name AND table_name=:table_name AND table_type='BASE TABLE';"
+                ).bindparams(schema_name=self.database.name, table_name=self.name),
+            ).result
+        )
 
     @property
     def checksum(self) -> int:
@@ -78,6 +123,350 @@ class Table:
             ).bindparams(),
         ).result[0][1]
 
+    @property
+    def _primary_key_column_name(self) -> str:
+        """Get name of primary key column."""
+        columns = self.reflection.primary_key.columns
+
+        if len(columns) != 1:
+            raise PrimaryKeyNotSupportedError
+
+        return list(columns)[0].name
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        """Quote identifier for MariaDB."""
+        return "`" + identifier.replace("`", "``") + "`"
+
+    @property
+    def _quoted_table_name_with_schema_name(self) -> str:
+        """Get quoted table name with schema name."""
+        return self._quote(self.database.name) + "." + self._quote(self.name)
+
+    def _get_range_condition(
+        self,
+        *,
+        lower_boundary: Any,
+        upper_boundary: Any,
+        primary_key_column_name: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Get WHERE clause and parameters for rows between primary key boundaries.
+
+        If the primary key column name is not given, it is determined from the
+        reflection.
+        """
+        if primary_key_column_name is None:
+            primary_key_column_name = self._primary_key_column_name
+
+        primary_key = self._quote(primary_key_column_name)
+
+        conditions = []
+        parameters = {}
+
+        if lower_boundary is not None:
+            conditions.append(f"{primary_key} >= :lower_boundary")
+            parameters["lower_boundary"] = lower_boundary
+
+        if upper_boundary is not None:
+            conditions.append(f"{primary_key} < :upper_boundary")
+            parameters["upper_boundary"] = upper_boundary
+
+        if not conditions:
+            return "", parameters
+
+        return " WHERE " + " AND ".join(conditions), parameters
+
+    def get_chunk_boundaries(
+        self,
+        *,
+        chunk_size: int,
+        lower_boundary: Any = None,
+        upper_boundary: Any = None,
+    ) -> List[Any]:
+        """Get primary key values at which chunks of chunk_size rows start.
+
+        If boundaries are given, only rows between them are chunked.
+
+        Requires a primary key consisting of one column.
+        """
+        if (
+            self.database.server_software_name
+            != self.database.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            raise ServerNotSupportedError
+
+        if chunk_size < 1:
+            raise InvalidInputError(chunk_size)
+
+        primary_key = self._quote(self._primary_key_column_name)
+
+        where, parameters = self._get_range_condition(
+            lower_boundary=lower_boundary, upper_boundary=upper_boundary
+        )
+
+        return [
+            result[0]
+            for result in Query(
+                engine=self.database.server_engine,
+                query=text(
+                    f"SELECT {primary_key} FROM (SELECT {primary_key}, ROW_NUMBER() OVER (ORDER BY {primary_key}) AS chunk_row_number FROM {self._quoted_table_name_with_schema_name}{where}) AS numbered WHERE MOD(chunk_row_number - 1, :chunk_size) = 0 ORDER BY {primary_key};"
+                ).bindparams(chunk_size=chunk_size, **parameters),
+            ).result
+        ]
+
+    def _get_chunk_checksum(
+        self,
+        *,
+        column_names: List[str],
+        primary_key_column_name: str,
+        lower_boundary: Any,
+        upper_boundary: Any,
+    ) -> TableChunkChecksum:
+        """Get checksum of rows between boundaries.
+
+        Column names must be quoted. They are passed, rather than determined
+        from the reflection, as this method is called from multiple threads.
+        """
+        # CONCAT_WS skips NULL values, so add whether each column is NULL, to
+        # distinguish e.g. (NULL, 'a') from ('a', NULL)
+
+        concatenation = ", ".join(
+            column_names + [f"ISNULL({column_name})" for column_name in column_names]
+        )
+
+        where, parameters = self._get_range_condition(
+            lower_boundary=lower_boundary,
+            upper_boundary=upper_boundary,
+            primary_key_column_name=primary_key_column_name,
+        )
+
+        result = Query(
+            engine=self.database.server_engine,
+            query=text(
+                f"SELECT COUNT(*), COALESCE(BIT_XOR(CRC32(CONCAT_WS('#', {concatenation}))), 0) FROM {self._quoted_table_name_with_schema_name}{where};"
+            ).bindparams(**parameters),
+        ).result[0]
+
+        return TableChunkChecksum(
+            lower_boundary=lower_boundary,
+            upper_boundary=upper_boundary,
+            rows=result[0],
+            checksum=result[1],
+        )
+
+    def get_chunk_checksums(
+        self,
+        *,
+        boundaries: List[Any],
+        workers: int = 1,
+        lower_boundary: Any = None,
+        upper_boundary: Any = None,
+    ) -> List[TableChunkChecksum]:
+        """Get checksums of chunks of table.
+
+        Boundaries are the primary key values at which chunks start (see
+        get_chunk_boundaries). The first chunk starts at lower_boundary and the
+        last chunk ends at upper_boundary (unbounded by default), so that rows
+        outside the boundaries are included as well. Therefore, boundaries of
+        one table can be used to compare chunks with another table.
+
+        Chunks are checksummed by the given amount of workers concurrently.
+        """
+        if (
+            self.database.server_software_name
+            != self.database.support.MARIADB_SERVER_SOFTWARE_NAME
+        ):
+            raise ServerNotSupportedError
+
+        if workers < 1:
+            raise InvalidInputError(workers)
+
+        lower_boundaries = [lower_boundary] + boundaries[1:]
+        upper_boundaries = boundaries[1:] + [upper_boundary]
+
+        # Reflecting is not thread-safe (the metadata is shared), so reflect
+        # before starting workers
+
+        column_names = [self._quote(column.name) for column in self.reflection.columns]
+        primary_key_column_name = self._primary_key_column_name
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    lambda boundaries: self._get_chunk_checksum(
+                        column_names=column_names,
+                        primary_key_column_name=primary_key_column_name,
+                        lower_boundary=boundaries[0],
+                        upper_boundary=boundaries[1],
+                    ),
+                    zip(lower_boundaries, upper_boundaries),
+                )
+            )
+
+    def get_chunked_checksum(
+        self, *, chunk_size: int, workers: int = 1
+    ) -> List[TableChunkChecksum]:
+        """Get checksums of chunks of chunk_size rows.
+
+        Unlike the checksum property, which checksums the whole table in one
+        thread, chunks are checksummed concurrently, and the result shows where
+        rows differ.
+        """
+        return self.get_chunk_checksums(
+            boundaries=self.get_chunk_boundaries(chunk_size=chunk_size),
+            workers=workers,
+        )
+
+    def _get_rows(
+        self, *, lower_boundary: Any, upper_boundary: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Get rows between primary key boundaries, streamed."""
+        where, parameters = self._get_range_condition(
+            lower_boundary=lower_boundary, upper_boundary=upper_boundary
+        )
+
+        for row in StreamingQuery(
+            engine=self.database.server_engine,
+            query=text(
+                f"SELECT * FROM {self._quoted_table_name_with_schema_name}{where};"
+            ).bindparams(**parameters),
+        ):
+            yield dict(row._mapping)
+
+    def _diff_rows(
+        self, *, right_table: "Table", lower_boundary: Any, upper_boundary: Any
+    ) -> Iterator[TableRowDifference]:
+        """Get differing rows between primary key boundaries.
+
+        Rows of this table between the boundaries are held in memory, so the
+        amount of rows should be limited.
+        """
+        primary_key = self._primary_key_column_name
+
+        left_rows = {
+            row[primary_key]: row
+            for row in self._get_rows(
+                lower_boundary=lower_boundary, upper_boundary=upper_boundary
+            )
+        }
+
+        for right_row in right_table._get_rows(
+            lower_boundary=lower_boundary, upper_boundary=upper_boundary
+        ):
+            left_row = left_rows.pop(right_row[primary_key], None)
+
+            if left_row is None:
+                yield TableRowDifference(
+                    operation=self.DIFF_OPERATION_DELETE,
+                    primary_key=right_row[primary_key],
+                    row=right_row,
+                )
+            elif left_row != right_row:
+                yield TableRowDifference(
+                    operation=self.DIFF_OPERATION_UPDATE,
+                    primary_key=right_row[primary_key],
+                    row=left_row,
+                )
+
+        for key, left_row in left_rows.items():
+            yield TableRowDifference(
+                operation=self.DIFF_OPERATION_INSERT, primary_key=key, row=left_row
+            )
+
+    def _diff_chunks(
+        self,
+        *,
+        right_table: "Table",
+        boundaries: List[Any],
+        lower_boundary: Any,
+        upper_boundary: Any,
+        leaf_size: int,
+        workers: int,
+    ) -> Iterator[TableRowDifference]:
+        """Get differing rows in chunks, narrowing down differing chunks."""
+        left_chunks = self.get_chunk_checksums(
+            boundaries=boundaries,
+            workers=workers,
+            lower_boundary=lower_boundary,
+            upper_boundary=upper_boundary,
+        )
+        right_chunks = right_table.get_chunk_checksums(
+            boundaries=boundaries,
+            workers=workers,
+            lower_boundary=lower_boundary,
+            upper_boundary=upper_boundary,
+        )
+
+        for left_chunk, right_chunk in zip(left_chunks, right_chunks):
+            if (
+                left_chunk.rows == right_chunk.rows
+                and left_chunk.checksum == right_chunk.checksum
+            ):
+                continue
+
+            rows = max(left_chunk.rows, right_chunk.rows)
+
+            if rows <= leaf_size:
+                yield from self._diff_rows(
+                    right_table=right_table,
+                    lower_boundary=left_chunk.lower_boundary,
+                    upper_boundary=left_chunk.upper_boundary,
+                )
+
+                continue
+
+            # Split chunk using the table with the most rows in it, so that
+            # the chunk is always split into smaller chunks
+
+            table = self if left_chunk.rows >= right_chunk.rows else right_table
+
+            yield from self._diff_chunks(
+                right_table=right_table,
+                boundaries=table.get_chunk_boundaries(
+                    chunk_size=math.ceil(rows / self.DIFF_FANOUT),
+                    lower_boundary=left_chunk.lower_boundary,
+                    upper_boundary=left_chunk.upper_boundary,
+                ),
+                lower_boundary=left_chunk.lower_boundary,
+                upper_boundary=left_chunk.upper_boundary,
+                leaf_size=leaf_size,
+                workers=workers,
+            )
+
+    def diff(
+        self,
+        *,
+        right_table: "Table",
+        chunk_size: int = DIFF_CHUNK_SIZE_DEFAULT,
+        leaf_size: int = DIFF_LEAF_SIZE_DEFAULT,
+        workers: int = 1,
+    ) -> Iterator[TableRowDifference]:
+        """Get rows that differ from another table.
+
+        This table is the source: rows that are only present in this table are
+        reported as inserts, rows that are only present in the right table as
+        deletes, and rows that differ as updates (with the row of this table).
+        Applying the differences to the right table makes it identical.
+
+        Tables are compared by checksums of chunks (see get_chunk_checksums).
+        Differing chunks are split recursively, until they contain at most
+        leaf_size rows. Rows in those chunks are then compared. Therefore,
+        memory usage is limited by leaf_size, regardless of table size.
+
+        Both tables must have the same primary key, consisting of one column.
+        """
+        if leaf_size < 1:
+            raise InvalidInputError(leaf_size)
+
+        yield from self._diff_chunks(
+            right_table=right_table,
+            boundaries=self.get_chunk_boundaries(chunk_size=chunk_size),
+            lower_boundary=None,
+            upper_boundary=None,
+            leaf_size=leaf_size,
+            workers=workers,
+        )
+
     @property
     def _table_name_with_schema_name(self) -> str:
         """Get table name with schema name."""
@@ -85,8 +474,11 @@ class Table:
 
     @property
     def reflection(self) -> SQLAlchemyTable:
-        """Get reflected table from database."""
-        return self.database.metadata.tables[self._table_name_with_schema_name]
+        """Get reflected table from database.
+
+        The reflection is cached on the database, see Database.get_table_reflection.
+        """
+        return self.database.get_table_reflection(self.name)
 
     @object_exists
     def create_index(
@@ -120,7 +512,13 @@ class Table:
             **kwargs,
         )
 
-        index.create(bind=self.database.database_engine)
+        # The index is attached to the cached reflection, so clear it, also
+        # if creating fails
+
+        try:
+            index.create(bind=self.database.database_engine)
+        finally:
+            self.database.clear_table_reflection(self.name)
 
     @object_exists
     def get_indexes_by_column(self, *, column: str) -> List[Index]:
@@ -138,4 +536,6 @@ class Table:
         """Drop table."""
         self.reflection.drop(bind=self.database.database_engine)
 
+        self.database.clear_table_reflection(self.name)
+
         return True
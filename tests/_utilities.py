@@ -1,3 +1,9 @@
+# Password hashes of MariaDB database users
+
+PASSWORD_1 = "*AC57754462B6D4C373263062D60EDC6E452E574D"
+PASSWORD_2 = "*2470C0C06DEE42FD1618BB99005ADCA2EC9D1E19"
+
+
 def add_worker_id_to_server_host(server_host: str, worker_id: str) -> str:
     """Add pytest-xdist worker ID to server host.
 
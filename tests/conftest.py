@@ -1,7 +1,7 @@
 import os
 import shutil
 import uuid
-from typing import Generator
+from typing import Generator, Tuple
 
 import pytest
 from _pytest.config.argparsing import Parser
@@ -10,17 +10,24 @@ from sqlalchemy import Column, Integer, String
 from sqlalchemy import Table as SQLAlchemyTable
 from sqlalchemy.schema import CreateSchema, DropSchema
 
-from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport import AsyncDatabaseSupport, DatabaseSupport
+from cyberfusion.DatabaseSupport.async_servers import AsyncServer
 from cyberfusion.DatabaseSupport.database_importation import (
     DatabaseImportation,
 )
 from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
 from cyberfusion.DatabaseSupport.database_users import DatabaseUser
 from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.reconciliations import (
+    DesiredDatabase,
+    DesiredDatabaseUser,
+    DesiredDatabaseUserGrant,
+    DesiredState,
+)
 from cyberfusion.DatabaseSupport.servers import Server
 from cyberfusion.DatabaseSupport.tables import Table
 from cyberfusion.DatabaseSupport.utilities import generate_random_string
-from tests._utilities import add_worker_id_to_server_host
+from tests._utilities import PASSWORD_1, add_worker_id_to_server_host
 
 
 def pytest_addoption(parser: Parser) -> None:
@@ -94,16 +101,79 @@ def postgresql_support(
     )
 
 
+@pytest.fixture
+def mariadb_async_support(
+    mariadb_server_password: str, mariadb_server_host: str
+) -> AsyncDatabaseSupport:
+    return AsyncDatabaseSupport(
+        server_software_names=["MariaDB"],
+        server_password=mariadb_server_password,
+        mariadb_server_host=mariadb_server_host,
+        mariadb_server_username="root",
+    )
+
+
+@pytest.fixture
+def postgresql_async_support(
+    postgresql_server_password: str, postgresql_server_host: str
+) -> AsyncDatabaseSupport:
+    return AsyncDatabaseSupport(
+        server_software_names=["PostgreSQL"],
+        server_password=postgresql_server_password,
+        postgresql_server_host=postgresql_server_host,
+        postgresql_server_username="postgres",
+    )
+
+
+@pytest.fixture
+def mariadb_async_server(mariadb_async_support: AsyncDatabaseSupport) -> AsyncServer:
+    return AsyncServer(support=mariadb_async_support)
+
+
+@pytest.fixture
+def postgresql_async_server(
+    postgresql_async_support: AsyncDatabaseSupport,
+) -> AsyncServer:
+    return AsyncServer(support=postgresql_async_support)
+
+
 @pytest.fixture
 def mariadb_server(mariadb_support: DatabaseSupport) -> Server:
     return Server(support=mariadb_support)
 
 
+@pytest.fixture
+def offline_server() -> Server:
+    # Not connected to a server, so unusable for queries
+
+    return Server(
+        support=DatabaseSupport(
+            server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+            mariadb_server_username="root",
+        )
+    )
+
+
 @pytest.fixture
 def postgresql_server(postgresql_support: DatabaseSupport) -> Server:
     return Server(support=postgresql_support)
 
 
+@pytest.fixture
+def mariadb_server_catalog_cached(
+    mariadb_server_password: str, mariadb_server_host: str
+) -> Server:
+    return Server(
+        support=DatabaseSupport(
+            server_software_names=["MariaDB"],
+            server_password=mariadb_server_password,
+            mariadb_server_host=mariadb_server_host,
+            mariadb_server_username="root",
+            catalog_cache_maximum_age=60,
+        )
+    )
+
+
 @pytest.fixture
 def database_importation(
     mocker: MockerFixture,
@@ -153,6 +223,25 @@ def mariadb_database(
         database.drop()
 
 
+@pytest.fixture
+def offline_database(request: pytest.FixtureRequest) -> Database:
+    # Not connected to a server, so unusable for queries. Server software is
+    # MariaDB, unless parametrized indirectly.
+
+    server_software_name = getattr(
+        request, "param", DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME
+    )
+
+    return Database(
+        support=DatabaseSupport(
+            server_software_names=[server_software_name],
+            mariadb_server_username="root",
+        ),
+        name="example",
+        server_software_name=server_software_name,
+    )
+
+
 @pytest.fixture
 def mariadb_database_with_wrong_name(
     mariadb_server: Server, worker_id: str
@@ -574,3 +663,64 @@ def mariadb_database_user_grant_created(
 
     if database_user_grant.exists:
         database_user_grant.revoke()
+
+
+# Reconciliation
+
+
+@pytest.fixture
+def reconciliation_desired_state(request: pytest.FixtureRequest) -> DesiredState:
+    # Privilege names are SELECT, unless parametrized indirectly
+
+    privilege_names = getattr(request, "param", ["SELECT"])
+
+    return DesiredState(
+        databases=[DesiredDatabase(name="example", server_software_name="MariaDB")],
+        database_users=[
+            DesiredDatabaseUser(
+                name="example",
+                server_software_name="MariaDB",
+                password=PASSWORD_1,
+                host="%",
+            )
+        ],
+        database_user_grants=[
+            DesiredDatabaseUserGrant(
+                database_name="example",
+                database_user_name="example",
+                database_user_host="%",
+                privilege_names=privilege_names,
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def reconciliation_existing_objects(
+    request: pytest.FixtureRequest, offline_server: Server
+) -> Tuple[Database, DatabaseUser, DatabaseUserGrant]:
+    # Objects matching reconciliation_desired_state by default. Password and
+    # privilege names can be parametrized indirectly.
+
+    kwargs = getattr(request, "param", {})
+
+    database = Database(
+        support=offline_server.support,
+        name="example",
+        server_software_name="MariaDB",
+    )
+    database_user = DatabaseUser(
+        server=offline_server,
+        name="example",
+        server_software_name="MariaDB",
+        password=kwargs.get("password", PASSWORD_1),
+        host="%",
+    )
+    database_user_grant = DatabaseUserGrant(
+        database=database,
+        database_user=database_user,
+        privilege_names=kwargs.get("privilege_names", ["SELECT"]),
+        table=None,
+    )
+
+    return database, database_user, database_user_grant
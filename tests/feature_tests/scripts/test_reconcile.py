@@ -0,0 +1,49 @@
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.reconciliations import DesiredDatabase, DesiredState
+from cyberfusion.DatabaseSupport.scripts.reconcile import app
+from cyberfusion.DatabaseSupport.utilities import generate_random_string
+
+runner = CliRunner()
+
+
+@pytest.mark.mariadb
+def test_reconcile_dry_run(mariadb_support: DatabaseSupport, tmp_path: str) -> None:
+    name = generate_random_string()
+
+    path = os.path.join(tmp_path, "desired_state.json")
+
+    with open(path, "w") as f:
+        f.write(
+            DesiredState(
+                databases=[DesiredDatabase(name=name, server_software_name="MariaDB")]
+            ).model_dump_json()
+        )
+
+    result = runner.invoke(
+        app,
+        [
+            "--host",
+            mariadb_support.mariadb_server_host,
+            "--username",
+            mariadb_support.mariadb_server_username,
+            "--password",
+            mariadb_support.server_password,
+            "--desired-state-path",
+            path,
+            "--dry-run",
+        ],
+    )
+
+    assert result.exit_code == 0, result.stderr
+
+    assert result.stdout == f"create database {name}\n"
+
+    assert not Database(
+        support=mariadb_support, name=name, server_software_name="MariaDB"
+    ).exists
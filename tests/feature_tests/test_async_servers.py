@@ -0,0 +1,230 @@
+import asyncio
+from typing import Generator
+
+import pytest
+from sqlalchemy import text
+
+from cyberfusion.DatabaseSupport import AsyncDatabaseSupport
+from cyberfusion.DatabaseSupport.async_queries import AsyncQuery
+from cyberfusion.DatabaseSupport.async_servers import AsyncServer
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+
+
+async def _execute(engine, query):  # type: ignore[no-untyped-def]
+    return (await AsyncQuery(engine=engine, query=query)).result
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_query_result_rows(
+    mariadb_async_support: AsyncDatabaseSupport,
+) -> None:
+    assert asyncio.run(
+        _execute(
+            mariadb_async_support.async_engines.engines["mysql"], text("SELECT 1;")
+        )
+    ) == [(1,)]
+
+
+@pytest.mark.postgresql
+def test_postgresql_async_query_result_rows(
+    postgresql_async_support: AsyncDatabaseSupport,
+) -> None:
+    assert asyncio.run(
+        _execute(
+            postgresql_async_support.async_engines.engines["postgresql"],
+            text("SELECT 1;"),
+        )
+    ) == [(1,)]
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_query_result_not_rows(
+    mariadb_async_support: AsyncDatabaseSupport,
+) -> None:
+    assert (
+        asyncio.run(
+            _execute(
+                mariadb_async_support.async_engines.engines["mysql"], text("COMMIT;")
+            )
+        )
+        == []
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_engine_url(
+    mariadb_async_support: AsyncDatabaseSupport,
+) -> None:
+    assert (
+        mariadb_async_support.async_engines.urls["mysql"].drivername == "mysql+asyncmy"
+    )
+
+
+@pytest.mark.postgresql
+def test_postgresql_async_engine_url(
+    postgresql_async_support: AsyncDatabaseSupport,
+) -> None:
+    assert (
+        postgresql_async_support.async_engines.urls["postgresql"].drivername
+        == "postgresql+asyncpg"
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_databases(
+    mariadb_async_server: AsyncServer,
+    mariadb_database_created_1: Generator[Database, None, None],
+) -> None:
+    databases = asyncio.run(mariadb_async_server.get_databases())
+
+    assert any(
+        database.name == mariadb_database_created_1.name for database in databases
+    )
+    assert not any(database.name == "mysql" for database in databases)
+
+
+@pytest.mark.postgresql
+def test_postgresql_async_databases(
+    postgresql_async_server: AsyncServer,
+    postgresql_database_created_1: Generator[Database, None, None],
+) -> None:
+    databases = asyncio.run(postgresql_async_server.get_databases())
+
+    assert any(
+        database.name == postgresql_database_created_1.name for database in databases
+    )
+    assert not any(database.name == "template0" for database in databases)
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_database_create_drop(
+    mariadb_async_server: AsyncServer,
+    mariadb_database: Generator[Database, None, None],
+) -> None:
+    async def _run() -> None:
+        assert await mariadb_async_server.create_database(mariadb_database)
+        assert not await mariadb_async_server.create_database(mariadb_database)
+
+        assert mariadb_database.exists
+
+        assert await mariadb_async_server.get_database_size(mariadb_database) >= 0
+
+        assert await mariadb_async_server.drop_database(mariadb_database)
+        assert not await mariadb_async_server.drop_database(mariadb_database)
+
+    asyncio.run(_run())
+
+    assert not mariadb_database.exists
+
+
+@pytest.mark.postgresql
+def test_postgresql_async_database_create_drop(
+    postgresql_async_server: AsyncServer,
+    postgresql_database: Generator[Database, None, None],
+) -> None:
+    async def _run() -> None:
+        assert await postgresql_async_server.create_database(postgresql_database)
+        assert not await postgresql_async_server.create_database(postgresql_database)
+
+        assert postgresql_database.exists
+
+        assert await postgresql_async_server.get_database_size(postgresql_database) > 0
+
+        assert await postgresql_async_server.drop_database(postgresql_database)
+        assert not await postgresql_async_server.drop_database(postgresql_database)
+
+    asyncio.run(_run())
+
+    assert not postgresql_database.exists
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_database_user_create_drop(
+    mariadb_async_server: AsyncServer,
+    mariadb_database_user: Generator[DatabaseUser, None, None],
+) -> None:
+    async def _run() -> None:
+        assert await mariadb_async_server.create_database_user(mariadb_database_user)
+        assert not await mariadb_async_server.create_database_user(
+            mariadb_database_user
+        )
+
+        assert any(
+            database_user.name == mariadb_database_user.name
+            and database_user.password == mariadb_database_user.password
+            for database_user in await mariadb_async_server.get_database_users()
+        )
+
+        assert await mariadb_async_server.drop_database_user(mariadb_database_user)
+        assert not await mariadb_async_server.drop_database_user(mariadb_database_user)
+
+    asyncio.run(_run())
+
+    assert not mariadb_database_user.exists
+
+
+@pytest.mark.postgresql
+def test_postgresql_async_database_user_create_drop(
+    postgresql_async_server: AsyncServer,
+    postgresql_database_user: Generator[DatabaseUser, None, None],
+) -> None:
+    async def _run() -> None:
+        assert await postgresql_async_server.create_database_user(
+            postgresql_database_user
+        )
+        assert not await postgresql_async_server.create_database_user(
+            postgresql_database_user
+        )
+
+        assert any(
+            database_user.name == postgresql_database_user.name
+            for database_user in await postgresql_async_server.get_database_users()
+        )
+
+        assert await postgresql_async_server.drop_database_user(
+            postgresql_database_user
+        )
+        assert not await postgresql_async_server.drop_database_user(
+            postgresql_database_user
+        )
+
+    asyncio.run(_run())
+
+    assert not postgresql_database_user.exists
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_grant_revoke(
+    mariadb_async_server: AsyncServer,
+    mariadb_database_user_grant: Generator[DatabaseUserGrant, None, None],
+) -> None:
+    async def _run() -> None:
+        assert await mariadb_async_server.grant(mariadb_database_user_grant)
+        assert not await mariadb_async_server.grant(mariadb_database_user_grant)
+
+        assert mariadb_database_user_grant.exists
+
+        assert await mariadb_async_server.revoke(mariadb_database_user_grant)
+        assert not await mariadb_async_server.revoke(mariadb_database_user_grant)
+
+    asyncio.run(_run())
+
+    assert not mariadb_database_user_grant.exists
+
+
+@pytest.mark.mariadb
+def test_mariadb_async_concurrent(
+    mariadb_async_server: AsyncServer,
+    mariadb_database_created_1: Generator[Database, None, None],
+) -> None:
+    async def _run() -> list:
+        return await asyncio.gather(
+            *[
+                mariadb_async_server.get_database_size(mariadb_database_created_1)
+                for _ in range(10)
+            ]
+        )
+
+    assert len(asyncio.run(_run())) == 10
@@ -1,6 +1,7 @@
 from typing import Generator
 
 import pytest
+from pytest_mock import MockerFixture
 
 from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
 from cyberfusion.DatabaseSupport.database_users import DatabaseUser
@@ -9,6 +10,7 @@ from cyberfusion.DatabaseSupport.exceptions import (
     InvalidInputError,
     ServerNotSupportedError,
 )
+from cyberfusion.DatabaseSupport.queries import Query
 from cyberfusion.DatabaseSupport.servers import Server
 from cyberfusion.DatabaseSupport.tables import Table
 from cyberfusion.DatabaseSupport.utilities import generate_random_string
@@ -197,6 +199,18 @@ def test_mariadb_database_user_grant_exists(
     assert mariadb_database_user_grant_created.exists
 
 
+@pytest.mark.mariadb
+def test_mariadb_database_user_grant_exists_single_query(
+    mocker: MockerFixture,
+    mariadb_database_user_grant_created: Generator[DatabaseUserGrant, None, None],
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    assert mariadb_database_user_grant_created.exists
+
+    assert spy.call_count == 1
+
+
 @pytest.mark.mariadb
 def test_mariadb_database_user_grant_not_exists(
     mariadb_server: Server,
@@ -1,12 +1,14 @@
 from typing import Generator
 
 import pytest
+from pytest_mock import MockerFixture
 
 from cyberfusion.DatabaseSupport.database_users import DatabaseUser
 from cyberfusion.DatabaseSupport.exceptions import (
     InvalidInputError,
     PasswordMissingError,
 )
+from cyberfusion.DatabaseSupport.queries import Query
 from cyberfusion.DatabaseSupport.servers import Server
 from cyberfusion.DatabaseSupport.utilities import generate_random_string
 
@@ -106,6 +108,18 @@ def test_mariadb_database_user_exists(
     assert mariadb_database_user_created.exists
 
 
+@pytest.mark.mariadb
+def test_mariadb_database_user_exists_single_query(
+    mocker: MockerFixture,
+    mariadb_database_user_created: Generator[DatabaseUser, None, None],
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    assert mariadb_database_user_created.exists
+
+    assert spy.call_count == 1
+
+
 @pytest.mark.mariadb
 def test_mariadb_database_user_not_exists(
     mariadb_server: Server,
@@ -233,6 +247,17 @@ def test_postgresql_database_user_not_exists(
     assert not postgresql_database_user.exists
 
 
+@pytest.mark.postgresql
+def test_postgresql_database_user_not_exists_system_user(
+    postgresql_server: Server,
+) -> None:
+    assert not DatabaseUser(
+        server=postgresql_server,
+        name="postgres",
+        server_software_name="PostgreSQL",
+    ).exists
+
+
 @pytest.mark.postgresql
 def test_postgresql_database_user_not_exists_by_name(
     postgresql_server: Server,
@@ -1,16 +1,26 @@
+import base64
 import configparser
+import hashlib
 import os
 import pwd
-from typing import Generator
+import subprocess
+from typing import Generator, List, Optional
 
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
 from pytest_mock import MockerFixture  # type: ignore[attr-defined]
 from sqlalchemy import MetaData
+from sqlalchemy.sql import text
 
+from cyberfusion.Common import get_md5_hash
 from cyberfusion.DatabaseSupport import DatabaseSupport
 from cyberfusion.DatabaseSupport.databases import Database
-from cyberfusion.DatabaseSupport.exceptions import ServerNotSupportedError
+from cyberfusion.DatabaseSupport.exceptions import (
+    InvalidInputError,
+    ServerNotSupportedError,
+)
+from cyberfusion.DatabaseSupport.exports import ParallelExporter
+from cyberfusion.DatabaseSupport.queries import Query
 from cyberfusion.DatabaseSupport.servers import Server
 from cyberfusion.DatabaseSupport.tables import Table
 from cyberfusion.DatabaseSupport.utilities import generate_random_string
@@ -23,44 +33,10 @@ def test_database_size_no_result(
 ) -> None:
     mocker.patch(
         "cyberfusion.DatabaseSupport.queries.Query.result",
-        new=mocker.PropertyMock(
-            return_value=[
-                (8192,),
-                (8192,),
-                (0,),
-                (8192,),
-                (8192,),
-                (16384,),
-                (8192,),
-                (8192,),
-                (180224,),
-                (16384,),
-                (16384,),
-                (16384,),
-                (8192,),
-                (16384,),
-                (1531904,),
-                (8192,),
-                (16384,),
-                (16384,),
-                (8192,),
-                (None,),
-                (16384,),
-                (8192,),
-                (16384,),
-                (16384,),
-                (8192,),
-                (8192,),
-                (8192,),
-                (0,),
-                (8192,),
-                (16384,),
-                (8192,),
-            ]
-        ),
+        new=mocker.PropertyMock(return_value=[(None,)]),
     )
 
-    assert mariadb_database_created_1.size >= 0
+    assert mariadb_database_created_1.size == 0
 
 
 @pytest.mark.mariadb
@@ -317,6 +293,19 @@ def test_mariadb_database_size(
     assert mariadb_database_created_1.size >= 0
 
 
+@pytest.mark.mariadb
+def test_mariadb_database_size_single_query(
+    mocker: MockerFixture,
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    assert mariadb_database_created_1.size > 0
+
+    assert spy.call_count == 1
+
+
 @pytest.mark.mariadb
 def test_mariadb_database_export_file_name(
     mariadb_database_created_1: Generator[Database, None, None],
@@ -496,19 +485,91 @@ def test_postgresql_database_size(
 
 
 @pytest.mark.postgresql
-def test_postgresql_database_export_not_supported(
+def test_postgresql_database_size_estimate(
+    mocker: MockerFixture,
     postgresql_database_created_1: Generator[Database, None, None],
-    dump_directory: Generator[str, None, None],
 ) -> None:
-    with pytest.raises(ServerNotSupportedError):
-        postgresql_database_created_1.export(root_directory=dump_directory)
+    postgresql_database_created_1.support.size_estimates_cache.invalidate()
+
+    spy = mocker.spy(Query, "_execute")
+
+    size = postgresql_database_created_1.get_size(estimate=True)
+
+    assert size > 0
+
+    assert postgresql_database_created_1.get_size(estimate=True) == size  # Cached
+
+    assert spy.call_count == 1
 
 
 @pytest.mark.postgresql
-def test_postgresql_database_load_not_supported(
+def test_postgresql_database_size_not_estimate(
     postgresql_database_created_1: Generator[Database, None, None],
 ) -> None:
-    with pytest.raises(ServerNotSupportedError):
+    assert (
+        postgresql_database_created_1.get_size() == postgresql_database_created_1.size
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_size_estimate(
+    mariadb_database_created_1: Generator[Database, None, None],
+) -> None:
+    assert (
+        mariadb_database_created_1.get_size(estimate=True)
+        == mariadb_database_created_1.size
+    )
+
+
+@pytest.mark.postgresql
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_postgresql_database_export(
+    postgresql_database_created_1: Database,
+    dump_directory: str,
+    compression: Optional[str],
+) -> None:
+    _dump_directory, hash_ = postgresql_database_created_1.export(
+        root_directory=dump_directory, compression=compression, workers=2
+    )
+
+    assert _dump_directory.startswith(
+        os.path.join(dump_directory, postgresql_database_created_1.name)
+    )
+    assert os.path.isfile(os.path.join(_dump_directory, "toc.dat"))
+
+    assert hash_ == Database._get_directory_hash(_dump_directory, hash_algorithm="md5")
+
+
+@pytest.mark.postgresql
+def test_postgresql_database_load(
+    postgresql_database_created_1: Database,
+    postgresql_database_created_2: Database,
+    dump_directory: str,
+) -> None:
+    Query(
+        engine=postgresql_database_created_1.database_engine,
+        query=text(
+            "CREATE TABLE example (id INTEGER PRIMARY KEY, name TEXT); INSERT INTO example VALUES (1, 'a'), (2, 'b');"
+        ),
+    )
+
+    _dump_directory, _ = postgresql_database_created_1.export(
+        root_directory=dump_directory
+    )
+
+    postgresql_database_created_2.load(_dump_directory, workers=2)
+
+    assert Query(
+        engine=postgresql_database_created_2.database_engine,
+        query=text("SELECT id, name FROM example ORDER BY id;"),
+    ).result == [(1, "a"), (2, "b")]
+
+
+@pytest.mark.postgresql
+def test_postgresql_database_load_file(
+    postgresql_database_created_1: Database,
+) -> None:
+    with pytest.raises(InvalidInputError):
         with open("tests/dumps/deviating_tables_1.sql", "r") as f:
             postgresql_database_created_1.load(f)
 
@@ -564,6 +625,21 @@ def test_postgresql_tables(
     )
 
 
+@pytest.mark.mariadb
+def test_mariadb_tables_not_reflected(
+    mocker: MockerFixture,
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    spy = mocker.spy(MetaData, "reflect")
+
+    assert [table.name for table in mariadb_database_created_1.tables] == [
+        mariadb_table_created_1.name
+    ]
+
+    spy.assert_not_called()
+
+
 @pytest.mark.postgresql
 def test_postgresql_database_compare_not_supported(
     postgresql_database_created_1: Generator[Database, None, None],
@@ -598,3 +674,317 @@ def test_mariadb_database_compare(
     }
     assert present_in_only_left == ["table_only_in_1"]
     assert present_in_only_right == ["table_only_in_2"]
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_engine_shared(
+    mariadb_database_created_1: Generator[Database, None, None],
+) -> None:
+    database = Database(
+        support=mariadb_database_created_1.support,
+        name=mariadb_database_created_1.name,
+        server_software_name="MariaDB",
+    )
+
+    assert database.database_engine is mariadb_database_created_1.database_engine
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_compare_workers(
+    mocker: MockerFixture,
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_created_2: Generator[Database, None, None],
+) -> None:
+    with open("tests/dumps/deviating_tables_1.sql", "r") as f:
+        mariadb_database_created_1.load(f)
+
+    with open("tests/dumps/deviating_tables_2.sql", "r") as f:
+        mariadb_database_created_2.load(f)
+
+    spy = mocker.spy(Database, "get_table_checksums")
+
+    (
+        present_in_left_and_right,
+        present_in_only_left,
+        present_in_only_right,
+    ) = mariadb_database_created_1.compare(
+        right_database=mariadb_database_created_2, workers=2
+    )
+
+    assert present_in_left_and_right == {
+        "table_in_1_and_2_not_identical": False,
+        "table_in_1_and_2_identical": True,
+    }
+    assert present_in_only_left == ["table_only_in_1"]
+    assert present_in_only_right == ["table_only_in_2"]
+
+    assert spy.call_count == 4  # 2 batches per database
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_compare_checksum_none(
+    mocker: MockerFixture,
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_created_2: Generator[Database, None, None],
+) -> None:
+    with open("tests/dumps/deviating_tables_1.sql", "r") as f:
+        mariadb_database_created_1.load(f)
+
+    with open("tests/dumps/deviating_tables_2.sql", "r") as f:
+        mariadb_database_created_2.load(f)
+
+    # Tables were dropped after listing them
+
+    mocker.patch.object(
+        Database,
+        "get_table_checksums",
+        return_value={
+            "table_in_1_and_2_not_identical": None,
+            "table_in_1_and_2_identical": None,
+        },
+    )
+
+    (
+        present_in_left_and_right,
+        _present_in_only_left,
+        _present_in_only_right,
+    ) = mariadb_database_created_1.compare(right_database=mariadb_database_created_2)
+
+    assert present_in_left_and_right == {
+        "table_in_1_and_2_not_identical": False,
+        "table_in_1_and_2_identical": False,
+    }
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_compare_workers_invalid(
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_created_2: Generator[Database, None, None],
+) -> None:
+    with pytest.raises(InvalidInputError):
+        mariadb_database_created_1.compare(
+            right_database=mariadb_database_created_2, workers=0
+        )
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_get_table_checksums(
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    assert mariadb_database_created_1.get_table_checksums(
+        [mariadb_table_created_1.name]
+    ) == {mariadb_table_created_1.name: mariadb_table_created_1.checksum}
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_get_table_checksums_empty(
+    mariadb_database_created_1: Generator[Database, None, None],
+) -> None:
+    assert mariadb_database_created_1.get_table_checksums([]) == {}
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_compare_table_chunks(
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_created_2: Generator[Database, None, None],
+) -> None:
+    with open("tests/dumps/deviating_tables_1.sql", "r") as f:
+        mariadb_database_created_1.load(f)
+
+    with open("tests/dumps/deviating_tables_2.sql", "r") as f:
+        mariadb_database_created_2.load(f)
+
+    differing_chunks = mariadb_database_created_1.compare_table_chunks(
+        right_database=mariadb_database_created_2,
+        table_name="table_in_1_and_2_not_identical",
+        chunk_size=2,
+        workers=2,
+    )
+
+    assert [
+        (left_chunk.lower_boundary, left_chunk.upper_boundary)
+        for left_chunk, _ in differing_chunks
+    ] == [(None, 3), (3, 5), (5, None)]
+    assert [left_chunk.rows for left_chunk, _ in differing_chunks] == [2, 2, 1]
+    assert [right_chunk.rows for _, right_chunk in differing_chunks] == [1, 0, 0]
+
+    assert (
+        mariadb_database_created_1.compare_table_chunks(
+            right_database=mariadb_database_created_2,
+            table_name="table_in_1_and_2_identical",
+            chunk_size=2,
+        )
+        == []
+    )
+
+
+@pytest.mark.mariadb
+@pytest.mark.parametrize(
+    "compression,extension,decompression_command",
+    [
+        ("gzip", ".sql.gz", [Database.GZIP_BIN, "-d", "-c"]),
+        ("zstd", ".sql.zst", [Database.ZSTD_BIN, "-d", "-c"]),
+    ],
+)
+def test_mariadb_database_export_compressed(
+    mariadb_database_created_1: Database,
+    dump_directory: str,
+    compression: str,
+    extension: str,
+    decompression_command: List[str],
+) -> None:
+    _dump_file, md5_hash = mariadb_database_created_1.export(
+        root_directory=dump_directory,
+        compression=compression,
+        compression_threads=2,
+    )
+
+    assert _dump_file.endswith(extension)
+    assert md5_hash == get_md5_hash(_dump_file)
+
+    assert (
+        "Dump completed on"
+        in subprocess.run(
+            decompression_command + [_dump_file],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_export_hash_algorithm(
+    mariadb_database_created_1: Database,
+    dump_directory: str,
+) -> None:
+    _dump_file, hash_ = mariadb_database_created_1.export(
+        root_directory=dump_directory, hash_algorithm="sha256"
+    )
+
+    with open(_dump_file, "rb") as f:
+        assert hash_ == base64.b64encode(hashlib.sha256(f.read()).digest()).decode()
+
+
+@pytest.mark.mariadb
+@pytest.mark.parametrize("chunk_size", [ParallelExporter.CHUNK_SIZE_DEFAULT, 2])
+def test_mariadb_database_export_parallel_and_load_parallel(
+    mariadb_database_created_1: Database,
+    mariadb_database_created_2: Database,
+    mariadb_table_created_1: Table,
+    dump_directory: str,
+    chunk_size: int,
+) -> None:
+    Query(
+        engine=mariadb_database_created_1.server_engine,
+        query=text(
+            f"INSERT INTO {mariadb_table_created_1._quoted_table_name_with_schema_name} (user_id, user_name, email_address, nickname) VALUES (1, 'a', NULL, 'it''s'), (2, 'b', 'b@example.com', 'line\\nbreak'), (3, 'c', NULL, 'c'), (4, 'd', NULL, 'd'), (5, 'e', NULL, 'e');"
+        ),
+    )
+
+    # Table statistics are estimates, so analyze to make chunking deterministic
+
+    Query(
+        engine=mariadb_database_created_1.server_engine,
+        query=text(
+            f"ANALYZE TABLE {mariadb_table_created_1._quoted_table_name_with_schema_name};"
+        ),
+    )
+
+    directory, manifest = mariadb_database_created_1.export_parallel(
+        root_directory=dump_directory, workers=2, chunk_size=chunk_size
+    )
+
+    assert directory.startswith(
+        os.path.join(dump_directory, mariadb_database_created_1.name)
+    )
+    assert os.path.isfile(os.path.join(directory, ParallelExporter.NAME_FILE_MANIFEST))
+
+    assert [file.table_name for file in manifest.schema_files] == [
+        mariadb_table_created_1.name
+    ]
+    assert sum(file.rows for file in manifest.data_files) == 5
+
+    if chunk_size == 2:
+        assert len(manifest.data_files) == 3
+
+    mariadb_database_created_2.load_parallel(directory, workers=2)
+
+    assert mariadb_database_created_1.compare(
+        right_database=mariadb_database_created_2
+    ) == ({mariadb_table_created_1.name: True}, [], [])
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_export_native(
+    mariadb_database_created_1: Database,
+    mariadb_database_created_2: Database,
+    mariadb_table_created_1: Table,
+    mariadb_table_created_2: Table,
+    dump_directory: str,
+) -> None:
+    Query(
+        engine=mariadb_database_created_1.server_engine,
+        query=text(
+            f"INSERT INTO {mariadb_table_created_1._quoted_table_name_with_schema_name} (user_id, user_name, email_address, nickname) VALUES (0, 'a', NULL, 'it''s'), (1, 'b', 'b@example.com', 'line\\nbreak'), (2, 'c', NULL, 'c');"
+        ),
+    )
+
+    _dump_file, md5_hash = mariadb_database_created_1.export(
+        root_directory=dump_directory,
+        engine=Database.EXPORT_ENGINE_NATIVE,
+        exclude_tables=[mariadb_table_created_2],
+        packet_size=1,
+    )
+
+    assert md5_hash == get_md5_hash(_dump_file)
+
+    with open(_dump_file, "r") as f:
+        contents = f.read()
+
+    assert "Dump completed on" in contents
+    assert f"CREATE TABLE `{mariadb_table_created_2.name}`" not in contents
+
+    with open(_dump_file, "r") as f:
+        mariadb_database_created_2.load(f)
+
+    assert mariadb_database_created_1.compare(
+        right_database=mariadb_database_created_2
+    ) == (
+        {mariadb_table_created_1.name: True},
+        [mariadb_table_created_2.name],
+        [],
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_export_parallel_table_name_slash(
+    mariadb_database_created_1: Database,
+    mariadb_database_created_2: Database,
+    dump_directory: str,
+) -> None:
+    Query(
+        engine=mariadb_database_created_1.database_engine,
+        query=text("CREATE TABLE `../a/b` (id INT PRIMARY KEY);"),
+    )
+    Query(
+        engine=mariadb_database_created_1.database_engine,
+        query=text("INSERT INTO `../a/b` VALUES (1), (2);"),
+    )
+
+    directory, manifest = mariadb_database_created_1.export_parallel(
+        root_directory=dump_directory
+    )
+
+    assert sorted(os.listdir(dump_directory)) == [os.path.basename(directory)]
+    assert [(file.table_name, file.file_name) for file in manifest.schema_files] == [
+        ("../a/b", "0.schema.sql")
+    ]
+
+    mariadb_database_created_2.load_parallel(directory)
+
+    assert Query(
+        engine=mariadb_database_created_2.database_engine,
+        query=text("SELECT id FROM `../a/b` ORDER BY id;"),
+    ).result == [(1,), (2,)]
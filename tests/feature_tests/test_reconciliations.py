@@ -0,0 +1,65 @@
+import pytest
+
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.reconciliations import (
+    DesiredDatabase,
+    DesiredDatabaseUser,
+    DesiredDatabaseUserGrant,
+    DesiredState,
+    Reconciler,
+)
+from cyberfusion.DatabaseSupport.servers import Server
+from cyberfusion.DatabaseSupport.utilities import generate_random_string
+
+
+@pytest.mark.mariadb
+def test_mariadb_reconciler_apply(mariadb_server: Server) -> None:
+    name = generate_random_string()
+
+    desired_state = DesiredState(
+        databases=[DesiredDatabase(name=name, server_software_name="MariaDB")],
+        database_users=[
+            DesiredDatabaseUser(
+                name=name,
+                server_software_name="MariaDB",
+                password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+                host="%",
+            )
+        ],
+        database_user_grants=[
+            DesiredDatabaseUserGrant(
+                database_name=name,
+                database_user_name=name,
+                database_user_host="%",
+                privilege_names=["SELECT", "INSERT"],
+            )
+        ],
+    )
+
+    database = Database(
+        support=mariadb_server.support, name=name, server_software_name="MariaDB"
+    )
+    database_user = DatabaseUser(
+        server=mariadb_server, name=name, server_software_name="MariaDB", host="%"
+    )
+
+    reconciler = Reconciler(server=mariadb_server, desired_state=desired_state)
+
+    try:
+        assert len(reconciler.apply()) == 3
+
+        assert database.exists
+        assert database_user.exists
+        assert DatabaseUserGrant(
+            database=database,
+            database_user=database_user,
+            privilege_names=["SELECT", "INSERT"],
+            table=None,
+        ).exists
+
+        assert reconciler.plan == []  # Idempotent
+    finally:
+        database_user.drop()
+        database.drop()
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import List
 
-import pytest
 import sqlalchemy as sa
+
+import pytest
 from pytest_mock import MockerFixture  # type: ignore[attr-defined]
 
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
 from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exceptions import (
+    PasswordMissingError,
+    ServerNotSupportedError,
+)
+from cyberfusion.DatabaseSupport.queries import Query
 from cyberfusion.DatabaseSupport.servers import Server
+from cyberfusion.DatabaseSupport.tables import Table
 from cyberfusion.DatabaseSupport.utilities import generate_random_string
 
 
@@ -86,6 +95,64 @@ def test_postgresql_databases(mocker: MockerFixture, postgresql_server: Server)
     )
 
 
+@pytest.mark.mariadb
+def test_mariadb_database_sizes(
+    mocker: MockerFixture,
+    mariadb_server: Server,
+    mariadb_database_created_1: Database,
+    mariadb_table_created_1: Table,
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    database_sizes = {
+        database.name: size for database, size in mariadb_server.database_sizes
+    }
+
+    assert spy.call_count == 1
+
+    assert database_sizes[mariadb_database_created_1.name] == (
+        mariadb_database_created_1.size
+    )
+
+    assert "mysql" not in database_sizes
+    assert "information_schema" not in database_sizes
+    assert "performance_schema" not in database_sizes
+    assert "sys" not in database_sizes
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_sizes_without_tables(
+    mariadb_server: Server,
+    mariadb_database_created_1: Database,
+) -> None:
+    database_sizes = {
+        database.name: size for database, size in mariadb_server.database_sizes
+    }
+
+    assert database_sizes[mariadb_database_created_1.name] == 0
+
+
+@pytest.mark.postgresql
+def test_postgresql_database_sizes(
+    mocker: MockerFixture,
+    postgresql_server: Server,
+    postgresql_database_created_1: Database,
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    database_sizes = {
+        database.name: size for database, size in postgresql_server.database_sizes
+    }
+
+    assert spy.call_count == 1
+
+    assert database_sizes[postgresql_database_created_1.name] > 0
+
+    assert "template0" not in database_sizes
+    assert "template1" not in database_sizes
+    assert "postgres" not in database_sizes
+
+
 # Database users
 
 
@@ -163,35 +230,16 @@ def test_postgresql_database_users(
 
     PASSWORD = "md549bdc475e7a78ec43cae5ee9e0c1ccf9"
 
-    class Query:
-        """Abstract representation of database query."""
-
-        def __init__(self, *, engine: sa.engine.base.Engine, query: str) -> None:
-            """Set attributes and call functions to handle query."""
-            self.engine = engine
-            self.query = query
-
-        @property
-        def result(self) -> Any:
-            """Set result."""
-            if str(self.query).startswith("SELECT rolname"):
-                return [
-                    (NAME_1,),
-                    (NAME_2,),
-                    ("root",),
-                    ("admin",),
-                    ("postgres",),
-                    ("pg_test",),
-                ]
-
-            elif str(self.query).startswith("SELECT rolpassword"):
-                return [(PASSWORD,)]
-
-            return mocker.DEFAULT
-
     mocker.patch(
-        "cyberfusion.DatabaseSupport.servers.Query", new=Query
-    )  # Can't patch individual property, see: https://github.com/python/cpython/issues/100291
+        "cyberfusion.DatabaseSupport.queries.Query.result",
+        new=mocker.PropertyMock(
+            return_value=[
+                (NAME_1, PASSWORD),
+                (NAME_2, PASSWORD),
+                ("root", PASSWORD),
+            ]
+        ),
+    )
 
     assert len(postgresql_server.database_users) == 3
 
@@ -210,22 +258,44 @@ def test_postgresql_database_users(
     assert postgresql_server.database_users[2].password == PASSWORD
     assert postgresql_server.database_users[2].host is None
 
-    assert not any(
-        database.name == "admin" for database in postgresql_server.database_users
-    )
-    assert not any(
-        database.name == "postgres" for database in postgresql_server.database_users
+
+@pytest.mark.postgresql
+def test_postgresql_database_users_system_users_excluded(
+    postgresql_server: Server,
+    postgresql_database_user_created: DatabaseUser,
+) -> None:
+    database_users = postgresql_server.database_users
+
+    assert any(
+        database_user.name == postgresql_database_user_created.name
+        and database_user.password is not None
+        for database_user in database_users
     )
+
+    assert not any(database_user.name == "postgres" for database_user in database_users)
     assert not any(
-        database.name == "pg_" for database in postgresql_server.database_users
+        database_user.name.startswith("pg_") for database_user in database_users
     )
 
 
+@pytest.mark.postgresql
+def test_postgresql_database_users_single_query(
+    mocker: MockerFixture,
+    postgresql_server: Server,
+    postgresql_database_user_created: DatabaseUser,
+) -> None:
+    spy_execute = mocker.spy(Query, "_execute")
+
+    postgresql_server.database_users
+
+    assert spy_execute.call_count == 1
+
+
 # Database user grants
 
 
 @pytest.mark.mariadb
-def test_mariadb_database_user_grants(
+def test_mariadb_database_user_grants_show_grants(
     mocker: MockerFixture, mariadb_server: Server
 ) -> None:
     DATABASE_USER_NAME = "testuser1"
@@ -269,32 +339,154 @@ def test_mariadb_database_user_grants(
         ),
     )
 
-    assert len(mariadb_server.database_user_grants) == 3
+    database_user_grants = mariadb_server._mariadb_database_user_grants_show_grants
 
-    assert mariadb_server.database_user_grants[0].database.name == "*"
-    assert (
-        mariadb_server.database_user_grants[0].database_user.name == DATABASE_USER_NAME
-    )
-    assert mariadb_server.database_user_grants[0].privilege_names == ["USAGE"]
-    assert mariadb_server.database_user_grants[0].table_name == "*"
+    assert len(database_user_grants) == 3
 
-    assert mariadb_server.database_user_grants[1].database.name == DATABASE_NAME
-    assert (
-        mariadb_server.database_user_grants[1].database_user.name == DATABASE_USER_NAME
-    )
-    assert mariadb_server.database_user_grants[1].privilege_names == [
+    assert database_user_grants[0].database.name == "*"
+    assert database_user_grants[0].database_user.name == DATABASE_USER_NAME
+    assert database_user_grants[0].privilege_names == ["USAGE"]
+    assert database_user_grants[0].table_name == "*"
+
+    assert database_user_grants[1].database.name == DATABASE_NAME
+    assert database_user_grants[1].database_user.name == DATABASE_USER_NAME
+    assert database_user_grants[1].privilege_names == [
         "SELECT",
         "EXECUTE",
         "SHOW VIEW",
     ]
-    assert mariadb_server.database_user_grants[1].table_name == "*"
+    assert database_user_grants[1].table_name == "*"
+
+    assert database_user_grants[2].database.name == DATABASE_NAME
+    assert database_user_grants[2].database_user.name == DATABASE_USER_NAME
+    assert database_user_grants[2].privilege_names == ["ALL"]
+    assert database_user_grants[2].table_name == TABLE_NAME
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_user_grants_catalog(
+    mariadb_server: Server,
+    mariadb_database_created_1: Database,
+    mariadb_database_user_created: DatabaseUser,
+    mariadb_table_created_1: Table,
+) -> None:
+    for privilege_names, table in [
+        (["SELECT", "EXECUTE", "SHOW VIEW"], None),
+        (["SELECT", "INSERT"], mariadb_table_created_1),
+    ]:
+        DatabaseUserGrant(
+            database=mariadb_database_created_1,
+            database_user=mariadb_database_user_created,
+            privilege_names=privilege_names,
+            table=table,
+        ).grant()
+
+    def _get_grants(database_user_grants: List[DatabaseUserGrant]) -> list:
+        return sorted(
+            (
+                database_user_grant.database_user.name,
+                database_user_grant.database_user.host,
+                database_user_grant.database_name,
+                database_user_grant.table_name,
+                database_user_grant.privilege_names,
+            )
+            for database_user_grant in database_user_grants
+        )
+
+    grants_catalog = _get_grants(mariadb_server._mariadb_database_user_grants_catalog)
+
+    assert grants_catalog == _get_grants(
+        mariadb_server._mariadb_database_user_grants_show_grants
+    )
 
-    assert mariadb_server.database_user_grants[2].database.name == DATABASE_NAME
     assert (
-        mariadb_server.database_user_grants[2].database_user.name == DATABASE_USER_NAME
+        mariadb_database_user_created.name,
+        "%",
+        mariadb_database_created_1.name,
+        "*",
+        ["SELECT", "EXECUTE", "SHOW VIEW"],
+    ) in grants_catalog
+    assert (
+        mariadb_database_user_created.name,
+        "%",
+        mariadb_database_created_1.name,
+        mariadb_table_created_1.name,
+        ["SELECT", "INSERT"],
+    ) in grants_catalog
+    assert (
+        mariadb_database_user_created.name,
+        "%",
+        "*",
+        "*",
+        ["USAGE"],
+    ) in grants_catalog
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_user_grants_catalog_all_privileges(
+    mariadb_server: Server,
+    mariadb_database_user_grant_created: DatabaseUserGrant,
+) -> None:
+    assert any(
+        database_user_grant.database_user.name
+        == mariadb_database_user_grant_created.database_user.name
+        and database_user_grant.database_name
+        == mariadb_database_user_grant_created.database_name
+        and database_user_grant.privilege_names == ["ALL"]
+        for database_user_grant in mariadb_server._mariadb_database_user_grants_catalog
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_database_user_grants_fallback(
+    mocker: MockerFixture, mariadb_server: Server
+) -> None:
+    mocker.patch(
+        "cyberfusion.DatabaseSupport.servers.Server._mariadb_database_user_grants_catalog",
+        new=mocker.PropertyMock(
+            side_effect=sa.exc.OperationalError("SELECT", {}, Exception())
+        ),
+    )
+    show_grants_mock = mocker.patch(
+        "cyberfusion.DatabaseSupport.servers.Server._mariadb_database_user_grants_show_grants",
+        new=mocker.PropertyMock(return_value=[]),
     )
-    assert mariadb_server.database_user_grants[2].privilege_names == ["ALL"]
-    assert mariadb_server.database_user_grants[2].table_name == TABLE_NAME
+
+    assert mariadb_server.database_user_grants == []
+
+    show_grants_mock.assert_called_once_with()
+
+
+@pytest.mark.mariadb
+def test_mariadb_privilege_names(mariadb_server: Server) -> None:
+    assert mariadb_server._get_mariadb_table_privilege_names("Insert,Select,Grant") == [
+        "SELECT",
+        "INSERT",
+    ]
+    assert mariadb_server._get_mariadb_table_privilege_names("Grant") == ["USAGE"]
+    assert mariadb_server._get_mariadb_table_privilege_names(
+        set(mariadb_server.MYSQL_NAMES_PRIVILEGES_TABLE)
+    ) == ["ALL"]
+
+    assert mariadb_server._get_mariadb_database_privilege_names(
+        {
+            "Host": "%",
+            "Db": "test",
+            "User": "test",
+            "Select_priv": "Y",
+            "Execute_priv": "Y",
+            "Show_view_priv": "N",
+        }
+    ) == ["SELECT", "EXECUTE"]
+    assert mariadb_server._get_mariadb_database_privilege_names(
+        {"Select_priv": "Y", "Grant_priv": "Y", "Execute_priv": "Y"}
+    ) == ["ALL"]
+
+
+@pytest.mark.mariadb
+def test_mariadb_privilege_names_unknown(mariadb_server: Server) -> None:
+    with pytest.raises(ServerNotSupportedError):
+        mariadb_server._get_mariadb_database_privilege_names({"Foobar_priv": "Y"})
 
 
 @pytest.mark.postgresql
@@ -302,3 +494,373 @@ def test_postgresql_database_user_grants(
     postgresql_server: Server,
 ) -> None:
     assert not postgresql_server.database_user_grants  # Not supported
+
+
+@pytest.mark.mariadb
+def test_mariadb_catalog_cache_hit(
+    mocker: MockerFixture, mariadb_server_catalog_cached: Server
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    database_users = mariadb_server_catalog_cached.database_users
+
+    assert [
+        database_user.name
+        for database_user in mariadb_server_catalog_cached.database_users
+    ] == [database_user.name for database_user in database_users]
+
+    assert spy.call_count == 1
+
+    assert mariadb_server_catalog_cached.support.catalog_cache.hits == 1
+    assert mariadb_server_catalog_cached.support.catalog_cache.misses == 1
+
+
+@pytest.mark.mariadb
+def test_mariadb_catalog_cache_invalidated_by_database_create(
+    mariadb_server_catalog_cached: Server,
+) -> None:
+    database = Database(
+        support=mariadb_server_catalog_cached.support,
+        name=generate_random_string(),
+        server_software_name="MariaDB",
+    )
+
+    assert not any(
+        database_.name == database.name
+        for database_ in mariadb_server_catalog_cached.databases
+    )
+
+    database.create()
+
+    try:
+        assert any(
+            database_.name == database.name
+            for database_ in mariadb_server_catalog_cached.databases
+        )
+    finally:
+        database.drop()
+
+    assert not any(
+        database_.name == database.name
+        for database_ in mariadb_server_catalog_cached.databases
+    )
+
+
+@pytest.mark.mariadb
+def test_mariadb_catalog_cache_invalidated_by_database_user_create(
+    mariadb_server_catalog_cached: Server,
+) -> None:
+    database_user = DatabaseUser(
+        server=mariadb_server_catalog_cached,
+        name=generate_random_string(),
+        server_software_name="MariaDB",
+        password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+        host="%",
+    )
+
+    assert not any(
+        database_user_.name == database_user.name
+        for database_user_ in mariadb_server_catalog_cached.database_users
+    )
+
+    database_user.create()
+
+    try:
+        assert any(
+            database_user_.name == database_user.name
+            for database_user_ in mariadb_server_catalog_cached.database_users
+        )
+    finally:
+        database_user.drop()
+
+
+@pytest.mark.mariadb
+def test_mariadb_catalog_cache_invalidated_by_grant(
+    mariadb_server_catalog_cached: Server,
+    mariadb_database_created_1: Database,
+) -> None:
+    database_user = DatabaseUser(
+        server=mariadb_server_catalog_cached,
+        name=generate_random_string(),
+        server_software_name="MariaDB",
+        password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+        host="%",
+    )
+    database_user.create()
+
+    database_user_grant = DatabaseUserGrant(
+        database=mariadb_database_created_1,
+        database_user=database_user,
+        privilege_names=["SELECT"],
+        table=None,
+    )
+
+    try:
+        assert not any(
+            database_user_grant._matches(database_user_grant_)
+            for database_user_grant_ in mariadb_server_catalog_cached.database_user_grants
+        )
+
+        database_user_grant.grant()
+
+        assert any(
+            database_user_grant._matches(database_user_grant_)
+            for database_user_grant_ in mariadb_server_catalog_cached.database_user_grants
+        )
+    finally:
+        database_user.drop()
+
+
+@pytest.mark.mariadb
+def test_mariadb_create_database_users(
+    mariadb_server: Server,
+    mariadb_database_user_created: DatabaseUser,
+) -> None:
+    database_users = [
+        DatabaseUser(
+            server=mariadb_server,
+            name=generate_random_string(),
+            server_software_name="MariaDB",
+            password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+            host="%",
+        )
+        for _ in range(3)
+    ]
+
+    engine = mariadb_server.support.engines.engines["mysql"]
+
+    connections: List[object] = []
+
+    def _count(*args: object) -> None:
+        connections.append(args)
+
+    sa.event.listen(engine, "connect", _count)
+
+    try:
+        (
+            created_database_users,
+            existing_database_users,
+        ) = mariadb_server.create_database_users(
+            database_users + [mariadb_database_user_created]
+        )
+    finally:
+        sa.event.remove(engine, "connect", _count)
+
+        for database_user in database_users:
+            database_user.drop()
+
+    assert created_database_users == database_users
+    assert existing_database_users == [mariadb_database_user_created]
+
+    assert len(connections) == 1
+
+
+@pytest.mark.mariadb
+def test_mariadb_create_database_users_and_set_passwords_duplicate(
+    mariadb_server: Server,
+) -> None:
+    name = generate_random_string()
+
+    database_users = [
+        DatabaseUser(
+            server=mariadb_server,
+            name=name,
+            server_software_name="MariaDB",
+            password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+            host="%",
+        )
+        for _ in range(2)
+    ]
+
+    try:
+        (
+            created_database_users,
+            existing_database_users,
+        ) = mariadb_server.create_database_users(database_users)
+
+        assert created_database_users == [database_users[0]]
+        assert existing_database_users == [database_users[1]]
+
+        for database_user in database_users:
+            database_user.password = "*2470C0C06DEE42FD1618BB99005ADCA2EC9D1E19"
+
+        (
+            changed_database_users,
+            unchanged_database_users,
+        ) = mariadb_server.set_passwords(database_users)
+
+        assert changed_database_users == [database_users[0]]
+        assert unchanged_database_users == [database_users[1]]
+    finally:
+        database_users[0].drop()
+
+
+@pytest.mark.mariadb
+def test_mariadb_create_database_users_password_missing(
+    mariadb_server: Server,
+) -> None:
+    with pytest.raises(PasswordMissingError):
+        mariadb_server.create_database_users(
+            [
+                DatabaseUser(
+                    server=mariadb_server,
+                    name=generate_random_string(),
+                    server_software_name="MariaDB",
+                    host="%",
+                )
+            ]
+        )
+
+
+@pytest.mark.mariadb
+def test_mariadb_set_passwords(
+    mariadb_server: Server,
+    mariadb_database_user_created: DatabaseUser,
+) -> None:
+    unchanged_database_user = DatabaseUser(
+        server=mariadb_server,
+        name=mariadb_database_user_created.name,
+        server_software_name="MariaDB",
+        password=mariadb_database_user_created.password,
+        host=mariadb_database_user_created.host,
+    )
+    not_existing_database_user = DatabaseUser(
+        server=mariadb_server,
+        name=generate_random_string(),
+        server_software_name="MariaDB",
+        password="*AC57754462B6D4C373263062D60EDC6E452E574D",
+        host="%",
+    )
+
+    (
+        changed_database_users,
+        unchanged_database_users,
+    ) = mariadb_server.set_passwords(
+        [unchanged_database_user, not_existing_database_user]
+    )
+
+    assert changed_database_users == []
+    assert unchanged_database_users == [
+        unchanged_database_user,
+        not_existing_database_user,
+    ]
+
+    mariadb_database_user_created.password = "*2470C0C06DEE42FD1618BB99005ADCA2EC9D1E19"
+
+    (
+        changed_database_users,
+        unchanged_database_users,
+    ) = mariadb_server.set_passwords([mariadb_database_user_created])
+
+    assert changed_database_users == [mariadb_database_user_created]
+    assert unchanged_database_users == []
+
+    assert (
+        mariadb_database_user_created._get_password()
+        == "*2470C0C06DEE42FD1618BB99005ADCA2EC9D1E19"
+    )
+
+
+@pytest.mark.postgresql
+def test_postgresql_create_database_users_and_set_passwords(
+    postgresql_server: Server,
+) -> None:
+    database_users = [
+        DatabaseUser(
+            server=postgresql_server,
+            name=generate_random_string().lower(),
+            server_software_name="PostgreSQL",
+            password="md5436765032c9c4df46ab3ac512f98cb9e",
+        )
+        for _ in range(2)
+    ]
+
+    try:
+        created_database_users, _ = postgresql_server.create_database_users(
+            database_users
+        )
+
+        assert created_database_users == database_users
+
+        _, existing_database_users = postgresql_server.create_database_users(
+            database_users
+        )
+
+        assert existing_database_users == database_users
+
+        database_users[0].password = "md5b5a4e4b8a1d4a1dfe6ce6c3e0d2a7e0c"
+
+        changed_database_users, _ = postgresql_server.set_passwords(database_users)
+
+        assert changed_database_users == [database_users[0]]
+    finally:
+        for database_user in database_users:
+            database_user.drop()
+
+
+@pytest.mark.mariadb
+def test_mariadb_grant_many_and_revoke_many(
+    mocker: MockerFixture,
+    mariadb_server: Server,
+    mariadb_database_user_created: DatabaseUser,
+    mariadb_database_created_1: Database,
+    mariadb_database_created_2: Database,
+) -> None:
+    database_user_grants = [
+        DatabaseUserGrant(
+            database=database,
+            database_user=mariadb_database_user_created,
+            privilege_names=["SELECT"],
+            table=None,
+        )
+        for database in [mariadb_database_created_1, mariadb_database_created_2]
+    ]
+
+    database_user_grants[0].grant()
+
+    spy_exists = mocker.spy(DatabaseUserGrant, "exists")
+
+    engine = mariadb_server.support.engines.engines["mysql"]
+
+    connections: List[object] = []
+
+    def _count(*args: object) -> None:
+        connections.append(args)
+
+    sa.event.listen(engine, "connect", _count)
+
+    try:
+        granted_database_user_grants, existing_database_user_grants = (
+            mariadb_server.grant_many(database_user_grants)
+        )
+    finally:
+        sa.event.remove(engine, "connect", _count)
+
+    assert granted_database_user_grants == [database_user_grants[1]]
+    assert existing_database_user_grants == [database_user_grants[0]]
+
+    assert len(connections) == 1
+
+    spy_exists.assert_not_called()
+
+    assert all(
+        database_user_grant.exists for database_user_grant in database_user_grants
+    )
+
+    revoked_database_user_grants, not_existing_database_user_grants = (
+        mariadb_server.revoke_many(database_user_grants[:1])
+    )
+
+    assert revoked_database_user_grants == [database_user_grants[0]]
+    assert not_existing_database_user_grants == []
+
+    revoked_database_user_grants, not_existing_database_user_grants = (
+        mariadb_server.revoke_many(database_user_grants)
+    )
+
+    assert revoked_database_user_grants == [database_user_grants[1]]
+    assert not_existing_database_user_grants == [database_user_grants[0]]
+
+    assert not any(
+        database_user_grant.exists for database_user_grant in database_user_grants
+    )
@@ -0,0 +1,163 @@
+from typing import Generator, List
+
+import pytest
+from sqlalchemy import event, text
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.sessions import get_current_session
+from cyberfusion.DatabaseSupport.tables import Table
+from cyberfusion.DatabaseSupport.utilities import generate_random_string
+
+
+def _create_objects(
+    database_user: DatabaseUser, database_user_grant: DatabaseUserGrant
+) -> None:
+    assert database_user.create()
+    assert database_user_grant.grant()
+
+
+@pytest.mark.mariadb
+def test_mariadb_session_round_trips(
+    mariadb_support: DatabaseSupport,
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_user: Generator[DatabaseUser, None, None],
+) -> None:
+    database_user_grant = DatabaseUserGrant(
+        database=mariadb_database_created_1,
+        database_user=mariadb_database_user,
+        privilege_names=["ALL"],
+        table=None,
+    )
+
+    engine = mariadb_support.engines.engines["mysql"]
+
+    connections: List[object] = []
+
+    def _count(*args: object) -> None:
+        connections.append(args)
+
+    event.listen(engine, "connect", _count)
+
+    try:
+        # Without session
+
+        _create_objects(mariadb_database_user, database_user_grant)
+
+        connections_without_session = len(connections)
+
+        mariadb_database_user.drop()
+
+        # With session
+
+        connections.clear()
+
+        with mariadb_support.session():
+            _create_objects(mariadb_database_user, database_user_grant)
+
+        connections_with_session = len(connections)
+    finally:
+        event.remove(engine, "connect", _count)
+
+    assert connections_with_session == 1
+    assert connections_without_session > connections_with_session
+
+    assert mariadb_database_user.exists
+    assert database_user_grant.exists
+
+
+@pytest.mark.postgresql
+def test_postgresql_session_round_trips(
+    postgresql_support: DatabaseSupport,
+    postgresql_database_user: Generator[DatabaseUser, None, None],
+) -> None:
+    engine = postgresql_support.engines.engines["postgresql"]
+
+    connections: List[object] = []
+
+    def _count(*args: object) -> None:
+        connections.append(args)
+
+    event.listen(engine, "connect", _count)
+
+    try:
+        with postgresql_support.session():
+            assert postgresql_database_user.create()
+
+            postgresql_database_user.password = "md5f5b6c3bd3e4f5cd1cd0f1a5dbb1ee5f1"
+
+            assert postgresql_database_user.edit()
+    finally:
+        event.remove(engine, "connect", _count)
+
+    assert len(connections) == 1
+
+    assert postgresql_database_user.exists
+
+
+@pytest.mark.postgresql
+def test_postgresql_session_rollback(
+    postgresql_support: DatabaseSupport,
+    postgresql_database_user: Generator[DatabaseUser, None, None],
+) -> None:
+    with pytest.raises(RuntimeError):
+        with postgresql_support.session():
+            postgresql_database_user.create()
+
+            raise RuntimeError
+
+    assert not postgresql_database_user.exists
+
+
+@pytest.mark.postgresql
+def test_postgresql_session_uncommitted_create_visibility(
+    postgresql_support: DatabaseSupport,
+    postgresql_database_created_1: Database,
+    postgresql_schema_created: str,
+) -> None:
+    table = Table(database=postgresql_database_created_1, name=generate_random_string())
+
+    with postgresql_support.session():
+        Query(
+            engine=postgresql_database_created_1.database_engine,
+            query=text(
+                f'CREATE TABLE "{postgresql_schema_created}"."{table.name}" (id int);'
+            ),
+        )
+
+        # Query uses the session, so the uncommitted table is seen
+
+        assert table.exists
+
+        # Inspectors use their own connection, so the uncommitted table is not seen
+
+        assert table.name not in [
+            _table.name for _table in postgresql_database_created_1.tables
+        ]
+
+    assert table.name in [
+        _table.name for _table in postgresql_database_created_1.tables
+    ]
+
+    table.drop()
+
+
+@pytest.mark.mariadb
+def test_session_nested(mariadb_support: DatabaseSupport) -> None:
+    assert get_current_session() is None
+
+    with mariadb_support.session() as session:
+        with mariadb_support.session() as nested_session:
+            assert nested_session is session
+
+            assert Query(
+                engine=mariadb_support.engines.engines["mysql"],
+                query=text("SELECT 1;"),
+            ).result == [(1,)]
+
+        assert get_current_session() is session
+
+    assert get_current_session() is None
@@ -1,15 +1,21 @@
 from typing import Generator
 
 import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import MetaData
 from sqlalchemy import Table as SQLAlchemyTable
+from sqlalchemy.exc import DatabaseError
 from sqlalchemy.schema import Index
+from sqlalchemy.sql import text
 
 from cyberfusion.DatabaseSupport.databases import Database
 from cyberfusion.DatabaseSupport.exceptions import (
     IndexExistsError,
     InvalidInputError,
+    PrimaryKeyNotSupportedError,
     ServerNotSupportedError,
 )
+from cyberfusion.DatabaseSupport.queries import Query
 from cyberfusion.DatabaseSupport.tables import Table
 from cyberfusion.DatabaseSupport.utilities import generate_random_string
 
@@ -56,6 +62,18 @@ def test_mariadb_table_exists(
     assert mariadb_table_created_1.exists
 
 
+@pytest.mark.mariadb
+def test_mariadb_table_exists_single_query(
+    mocker: MockerFixture,
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    spy = mocker.spy(Query, "_execute")
+
+    assert mariadb_table_created_1.exists
+
+    assert spy.call_count == 1
+
+
 @pytest.mark.postgresql
 def test_postgresql_table_not_exists(
     postgresql_database_created_1: Generator[Database, None, None],
@@ -146,6 +164,209 @@ def test_postgresql_table_checksum_not_supported(
         postgresql_table_created_1.checksum
 
 
+@pytest.mark.mariadb
+def test_mariadb_table_get_chunked_checksum(
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    engine = mariadb_table_created_1.database.database_engine
+
+    with engine.begin() as connection:
+        connection.execute(
+            mariadb_table_created_1.reflection.insert(),
+            [
+                {
+                    "user_id": user_id,
+                    "user_name": "user",
+                    "email_address": None,
+                    "nickname": "nickname",
+                }
+                for user_id in range(1, 6)
+            ],
+        )
+
+    assert mariadb_table_created_1.get_chunk_boundaries(chunk_size=2) == [1, 3, 5]
+
+    chunks = mariadb_table_created_1.get_chunked_checksum(chunk_size=2, workers=2)
+
+    assert [(chunk.lower_boundary, chunk.upper_boundary) for chunk in chunks] == [
+        (None, 3),
+        (3, 5),
+        (5, None),
+    ]
+    assert [chunk.rows for chunk in chunks] == [2, 2, 1]
+    assert all(chunk.checksum for chunk in chunks)
+
+    assert chunks == mariadb_table_created_1.get_chunked_checksum(chunk_size=2)
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_get_chunk_checksums_workers_reflection_not_cached(
+    mocker: MockerFixture,
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    mariadb_table_created_1.database.clear_table_reflection(
+        mariadb_table_created_1.name
+    )
+
+    spy_reflect = mocker.spy(MetaData, "reflect")
+
+    chunks = mariadb_table_created_1.get_chunk_checksums(
+        boundaries=[1, 3, 5, 7, 9], workers=5
+    )
+
+    assert len(chunks) == 5
+    assert all(chunk.rows == 0 for chunk in chunks)
+
+    spy_reflect.assert_called_once()
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_get_chunked_checksum_empty(
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    chunks = mariadb_table_created_1.get_chunked_checksum(chunk_size=2)
+
+    assert len(chunks) == 1
+
+    assert chunks[0].lower_boundary is None
+    assert chunks[0].upper_boundary is None
+    assert chunks[0].rows == 0
+    assert chunks[0].checksum == 0
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_get_chunk_boundaries_invalid_chunk_size(
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    with pytest.raises(InvalidInputError):
+        mariadb_table_created_1.get_chunk_boundaries(chunk_size=0)
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_get_chunk_boundaries_primary_key_not_supported(
+    mariadb_database_created_1: Generator[Database, None, None],
+) -> None:
+    name = generate_random_string()
+
+    Query(
+        engine=mariadb_database_created_1.database_engine,
+        query=text(
+            f"CREATE TABLE `{name}` (`a` int, `b` int, PRIMARY KEY (`a`, `b`));"
+        ),
+    )
+
+    with pytest.raises(PrimaryKeyNotSupportedError):
+        Table(database=mariadb_database_created_1, name=name).get_chunk_boundaries(
+            chunk_size=2
+        )
+
+
+@pytest.mark.postgresql
+def test_postgresql_table_get_chunked_checksum_not_supported(
+    postgresql_table_created_1: Generator[Table, None, None],
+) -> None:
+    with pytest.raises(ServerNotSupportedError):
+        postgresql_table_created_1.get_chunked_checksum(chunk_size=2)
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_diff(
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_created_2: Generator[Database, None, None],
+) -> None:
+    name = generate_random_string()
+
+    left_table = Table(database=mariadb_database_created_1, name=name)
+    right_table = Table(database=mariadb_database_created_2, name=name)
+
+    for table, rows in [
+        (left_table, "(1, 'a'), (2, 'b'), (3, 'c'), (5, 'e'), (6, NULL)"),
+        (right_table, "(1, 'a'), (2, 'x'), (4, 'd'), (5, 'e'), (6, NULL)"),
+    ]:
+        Query(
+            engine=table.database.database_engine,
+            query=text(
+                f"CREATE TABLE `{name}` (`id` int NOT NULL, `value` varchar(1), PRIMARY KEY (`id`));"
+            ),
+        )
+        Query(
+            engine=table.database.database_engine,
+            query=text(f"INSERT INTO `{name}` VALUES {rows};"),
+        )
+
+    differences = sorted(
+        left_table.diff(right_table=right_table, chunk_size=2, leaf_size=1),
+        key=lambda difference: difference.primary_key,
+    )
+
+    assert [
+        (difference.operation, difference.primary_key, difference.row)
+        for difference in differences
+    ] == [
+        (Table.DIFF_OPERATION_UPDATE, 2, {"id": 2, "value": "b"}),
+        (Table.DIFF_OPERATION_INSERT, 3, {"id": 3, "value": "c"}),
+        (Table.DIFF_OPERATION_DELETE, 4, {"id": 4, "value": "d"}),
+    ]
+
+    assert list(right_table.diff(right_table=right_table)) == []
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_diff_workers_reflection_not_cached(
+    mocker: MockerFixture,
+    mariadb_database_created_1: Generator[Database, None, None],
+    mariadb_database_created_2: Generator[Database, None, None],
+) -> None:
+    name = generate_random_string()
+
+    left_table = Table(database=mariadb_database_created_1, name=name)
+    right_table = Table(database=mariadb_database_created_2, name=name)
+
+    for table, rows in [
+        (left_table, "(1, 'a'), (2, 'b'), (3, 'c'), (4, 'd')"),
+        (right_table, "(1, 'a'), (2, 'x'), (3, 'c'), (4, 'd')"),
+    ]:
+        Query(
+            engine=table.database.database_engine,
+            query=text(
+                f"CREATE TABLE `{name}` (`id` int NOT NULL, `value` varchar(1), PRIMARY KEY (`id`));"
+            ),
+        )
+        Query(
+            engine=table.database.database_engine,
+            query=text(f"INSERT INTO `{name}` VALUES {rows};"),
+        )
+
+    spy_reflect = mocker.spy(MetaData, "reflect")
+
+    differences = list(
+        left_table.diff(right_table=right_table, chunk_size=1, leaf_size=1, workers=4)
+    )
+
+    assert [
+        (difference.operation, difference.primary_key, difference.row)
+        for difference in differences
+    ] == [
+        (Table.DIFF_OPERATION_UPDATE, 2, {"id": 2, "value": "b"}),
+    ]
+
+    # Reflected once per table, not once per worker
+
+    assert spy_reflect.call_count == 2
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_diff_invalid_leaf_size(
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    with pytest.raises(InvalidInputError):
+        list(
+            mariadb_table_created_1.diff(
+                right_table=mariadb_table_created_1, leaf_size=0
+            )
+        )
+
+
 @pytest.mark.mariadb
 def test_mariadb_table_reflection(
     mariadb_table_created_1: Generator[Database, None, None],
@@ -180,6 +401,35 @@ def test_postgresql_table_reflection(
     )
 
 
+@pytest.mark.mariadb
+def test_mariadb_table_reflection_cached(
+    mocker: MockerFixture,
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    spy = mocker.spy(MetaData, "reflect")
+
+    reflection = mariadb_table_created_1.reflection
+
+    assert mariadb_table_created_1.reflection is reflection
+
+    spy.assert_called_once()
+
+    assert spy.call_args.kwargs["only"] == [mariadb_table_created_1.name]
+
+
+@pytest.mark.mariadb
+def test_mariadb_table_reflection_cleared_after_create_index(
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    reflection = mariadb_table_created_1.reflection
+
+    mariadb_table_created_1.create_index(
+        name=generate_random_string(), columns=["user_name"]
+    )
+
+    assert mariadb_table_created_1.reflection is not reflection
+
+
 @pytest.mark.mariadb
 def test_mariadb_table_create_index(
     mariadb_table_created_1: Generator[Table, None, None],
@@ -218,6 +468,26 @@ def test_mariadb_table_create_index_with_lengths(
     assert dialect_options["length"] == {"user_name": 5}
 
 
+@pytest.mark.mariadb
+def test_mariadb_table_create_index_fails(
+    mariadb_table_created_1: Generator[Table, None, None],
+) -> None:
+    index_name = generate_random_string()
+
+    # Prefix is longer than column
+
+    with pytest.raises(DatabaseError):
+        mariadb_table_created_1.create_index(
+            name=index_name, columns=["user_name"], lengths={"user_name": 100}
+        )
+
+    assert index_name not in [
+        index.name for index in mariadb_table_created_1.reflection.indexes
+    ]
+
+    mariadb_table_created_1.create_index(name=index_name, columns=["user_name"])
+
+
 @pytest.mark.postgresql
 def test_postgresql_table_create_index_with_lengths_not_supported(
     postgresql_table_created_1: Generator[Table, None, None],
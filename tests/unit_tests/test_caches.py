@@ -0,0 +1,96 @@
+from pytest_mock import MockerFixture  # type: ignore[attr-defined]
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.caches import TTLCache
+
+
+def test_ttl_cache_hit() -> None:
+    cache = TTLCache(maximum_age=60)
+
+    assert cache.get("key", lambda: 1) == 1
+    assert cache.get("key", lambda: 2) == 1
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_ttl_cache_expired(mocker: MockerFixture) -> None:
+    cache = TTLCache(maximum_age=60)
+
+    mocker.patch("time.monotonic", return_value=0)
+
+    assert cache.get("key", lambda: 1) == 1
+
+    mocker.patch("time.monotonic", return_value=61)
+
+    assert cache.get("key", lambda: 2) == 2
+
+    assert cache.hits == 0
+    assert cache.misses == 2
+
+
+def test_ttl_cache_invalidate_key() -> None:
+    cache = TTLCache(maximum_age=60)
+
+    cache.get("key_1", lambda: 1)
+    cache.get("key_2", lambda: 2)
+
+    cache.invalidate("key_1")
+
+    assert len(cache) == 1
+
+    assert cache.get("key_1", lambda: 3) == 3
+    assert cache.get("key_2", lambda: 4) == 2
+
+
+def test_ttl_cache_invalidate_all() -> None:
+    cache = TTLCache(maximum_age=60)
+
+    cache.get("key_1", lambda: 1)
+    cache.get("key_2", lambda: 2)
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+
+
+def test_ttl_cache_invalidate_during_get() -> None:
+    cache = TTLCache(maximum_age=60)
+
+    def function() -> int:
+        cache.invalidate("key")
+
+        return 1
+
+    assert cache.get("key", function) == 1
+
+    assert len(cache) == 0
+
+    assert cache.get("key", lambda: 2) == 2
+    assert cache.get("key", lambda: 3) == 2
+
+
+def test_support_catalog_cache_disabled() -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+    )
+
+    assert support.catalog_cache is None
+
+    support.invalidate_catalog(support.CATALOG_KEY_DATABASES)  # No-op
+
+
+def test_support_catalog_cache_invalidate() -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        catalog_cache_maximum_age=60,
+    )
+
+    assert support.catalog_cache is not None
+
+    support.catalog_cache.get(support.CATALOG_KEY_DATABASES, lambda: [])
+    support.catalog_cache.get(support.CATALOG_KEY_DATABASE_USERS, lambda: [])
+
+    support.invalidate_catalog(support.CATALOG_KEY_DATABASES)
+
+    assert len(support.catalog_cache) == 1
@@ -0,0 +1,321 @@
+import base64
+import configparser
+import gzip
+import hashlib
+import os
+import subprocess
+import tempfile
+from typing import IO, Any, List, Optional
+
+import pytest
+from pytest_mock import MockerFixture  # type: ignore[attr-defined]
+
+from cyberfusion.Common import get_md5_hash
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exceptions import InvalidInputError
+from cyberfusion.DatabaseSupport.exports import HashedFile, NativeExporter
+
+
+def test_compression_command_zstd(offline_database: Database) -> None:
+    assert offline_database._get_compression_command(
+        compression="zstd", level=6, threads=4
+    ) == [offline_database.ZSTD_BIN, "-6", "-T4", "-q", "-c"]
+
+
+def test_compression_command_pigz(
+    mocker: MockerFixture, offline_database: Database
+) -> None:
+    mocker.patch.object(Database, "PIGZ_BIN", "/usr/bin/pigz")
+
+    assert offline_database._get_compression_command(
+        compression="gzip", level=1, threads=4
+    ) == ["/usr/bin/pigz", "-1", "-p", "4", "-c"]
+
+
+def test_compression_command_gzip(
+    mocker: MockerFixture, offline_database: Database
+) -> None:
+    mocker.patch.object(Database, "PIGZ_BIN", None)
+
+    assert offline_database._get_compression_command(
+        compression="gzip", level=9, threads=4
+    ) == [offline_database.GZIP_BIN, "-9", "-c"]
+
+
+@pytest.mark.parametrize(
+    "compression,level,threads",
+    [("bzip2", 3, 1), ("gzip", 10, 1), ("zstd", 0, 1), ("zstd", 3, 0)],
+)
+def test_compression_command_invalid(
+    compression: str,
+    level: int,
+    threads: int,
+    offline_database: Database,
+) -> None:
+    with pytest.raises(InvalidInputError):
+        offline_database._get_compression_command(
+            compression=compression, level=level, threads=threads
+        )
+
+
+def test_run_to_file(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "dump.sql")
+
+    hash_ = Database._run_to_file(["printf", "SELECT 1;"], path)
+
+    with open(path, "rb") as f:
+        assert f.read() == b"SELECT 1;"
+
+    assert hash_ == get_md5_hash(path)
+
+
+@pytest.mark.parametrize("hash_algorithm", ["sha256", "blake2b"])
+def test_run_to_file_hash_algorithm(tmp_path: str, hash_algorithm: str) -> None:
+    hash_ = Database._run_to_file(
+        ["printf", "SELECT 1;"],
+        os.path.join(tmp_path, "dump.sql"),
+        hash_algorithm=hash_algorithm,
+    )
+
+    assert (
+        hash_
+        == base64.b64encode(hashlib.new(hash_algorithm, b"SELECT 1;").digest()).decode()
+    )
+
+
+def test_run_to_file_hash_algorithm_invalid(tmp_path: str) -> None:
+    with pytest.raises(InvalidInputError):
+        Database._run_to_file(
+            ["printf", "SELECT 1;"],
+            os.path.join(tmp_path, "dump.sql"),
+            hash_algorithm="crc32",
+        )
+
+
+def test_run_to_file_compressed(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "dump.sql.gz")
+
+    hash_ = Database._run_to_file(
+        ["printf", "SELECT 1;"],
+        path,
+        compression_command=[Database.GZIP_BIN, "-1", "-c"],
+    )
+
+    with gzip.open(path, "rb") as f:
+        assert f.read() == b"SELECT 1;"
+
+    assert hash_ == get_md5_hash(path)
+
+
+@pytest.mark.parametrize(
+    "command,compression_command",
+    [(["false"], [Database.GZIP_BIN, "-1", "-c"]), (["printf", "x"], ["false"])],
+)
+def test_run_to_file_command_fails(
+    tmp_path: str, command: List[str], compression_command: List[str]
+) -> None:
+    with pytest.raises(subprocess.CalledProcessError) as e:
+        Database._run_to_file(
+            command,
+            os.path.join(tmp_path, "dump.sql.gz"),
+            compression_command=compression_command,
+        )
+
+    assert e.value.cmd == ["false"]
+
+
+@pytest.mark.parametrize("compression_command", [None, [Database.GZIP_BIN, "-1", "-c"]])
+def test_export_native(
+    mocker: MockerFixture,
+    tmp_path: str,
+    compression_command: Optional[List[str]],
+    offline_database: Database,
+) -> None:
+    def _export(self: NativeExporter, f: IO[bytes]) -> int:
+        f.write(b"SELECT 1;\n" * 100000)
+
+        return 0
+
+    mocker.patch.object(NativeExporter, "export", _export)
+
+    path = os.path.join(tmp_path, "dump.sql")
+
+    hash_ = offline_database._export_native(
+        path,
+        compression_command=compression_command,
+        hash_algorithm="md5",
+        packet_size=1024,
+        exclude_table_names=[],
+    )
+
+    with (gzip.open if compression_command else open)(path, "rb") as f:
+        assert f.read() == b"SELECT 1;\n" * 100000
+
+    assert hash_ == get_md5_hash(path)
+
+
+def test_export_native_compression_command_fails(
+    mocker: MockerFixture,
+    tmp_path: str,
+    offline_database: Database,
+) -> None:
+    mocker.patch.object(NativeExporter, "export", return_value=0)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        offline_database._export_native(
+            os.path.join(tmp_path, "dump.sql.gz"),
+            compression_command=["false"],
+            hash_algorithm="md5",
+            packet_size=1024,
+            exclude_table_names=[],
+        )
+
+
+def test_export_native_export_fails(
+    mocker: MockerFixture, tmp_path: str, offline_database: Database
+) -> None:
+    def _export(self: NativeExporter, f: IO[bytes]) -> int:
+        f.write(b"SELECT 1;\n" * 100000)
+
+        raise RuntimeError
+
+    mocker.patch.object(NativeExporter, "export", _export)
+
+    spy_popen = mocker.spy(subprocess, "Popen")
+
+    with pytest.raises(RuntimeError):
+        offline_database._export_native(
+            os.path.join(tmp_path, "dump.sql.gz"),
+            compression_command=[Database.GZIP_BIN, "-1", "-c"],
+            hash_algorithm="md5",
+            packet_size=1024,
+            exclude_table_names=[],
+        )
+
+    assert spy_popen.spy_return.returncode is not None
+
+
+def test_export_native_write_compressed_fails(
+    mocker: MockerFixture,
+    tmp_path: str,
+    offline_database: Database,
+) -> None:
+    def _export(self: NativeExporter, f: IO[bytes]) -> int:
+        while True:
+            f.write(b"SELECT 1;\n" * 100000)
+
+    mocker.patch.object(NativeExporter, "export", _export)
+    mocker.patch.object(HashedFile, "write", side_effect=OSError)
+
+    spy_popen = mocker.spy(subprocess, "Popen")
+
+    # Writing to stdin fails as the process is killed, but the cause is raised
+
+    with pytest.raises(OSError) as e:
+        offline_database._export_native(
+            os.path.join(tmp_path, "dump.sql.gz"),
+            compression_command=[Database.GZIP_BIN, "-1", "-c"],
+            hash_algorithm="md5",
+            packet_size=1024,
+            exclude_table_names=[],
+        )
+
+    assert not isinstance(e.value, BrokenPipeError)
+
+    assert spy_popen.spy_return.returncode is not None
+
+
+@pytest.mark.parametrize("offline_database", ["PostgreSQL"], indirect=True)
+def test_export_postgresql_fails(
+    mocker: MockerFixture, tmp_path: str, offline_database: Database
+) -> None:
+    def _run(command: List[str], **kwargs: Any) -> None:
+        directory = command[-1].split("=", 1)[1]
+
+        with open(os.path.join(directory, "toc.dat"), "wb") as f:
+            f.write(b"0")
+
+        raise subprocess.CalledProcessError(1, command)
+
+    mocker.patch("subprocess.run", side_effect=_run)
+
+    spy_mkdtemp = mocker.spy(tempfile, "mkdtemp")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        offline_database._export_postgresql(
+            chown_username=None,
+            exclude_tables=None,
+            root_directory=str(tmp_path),
+            compression=None,
+            compression_level=Database.COMPRESSION_LEVEL_DEFAULT,
+            hash_algorithm="md5",
+            workers=1,
+        )
+
+    assert not os.path.exists(spy_mkdtemp.spy_return)
+    assert os.listdir(tmp_path) == []
+
+
+def test_export_engine_invalid(offline_database: Database) -> None:
+    with pytest.raises(InvalidInputError):
+        offline_database.export(engine="mysqldump")
+
+
+def test_postgresql_credentials_service_file() -> None:
+    database = Database(
+        support=DatabaseSupport(
+            server_software_names=["PostgreSQL"],
+            server_password="secret",
+            postgresql_server_host="127.0.0.1:5433",
+            postgresql_server_username="postgres",
+        ),
+        name="example",
+        server_software_name="PostgreSQL",
+    )
+
+    with open(database._postgresql_credentials_service_file) as f:
+        assert f.read().splitlines() == [
+            "[database-support]",
+            "host=127.0.0.1",
+            "port=5433",
+            "user=postgres",
+            "password=secret",
+            "dbname=example",
+            "",
+        ]
+
+
+def test_postgresql_credentials_service_file_default_host() -> None:
+    database = Database(
+        support=DatabaseSupport(server_software_names=["PostgreSQL"]),
+        name="example",
+        server_software_name="PostgreSQL",
+    )
+
+    config = configparser.ConfigParser()
+    config.read(database._postgresql_credentials_service_file)
+
+    assert not config.has_option("database-support", "host")
+    assert not config.has_option("database-support", "password")
+
+
+def test_directory_hash(tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "a"))
+    os.mkdir(os.path.join(tmp_path, "b"))
+
+    for directory_name, file_name in [("a", "1.dat"), ("b", "1.dat")]:
+        with open(os.path.join(tmp_path, directory_name, file_name), "wb") as f:
+            f.write(b"1")
+
+    hash_ = Database._get_directory_hash(str(tmp_path), hash_algorithm="md5")
+
+    assert hash_ == Database._get_directory_hash(str(tmp_path), hash_algorithm="md5")
+
+    # Hash includes file names, not only contents
+
+    os.rename(
+        os.path.join(tmp_path, "b", "1.dat"), os.path.join(tmp_path, "b", "2.dat")
+    )
+
+    assert hash_ != Database._get_directory_hash(str(tmp_path), hash_algorithm="md5")
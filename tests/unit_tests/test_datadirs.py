@@ -0,0 +1,169 @@
+import os
+
+from pytest_mock import MockerFixture  # type: ignore[attr-defined]
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.datadirs import DatadirSizes
+
+
+def create_file(path: str, size: int) -> None:
+    with open(path, "wb") as f:
+        f.write(b"0" * size)
+
+
+def test_datadir_sizes_database_size(tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "example"))
+
+    create_file(os.path.join(tmp_path, "example", "innodb.ibd"), 100)
+    create_file(os.path.join(tmp_path, "example", "innodb.frm"), 1000)
+    create_file(os.path.join(tmp_path, "example", "myisam.MYD"), 10)
+    create_file(os.path.join(tmp_path, "example", "myisam.MYI"), 20)
+    create_file(os.path.join(tmp_path, "example", "aria.MAD"), 1)
+    create_file(os.path.join(tmp_path, "example", "aria.MAI"), 2)
+
+    assert DatadirSizes(path=str(tmp_path)).get_database_size("example") == 133
+
+
+def test_datadir_sizes_database_size_not_exists(tmp_path: str) -> None:
+    assert DatadirSizes(path=str(tmp_path)).get_database_size("example") is None
+
+
+def test_datadir_sizes_database_size_non_ascii(tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "caf@0Gs"))
+
+    create_file(os.path.join(tmp_path, "caf@0Gs", "innodb.ibd"), 100)
+
+    assert DatadirSizes(path=str(tmp_path)).get_database_size("cafÀs") is None
+
+
+def test_datadir_sizes_database_sizes(tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "example"))
+    os.mkdir(os.path.join(tmp_path, "example@002dencoded"))
+    os.mkdir(os.path.join(tmp_path, "caf@0Gs"))
+
+    create_file(os.path.join(tmp_path, "example", "innodb.ibd"), 100)
+    create_file(os.path.join(tmp_path, "example@002dencoded", "innodb.ibd"), 200)
+    create_file(os.path.join(tmp_path, "ibdata1"), 1000)
+
+    assert DatadirSizes(path=str(tmp_path), workers=2).get_database_sizes() == {
+        "example": 100,
+        "example-encoded": 200,
+    }
+
+
+def test_datadir_sizes_encode_name() -> None:
+    assert DatadirSizes.encode_name("example-encoded_1") == "example@002dencoded_1"
+    assert DatadirSizes.decode_name("example@002dencoded_1") == "example-encoded_1"
+
+
+def test_datadir_sizes_encode_name_non_ascii() -> None:
+    assert DatadirSizes.encode_name("cafÀs") is None
+    assert DatadirSizes.decode_name("caf@0Gs") is None
+    assert DatadirSizes.decode_name("caf@00c0s") is None
+
+
+def test_database_size_datadir_sizes_fallback(
+    mocker: MockerFixture, tmp_path: str
+) -> None:
+    os.mkdir(os.path.join(tmp_path, "caf@0Gs"))
+
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        mariadb_datadir=str(tmp_path),
+    )
+
+    query = mocker.patch("cyberfusion.DatabaseSupport.databases.Query")
+    query.return_value.result = [(100,)]
+
+    assert (
+        Database(
+            support=support,
+            name="cafÀs",
+            server_software_name=DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME,
+        ).size
+        == 100
+    )
+
+
+def test_datadir_sizes_cached(tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "example"))
+
+    create_file(os.path.join(tmp_path, "example", "innodb.ibd"), 100)
+
+    datadir_sizes = DatadirSizes(path=str(tmp_path))
+
+    assert datadir_sizes.get_database_size("example") == 100
+
+    with open(os.path.join(tmp_path, "example", "innodb.ibd"), "ab") as f:
+        f.write(b"0")  # Does not change directory mtime
+
+    assert datadir_sizes.get_database_size("example") == 100
+
+    assert datadir_sizes.hits == 1
+    assert datadir_sizes.misses == 1
+
+
+def test_datadir_sizes_cache_invalidated_by_mtime(tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "example"))
+
+    create_file(os.path.join(tmp_path, "example", "innodb.ibd"), 100)
+
+    datadir_sizes = DatadirSizes(path=str(tmp_path))
+
+    assert datadir_sizes.get_database_size("example") == 100
+
+    create_file(os.path.join(tmp_path, "example", "other.ibd"), 50)
+
+    os.utime(os.path.join(tmp_path, "example"), ns=(0, 0))  # Ensure mtime differs
+
+    assert datadir_sizes.get_database_size("example") == 150
+
+    assert datadir_sizes.misses == 2
+
+
+def test_datadir_sizes_cache_expired(mocker: MockerFixture, tmp_path: str) -> None:
+    os.mkdir(os.path.join(tmp_path, "example"))
+
+    create_file(os.path.join(tmp_path, "example", "innodb.ibd"), 100)
+
+    datadir_sizes = DatadirSizes(path=str(tmp_path), maximum_age=60)
+
+    mocker.patch("time.monotonic", return_value=0)
+
+    assert datadir_sizes.get_database_size("example") == 100
+
+    with open(os.path.join(tmp_path, "example", "innodb.ibd"), "ab") as f:
+        f.write(b"0")
+
+    mocker.patch("time.monotonic", return_value=61)
+
+    assert datadir_sizes.get_database_size("example") == 101
+
+
+def test_support_mariadb_datadir_sizes_socket(tmp_path: str) -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        mariadb_datadir=str(tmp_path),
+    )
+
+    assert support.mariadb_datadir_sizes
+    assert support.mariadb_datadir_sizes.path == str(tmp_path)
+
+
+def test_support_mariadb_datadir_sizes_not_socket(tmp_path: str) -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+        mariadb_server_host="127.0.0.1:3306",
+        mariadb_datadir=str(tmp_path),
+    )
+
+    assert support.mariadb_datadir_sizes is None
+
+
+def test_support_mariadb_datadir_sizes_not_set() -> None:
+    support = DatabaseSupport(
+        server_software_names=[DatabaseSupport.MARIADB_SERVER_SOFTWARE_NAME],
+    )
+
+    assert support.mariadb_datadir_sizes is None
@@ -1,3 +1,5 @@
+from sqlalchemy.pool import NullPool, QueuePool
+
 from cyberfusion.DatabaseSupport import DatabaseSupport
 
 
@@ -95,3 +97,31 @@ def test_mariadb_engine_absent_for_postgresql_server_software(
     assert "mysql" not in postgresql_support.engines.urls
     assert "mysql" not in postgresql_support.engines.engines
     assert "mysql" not in postgresql_support.engines.inspectors
+
+
+def test_engines_not_pooled_by_default(mariadb_support: DatabaseSupport) -> None:
+    assert isinstance(mariadb_support.engines.engines["mysql"].pool, NullPool)
+
+
+def test_engines_pooled(mariadb_server_password: str, mariadb_server_host: str) -> None:
+    mariadb_support = DatabaseSupport(
+        server_software_names=["MariaDB"],
+        server_password=mariadb_server_password,
+        mariadb_server_host=mariadb_server_host,
+        mariadb_server_username="root",
+        pooled=True,
+        pool_size=3,
+        pool_max_overflow=2,
+        pool_recycle=60,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+    )
+
+    pool = mariadb_support.engines.engines["mysql"].pool
+
+    assert isinstance(pool, QueuePool)
+    assert pool.size() == 3
+    assert pool._max_overflow == 2
+    assert pool._recycle == 60
+    assert pool._pre_ping
+    assert pool._pool.use_lifo
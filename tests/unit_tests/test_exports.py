@@ -0,0 +1,405 @@
+import base64
+import datetime
+import decimal
+import hashlib
+import io
+import os
+from typing import Any, List
+
+import pymysql
+import pytest
+import sqlalchemy as sa
+from pytest_mock import MockerFixture  # type: ignore[attr-defined]
+
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.exceptions import (
+    InvalidInputError,
+    PrimaryKeyNotSupportedError,
+    ReadLockTimeoutError,
+    ServerNotSupportedError,
+)
+from cyberfusion.DatabaseSupport.exports import (
+    ExportManifest,
+    ExportManifestFile,
+    HashedFile,
+    NativeExporter,
+    ParallelExporter,
+    ParallelLoader,
+    escape_value,
+)
+from cyberfusion.DatabaseSupport.tables import Table
+
+
+@pytest.mark.parametrize(
+    "value,escaped_value",
+    [
+        (None, "NULL"),
+        (1, "1"),
+        (decimal.Decimal("1.50"), "1.50"),
+        ("it's\n", "'it\\'s\\n'"),
+        (b"\x00\xff", "X'00ff'"),
+        (b"", "X''"),
+        (datetime.datetime(2024, 1, 2, 3, 4, 5), "'2024-01-02 03:04:05'"),
+    ],
+)
+def test_escape_value(value: Any, escaped_value: str) -> None:
+    assert escape_value(value) == escaped_value
+
+
+def test_hashed_file() -> None:
+    f = io.BytesIO()
+
+    hashed_file = HashedFile(f, hash_algorithm="sha256")
+
+    hashed_file.write(b"SELECT 1;\n")
+    hashed_file.write(b"SELECT 2;\n")
+
+    assert f.getvalue() == b"SELECT 1;\nSELECT 2;\n"
+    assert (
+        hashed_file.hash
+        == base64.b64encode(hashlib.sha256(b"SELECT 1;\nSELECT 2;\n").digest()).decode()
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"workers": 0},
+        {"chunk_size": 0},
+        {"hash_algorithm": "crc32"},
+        {"packet_size": 0},
+    ],
+)
+def test_parallel_exporter_invalid(kwargs: dict, offline_database: Database) -> None:
+    with pytest.raises(InvalidInputError):
+        ParallelExporter(
+            database=offline_database, **{"hash_algorithm": "md5", **kwargs}
+        )
+
+
+@pytest.mark.parametrize("offline_database", ["PostgreSQL"], indirect=True)
+def test_parallel_exporter_server_not_supported(offline_database: Database) -> None:
+    with pytest.raises(ServerNotSupportedError):
+        ParallelExporter(database=offline_database, hash_algorithm="md5")
+
+    with pytest.raises(ServerNotSupportedError):
+        ParallelLoader(database=offline_database)
+
+    with pytest.raises(ServerNotSupportedError):
+        NativeExporter(database=offline_database)
+
+
+@pytest.mark.parametrize(
+    "packet_size,statements",
+    [
+        (
+            1024,
+            [b"INSERT INTO `example` (`id`, `name`) VALUES (1,'a'),(2,'b'),(3,NULL);"],
+        ),
+        (
+            60,
+            [
+                b"INSERT INTO `example` (`id`, `name`) VALUES (1,'a'),(2,'b');",
+                b"INSERT INTO `example` (`id`, `name`) VALUES (3,NULL);",
+            ],
+        ),
+        (
+            1,
+            [
+                b"INSERT INTO `example` (`id`, `name`) VALUES (1,'a');",
+                b"INSERT INTO `example` (`id`, `name`) VALUES (2,'b');",
+                b"INSERT INTO `example` (`id`, `name`) VALUES (3,NULL);",
+            ],
+        ),
+    ],
+)
+def test_exporter_write_inserts(
+    mocker: MockerFixture,
+    packet_size: int,
+    statements: List[bytes],
+    offline_database: Database,
+) -> None:
+    connection = mocker.MagicMock()
+    connection.execution_options.return_value.execute.return_value.partitions.return_value = [
+        [(1, "a"), (2, "b")],
+        [(3, None)],
+    ]
+
+    f = io.BytesIO()
+
+    assert (
+        NativeExporter(
+            database=offline_database, packet_size=packet_size
+        )._write_inserts(connection, "example", ["id", "name"], f)
+        == 3
+    )
+
+    assert f.getvalue().splitlines() == statements
+
+
+def test_parallel_exporter_table_ranges_small(
+    mocker: MockerFixture, offline_database: Database
+) -> None:
+    spy_get_chunk_boundaries = mocker.patch.object(Table, "get_chunk_boundaries")
+
+    assert ParallelExporter(
+        database=offline_database, chunk_size=10, hash_algorithm="md5"
+    )._get_table_ranges("example", 10) == [(None, None)]
+
+    spy_get_chunk_boundaries.assert_not_called()
+
+
+def test_parallel_exporter_table_ranges_large(
+    mocker: MockerFixture, offline_database: Database
+) -> None:
+    mocker.patch.object(Table, "get_chunk_boundaries", return_value=[1, 11, 21])
+
+    assert ParallelExporter(
+        database=offline_database, chunk_size=10, hash_algorithm="md5"
+    )._get_table_ranges("example", 25) == [
+        (None, 11),
+        (11, 21),
+        (21, None),
+    ]
+
+
+def test_parallel_exporter_table_ranges_primary_key_not_supported(
+    mocker: MockerFixture,
+    offline_database: Database,
+) -> None:
+    mocker.patch.object(
+        Table, "get_chunk_boundaries", side_effect=PrimaryKeyNotSupportedError
+    )
+
+    assert ParallelExporter(
+        database=offline_database, chunk_size=10, hash_algorithm="md5"
+    )._get_table_ranges("example", 25) == [(None, None)]
+
+
+def test_parallel_loader_manifest(tmp_path: str) -> None:
+    manifest = ExportManifest(
+        database_name="example",
+        hash_algorithm="md5",
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+        schema_files=[
+            ExportManifestFile(
+                table_name="example",
+                file_name="example.schema.sql",
+                hash="1B2M2Y8AsgTpgAmY7PhCfg==",
+                rows=0,
+            )
+        ],
+        data_files=[],
+    )
+
+    with open(os.path.join(tmp_path, ParallelExporter.NAME_FILE_MANIFEST), "w") as f:
+        f.write(manifest.model_dump_json())
+
+    assert ParallelLoader.get_manifest(str(tmp_path)) == manifest
+
+
+def test_parallel_exporter_table_ranges_name_not_supported(
+    mocker: MockerFixture,
+    offline_database: Database,
+) -> None:
+    spy_get_chunk_boundaries = mocker.patch.object(Table, "get_chunk_boundaries")
+
+    assert ParallelExporter(
+        database=offline_database, chunk_size=10, hash_algorithm="md5"
+    )._get_table_ranges("a/b", 25) == [(None, None)]
+
+    spy_get_chunk_boundaries.assert_not_called()
+
+
+def test_parallel_exporter_file_names(
+    mocker: MockerFixture, tmp_path: str, offline_database: Database
+) -> None:
+    mocker.patch.object(
+        ParallelExporter,
+        "_tables_rows",
+        new=mocker.PropertyMock(return_value={"../../x": 1, "a/b": 1}),
+    )
+    mocker.patch.object(
+        ParallelExporter,
+        "_tables_column_names",
+        new=mocker.PropertyMock(return_value={"../../x": ["id"], "a/b": ["id"]}),
+    )
+    mocker.patch.object(
+        ParallelExporter, "_get_connections", return_value=[mocker.MagicMock()]
+    )
+    mocker.patch.object(ParallelExporter, "_write_create_table")
+    mocker.patch.object(ParallelExporter, "_write_inserts", return_value=1)
+
+    directory = os.path.join(tmp_path, "dump")
+    os.mkdir(directory)
+
+    manifest = ParallelExporter(
+        database=offline_database, workers=1, hash_algorithm="md5"
+    ).export(directory)
+
+    assert [
+        (file.table_name, file.file_name)
+        for file in manifest.schema_files + manifest.data_files
+    ] == [
+        ("../../x", "0.schema.sql"),
+        ("a/b", "1.schema.sql"),
+        ("../../x", "0.0.sql"),
+        ("a/b", "1.0.sql"),
+    ]
+    assert sorted(os.listdir(tmp_path)) == ["dump"]
+    assert sorted(os.listdir(directory)) == [
+        "0.0.sql",
+        "0.schema.sql",
+        "1.0.sql",
+        "1.schema.sql",
+        ParallelExporter.NAME_FILE_MANIFEST,
+    ]
+
+
+def test_parallel_exporter_name_newline(
+    mocker: MockerFixture, tmp_path: str, offline_database: Database
+) -> None:
+    mocker.patch.object(
+        ParallelExporter,
+        "_tables_rows",
+        new=mocker.PropertyMock(return_value={"a\nb": 1}),
+    )
+    mocker.patch.object(
+        ParallelExporter,
+        "_tables_column_names",
+        new=mocker.PropertyMock(return_value={"a\nb": ["id"]}),
+    )
+    spy_get_connections = mocker.patch.object(ParallelExporter, "_get_connections")
+
+    with pytest.raises(InvalidInputError):
+        ParallelExporter(database=offline_database, hash_algorithm="md5").export(
+            str(tmp_path)
+        )
+
+    spy_get_connections.assert_not_called()
+
+
+@pytest.mark.parametrize("file_name", ["../x.sql", "a/b.sql", "..", ""])
+def test_parallel_loader_file_name_not_basename(
+    mocker: MockerFixture,
+    tmp_path: str,
+    file_name: str,
+    offline_database: Database,
+) -> None:
+    manifest = ExportManifest(
+        database_name="example",
+        hash_algorithm="md5",
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+        schema_files=[],
+        data_files=[
+            ExportManifestFile(
+                table_name="example", file_name=file_name, hash="", rows=0
+            )
+        ],
+    )
+
+    with open(os.path.join(tmp_path, ParallelExporter.NAME_FILE_MANIFEST), "w") as f:
+        f.write(manifest.model_dump_json())
+
+    spy_load_file = mocker.patch.object(ParallelLoader, "_load_file")
+
+    with pytest.raises(InvalidInputError):
+        ParallelLoader(database=offline_database).load(str(tmp_path))
+
+    spy_load_file.assert_not_called()
+
+
+@pytest.mark.parametrize("tampered", [False, True])
+def test_parallel_loader_hash_before_load(
+    mocker: MockerFixture,
+    tmp_path: str,
+    tampered: bool,
+    offline_database: Database,
+) -> None:
+    files = []
+
+    for file_name, contents in [
+        ("0.schema.sql", b"DROP TABLE IF EXISTS `a`;\nCREATE TABLE `a` (id int);\n"),
+        ("0.0.sql", b"INSERT INTO `a` VALUES (1);\n"),
+    ]:
+        with open(os.path.join(tmp_path, file_name), "wb") as f:
+            f.write(contents)
+
+        files.append(
+            ExportManifestFile(
+                table_name="a",
+                file_name=file_name,
+                hash=base64.b64encode(hashlib.md5(contents).digest()).decode(),
+                rows=1,
+            )
+        )
+
+    if tampered:
+        with open(os.path.join(tmp_path, "0.0.sql"), "ab") as f:
+            f.write(b"DROP TABLE `a`;\n")
+
+    manifest = ExportManifest(
+        database_name="example",
+        hash_algorithm="md5",
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+        schema_files=files[:1],
+        data_files=files[1:],
+    )
+
+    with open(os.path.join(tmp_path, ParallelExporter.NAME_FILE_MANIFEST), "w") as f:
+        f.write(manifest.model_dump_json())
+
+    spy_load_file = mocker.patch.object(ParallelLoader, "_load_file")
+
+    if tampered:
+        with pytest.raises(InvalidInputError):
+            ParallelLoader(database=offline_database).load(str(tmp_path))
+
+        spy_load_file.assert_not_called()
+    else:
+        ParallelLoader(database=offline_database).load(str(tmp_path))
+
+        assert spy_load_file.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "error_code,exception",
+    [
+        (ParallelExporter.ERROR_CODE_LOCK_WAIT_TIMEOUT, ReadLockTimeoutError),
+        (1045, sa.exc.OperationalError),
+    ],
+)
+def test_parallel_exporter_read_lock_timeout(
+    mocker: MockerFixture,
+    error_code: int,
+    exception: type,
+    offline_database: Database,
+) -> None:
+    lock_connection = mocker.MagicMock()
+
+    def exec_driver_sql(statement: str) -> None:
+        if statement == "FLUSH TABLES WITH READ LOCK;":
+            raise sa.exc.OperationalError(
+                statement, {}, pymysql.err.OperationalError(error_code, "")
+            )
+
+    lock_connection.exec_driver_sql.side_effect = exec_driver_sql
+
+    engine = mocker.MagicMock()
+    engine.connect.return_value.__enter__.return_value = lock_connection
+
+    mocker.patch.object(
+        Database, "server_engine", new=mocker.PropertyMock(return_value=engine)
+    )
+
+    with pytest.raises(exception):
+        ParallelExporter(
+            database=offline_database, hash_algorithm="md5"
+        )._get_connections()
+
+    assert [
+        call.args[0] for call in lock_connection.exec_driver_sql.call_args_list
+    ] == [
+        f"SET SESSION lock_wait_timeout = {ParallelExporter.LOCK_WAIT_TIMEOUT};",
+        "FLUSH TABLES WITH READ LOCK;",
+    ]
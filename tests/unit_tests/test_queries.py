@@ -2,7 +2,7 @@ import pytest
 from sqlalchemy import text
 
 from cyberfusion.DatabaseSupport import DatabaseSupport
-from cyberfusion.DatabaseSupport.queries import Query
+from cyberfusion.DatabaseSupport.queries import Query, StreamingQuery
 
 
 @pytest.mark.mariadb
@@ -41,3 +41,40 @@ def test_postgresql_query_result_not_rows(postgresql_support: DatabaseSupport) -
     )
 
     assert query.result == []
+
+
+@pytest.mark.mariadb
+def test_mariadb_streaming_query_result_rows(
+    mariadb_support: DatabaseSupport,
+) -> None:
+    query = StreamingQuery(
+        engine=mariadb_support.engines.engines["mysql"],
+        query=text("SELECT 1 UNION SELECT 2 UNION SELECT 3;"),
+        batch_size=2,
+    )
+
+    assert list(query) == [(1,), (2,), (3,)]
+
+
+@pytest.mark.postgresql
+def test_postgresql_streaming_query_result_rows(
+    postgresql_support: DatabaseSupport,
+) -> None:
+    query = StreamingQuery(
+        engine=postgresql_support.engines.engines["postgresql"],
+        query=text("SELECT generate_series(1, 3);"),
+        batch_size=2,
+    )
+
+    assert list(query) == [(1,), (2,), (3,)]
+
+
+@pytest.mark.mariadb
+def test_mariadb_streaming_query_result_not_rows(
+    mariadb_support: DatabaseSupport,
+) -> None:
+    query = StreamingQuery(
+        engine=mariadb_support.engines.engines["mysql"], query=text("COMMIT;")
+    )
+
+    assert list(query) == []
@@ -0,0 +1,237 @@
+from typing import List, Tuple
+
+import pytest
+from pytest_mock import MockerFixture  # type: ignore[attr-defined]
+
+from cyberfusion.DatabaseSupport.database_user_grants import DatabaseUserGrant
+from cyberfusion.DatabaseSupport.database_users import DatabaseUser
+from cyberfusion.DatabaseSupport.databases import Database
+from cyberfusion.DatabaseSupport.reconciliations import (
+    DesiredState,
+    ReconciliationAction,
+    Reconciler,
+)
+from cyberfusion.DatabaseSupport.servers import Server
+from tests._utilities import PASSWORD_2
+
+
+def mock_snapshot(
+    mocker: MockerFixture,
+    *,
+    databases: List[Database],
+    database_users: List[DatabaseUser],
+    database_user_grants: List[DatabaseUserGrant],
+) -> None:
+    for name, value in [
+        ("databases", databases),
+        ("database_users", database_users),
+        ("database_user_grants", database_user_grants),
+    ]:
+        mocker.patch(
+            f"cyberfusion.DatabaseSupport.servers.Server.{name}",
+            new=mocker.PropertyMock(return_value=value),
+        )
+
+
+def test_reconciler_plan_create(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_desired_state: DesiredState,
+) -> None:
+    mock_snapshot(mocker, databases=[], database_users=[], database_user_grants=[])
+
+    plan = Reconciler(
+        server=offline_server, desired_state=reconciliation_desired_state
+    ).plan
+
+    assert [str(action) for action in plan] == [
+        "create database example",
+        "create database user example@%",
+        "grant SELECT ON example.* TO example@%",
+    ]
+
+
+def test_reconciler_plan_unchanged(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_desired_state: DesiredState,
+    reconciliation_existing_objects: Tuple[Database, DatabaseUser, DatabaseUserGrant],
+) -> None:
+    database, database_user, database_user_grant = reconciliation_existing_objects
+
+    mock_snapshot(
+        mocker,
+        databases=[database],
+        database_users=[database_user],
+        database_user_grants=[database_user_grant],
+    )
+
+    assert (
+        Reconciler(
+            server=offline_server, desired_state=reconciliation_desired_state
+        ).plan
+        == []
+    )
+
+
+@pytest.mark.parametrize(
+    "reconciliation_existing_objects", [{"privilege_names": ["ALL"]}], indirect=True
+)
+@pytest.mark.parametrize(
+    "reconciliation_desired_state", [["ALL PRIVILEGES"]], indirect=True
+)
+def test_reconciler_plan_all_privileges_unchanged(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_desired_state: DesiredState,
+    reconciliation_existing_objects: Tuple[Database, DatabaseUser, DatabaseUserGrant],
+) -> None:
+    database, database_user, database_user_grant = reconciliation_existing_objects
+
+    mock_snapshot(
+        mocker,
+        databases=[database],
+        database_users=[database_user],
+        database_user_grants=[database_user_grant],
+    )
+
+    assert (
+        Reconciler(
+            server=offline_server, desired_state=reconciliation_desired_state
+        ).plan
+        == []
+    )
+
+
+@pytest.mark.parametrize(
+    "reconciliation_existing_objects",
+    [{"password": PASSWORD_2, "privilege_names": ["INSERT"]}],
+    indirect=True,
+)
+def test_reconciler_plan_edit_and_regrant(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_desired_state: DesiredState,
+    reconciliation_existing_objects: Tuple[Database, DatabaseUser, DatabaseUserGrant],
+) -> None:
+    database, database_user, database_user_grant = reconciliation_existing_objects
+
+    mock_snapshot(
+        mocker,
+        databases=[database],
+        database_users=[database_user],
+        database_user_grants=[database_user_grant],
+    )
+
+    plan = Reconciler(
+        server=offline_server, desired_state=reconciliation_desired_state
+    ).plan
+
+    assert [str(action) for action in plan] == [
+        "edit database user example@%",
+        "revoke INSERT ON example.* FROM example@%",
+        "grant SELECT ON example.* TO example@%",
+    ]
+
+
+def test_reconciler_plan_prune(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_existing_objects: Tuple[Database, DatabaseUser, DatabaseUserGrant],
+) -> None:
+    database, database_user, database_user_grant = reconciliation_existing_objects
+
+    support_database_user = DatabaseUser(
+        server=offline_server,
+        name="root",
+        server_software_name="MariaDB",
+        host="localhost",
+    )
+
+    mock_snapshot(
+        mocker,
+        databases=[database],
+        database_users=[database_user, support_database_user],
+        database_user_grants=[
+            database_user_grant,
+            DatabaseUserGrant(
+                database=Database(
+                    support=offline_server.support,
+                    name="*",
+                    server_software_name="MariaDB",
+                ),
+                database_user=database_user,
+                privilege_names=["PROCESS"],
+                table=None,
+            ),
+            DatabaseUserGrant(
+                database=database,
+                database_user=support_database_user,
+                privilege_names=["ALL"],
+                table=None,
+            ),
+        ],
+    )
+
+    plan = Reconciler(
+        server=offline_server, desired_state=DesiredState(), prune=True
+    ).plan
+
+    assert [str(action) for action in plan] == [
+        "revoke SELECT ON example.* FROM example@%",
+        "drop database user example@%",
+        "drop database example",
+    ]
+
+
+def test_reconciler_plan_not_prune(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_existing_objects: Tuple[Database, DatabaseUser, DatabaseUserGrant],
+) -> None:
+    database, database_user, database_user_grant = reconciliation_existing_objects
+
+    mock_snapshot(
+        mocker,
+        databases=[database],
+        database_users=[database_user],
+        database_user_grants=[database_user_grant],
+    )
+
+    assert Reconciler(server=offline_server, desired_state=DesiredState()).plan == []
+
+
+def test_reconciler_apply_dry_run(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_desired_state: DesiredState,
+) -> None:
+    mock_snapshot(mocker, databases=[], database_users=[], database_user_grants=[])
+
+    spy_apply = mocker.patch.object(ReconciliationAction, "apply")
+
+    plan = Reconciler(
+        server=offline_server, desired_state=reconciliation_desired_state
+    ).apply(dry_run=True)
+
+    assert len(plan) == 3
+
+    spy_apply.assert_not_called()
+
+
+def test_reconciler_apply(
+    mocker: MockerFixture,
+    offline_server: Server,
+    reconciliation_desired_state: DesiredState,
+) -> None:
+    mock_snapshot(mocker, databases=[], database_users=[], database_user_grants=[])
+
+    spy_apply = mocker.patch.object(ReconciliationAction, "apply")
+
+    plan = Reconciler(
+        server=offline_server, desired_state=reconciliation_desired_state, workers=2
+    ).apply()
+
+    assert len(plan) == 3
+
+    assert spy_apply.call_count == 3
@@ -0,0 +1,76 @@
+from pytest_mock import MockerFixture  # type: ignore[attr-defined]
+from sqlalchemy.pool import NullPool
+
+from cyberfusion.DatabaseSupport import DatabaseSupport
+from cyberfusion.DatabaseSupport.registries import EngineRegistry, engine_registry
+
+
+def test_engine_registry_hit() -> None:
+    registry = EngineRegistry()
+
+    engine = registry.get("mysql+pymysql://root@localhost", poolclass=NullPool)
+
+    assert registry.get("mysql+pymysql://root@localhost", poolclass=NullPool) is engine
+
+    assert registry.hits == 1
+    assert registry.misses == 1
+    assert registry.evictions == 0
+
+
+def test_engine_registry_miss_by_kwargs() -> None:
+    registry = EngineRegistry()
+
+    engine = registry.get("mysql+pymysql://root@localhost", poolclass=NullPool)
+
+    assert registry.get("mysql+pymysql://root@localhost") is not engine
+
+    assert registry.hits == 0
+    assert registry.misses == 2
+
+
+def test_engine_registry_eviction(mocker: MockerFixture) -> None:
+    registry = EngineRegistry(maximum_size=2)
+
+    engine_1 = registry.get("mysql+pymysql://root@localhost/1")
+    engine_2 = registry.get("mysql+pymysql://root@localhost/2")
+
+    spy_dispose_1 = mocker.spy(engine_1, "dispose")
+    spy_dispose_2 = mocker.spy(engine_2, "dispose")
+
+    registry.get("mysql+pymysql://root@localhost/1")  # Most recently used
+    registry.get("mysql+pymysql://root@localhost/3")
+
+    assert len(registry) == 2
+    assert registry.evictions == 1
+
+    spy_dispose_1.assert_not_called()
+    spy_dispose_2.assert_called_once_with()
+
+
+def test_engine_registry_dispose(mocker: MockerFixture) -> None:
+    registry = EngineRegistry()
+
+    engine = registry.get("mysql+pymysql://root@localhost")
+
+    spy_dispose = mocker.spy(engine, "dispose")
+
+    registry.dispose()
+
+    assert len(registry) == 0
+
+    spy_dispose.assert_called_once_with()
+
+
+def test_engine_registry_shared_between_supports(mariadb_server_host: str) -> None:
+    supports = [
+        DatabaseSupport(
+            server_software_names=["MariaDB"],
+            server_password=None,
+            mariadb_server_host=mariadb_server_host,
+            mariadb_server_username="root",
+        )
+        for _ in range(2)
+    ]
+
+    assert supports[0].engine_registry is engine_registry
+    assert supports[0].engines.engines["mysql"] is supports[1].engines.engines["mysql"]